@@ -34,6 +34,7 @@ if __name__ == '__main__':
 
     # creat planner
     planner = search_factory("a_star", start=start, goal=goal, env=env)
+    # planner = search_factory("adaptive_a_star", start=start, goal=goal, env=env)
     # planner = search_factory("dijkstra", start=start, goal=goal, env=env)
     # planner = search_factory("gbfs", start=start, goal=goal, env=env)
     # planner = search_factory("theta_star", start=start, goal=goal, env=env)
@@ -79,6 +80,7 @@ if __name__ == '__main__':
     # planner = search_factory("rrt_connect", start=start, goal=goal, env=env)
     # planner = search_factory("rrt_star", start=start, goal=goal, env=env)
     # planner = search_factory("informed_rrt", start=start, goal=goal, env=env)
+    # planner = search_factory("prm", start=start, goal=goal, env=env)
 
     # # animation
     # planner.run()
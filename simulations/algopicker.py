@@ -1,28 +1,28 @@
-
 import argparse
 from python_motion_planning import *
 from python_motion_planning.global_planner.graph_search.graph_search import GraphSearcher
 
+# short command line names of the registered planners
+ALIASES = {
+    "astar": "a_star",
+    "dijkstra": "dijkstra",
+    "jps": "jps",
+    "thetastar": "theta_star",
+    "dstar": "d_star",
+    "dstarlite": "d_star_lite",
+    "gbfs": "gbfs",
+}
+
 def algopicker() -> GraphSearcher:
     parser = argparse.ArgumentParser(description="Countryside motion planning simulation")
     parser.add_argument(
         "algorithm",
         type=str,
-        choices=["astar", "dijkstra", "jps", "gbfs"],
+        choices=sorted(set(ALIASES) | set(SearchFactory.registry.names())),
         help="Which global planner to run"
     )
     args = parser.parse_args()
 
-    algorithms = {
-        "astar": AStar,
-        "dijkstra": Dijkstra,
-        "jps": JPS,
-        "thetastar": ThetaStar,
-        "dstar": DStar,
-        "dstarlite": DStarLite,
-        "gbfs": GBFS,
-    }
-
-    pickedAlgo = algorithms[args.algorithm]
+    pickedAlgo = SearchFactory.registry.get(ALIASES.get(args.algorithm, args.algorithm))
 
-    return pickedAlgo
\ No newline at end of file
+    return pickedAlgo
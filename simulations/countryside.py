@@ -31,6 +31,8 @@ if __name__ == '__main__':
         grid_env: Grid = create_env(x_and_y, x_and_y, z, density[0], density[1])
         ex_times = []
         costs = []
+        # one planner per map, reused for every start/goal query
+        plt: GraphSearcher = algopicker()(env=grid_env)
         for i in range(run_n_times):
             while True:
                 start = (random.randint(1, x_and_y-1),
@@ -46,7 +48,11 @@ if __name__ == '__main__':
                 if goal not in grid_env.obstacles and goal != start:
                     break
 
-            plt: GraphSearcher = algopicker()(start, goal, env=grid_env)
+            # Time only the search, as when a planner was built per query: the
+            # per-query map records (rebuilt by `reset` for the D* family) are
+            # set up outside the timer. Grid caches shared through `env.cache`
+            # are built lazily, so the first query of each map also pays for them.
+            plt.reset(start, goal)
             start_time = time.time()
             cost, path, expand = plt.plan()
             end_time = time.time()
@@ -1,6 +1,9 @@
 def getCountrySideData():
     '''
     Dijkstra, ASTAR, JPS, GBFS -> cost, time
+
+    Times are of `plan()` alone, planner construction and `reset` excluded,
+    see simulations/countryside.py.
     '''
     dijkstra_cost = [
         [16.142,14.485,5.657,12.828,2.828,7.657,12.828,9.657,10.000,19.799],
@@ -1,4 +1,13 @@
 from .utils import *
-from .global_planner import *
-from .local_planner import *
-from .curve_generation import *
\ No newline at end of file
+from .utils import lazyImport
+from . import global_planner, local_planner, curve_generation
+
+__all__ = utils.__all__ + global_planner.__all__ + local_planner.__all__ + curve_generation.__all__
+
+# planners and curves are imported on first access, see `utils.lazyImport`
+__getattr__, __dir__ = lazyImport(__name__, {
+    "Plot": ".utils",
+    **{name: ".global_planner" for name in global_planner.__all__},
+    **{name: ".local_planner" for name in local_planner.__all__},
+    **{name: ".curve_generation" for name in curve_generation.__all__},
+})
@@ -1,9 +1,13 @@
-from .polynomial_curve import Polynomial
-from .bezier_curve import Bezier
-from .bspline_curve import BSpline
-from .dubins_curve import Dubins
-from .reeds_shepp import ReedsShepp
-from .cubic_spline import CubicSpline
-from .fem_pos_smooth import FemPosSmoother
+from python_motion_planning.utils import lazyImport
 
-__all__ = ["Polynomial", "Dubins", "ReedsShepp", "Bezier", "CubicSpline", "BSpline", "FemPosSmoother"]
\ No newline at end of file
+__all__ = ["Polynomial", "Dubins", "ReedsShepp", "Bezier", "CubicSpline", "BSpline", "FemPosSmoother"]
+
+__getattr__, __dir__ = lazyImport(__name__, {
+    "Polynomial": ".polynomial_curve",
+    "Bezier": ".bezier_curve",
+    "BSpline": ".bspline_curve",
+    "Dubins": ".dubins_curve",
+    "ReedsShepp": ".reeds_shepp",
+    "CubicSpline": ".cubic_spline",
+    "FemPosSmoother": ".fem_pos_smooth",
+})
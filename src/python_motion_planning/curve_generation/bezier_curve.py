@@ -7,9 +7,10 @@
 import numpy as np
 
 from scipy.special import comb
-from python_motion_planning.utils import Plot
 from .curve import Curve
+from python_motion_planning.utils import CURVES
 
+@CURVES.register("bezier")
 class Bezier(Curve):
 	"""
 	Class for Bezier curve generation.
@@ -97,6 +98,7 @@ class Bezier(Curve):
         """
 		assert len(points) >= 2, "Number of points should be at least 2."
 		import matplotlib.pyplot as plt
+		from python_motion_planning.utils import Plot
 
 		# generation
 		path_x, path_y = [], []
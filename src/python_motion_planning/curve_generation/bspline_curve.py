@@ -8,7 +8,9 @@ import math
 import numpy as np
 
 from .curve import Curve
+from python_motion_planning.utils import CURVES
 
+@CURVES.register("bspline")
 class BSpline(Curve):
     """
     Class for B-Spline curve generation.
@@ -9,7 +9,9 @@ import bisect
 import numpy as np
 
 from .curve import Curve
+from python_motion_planning.utils import CURVES
 
+@CURVES.register("cubic_spline")
 class CubicSpline(Curve):
 	"""
 	Class for cubic spline generation.
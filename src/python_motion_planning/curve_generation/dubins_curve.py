@@ -8,9 +8,10 @@ import math
 import numpy as np
 
 from scipy.spatial.transform import Rotation as Rot
-from python_motion_planning.utils import Plot
 from .curve import Curve
+from python_motion_planning.utils import CURVES
 
+@CURVES.register("dubins")
 class Dubins(Curve):
 	"""
 	Class for Dubins curve generation.
@@ -321,6 +322,7 @@ class Dubins(Curve):
 		"""
 		assert len(points) >= 2, "Number of points should be at least 2."
 		import matplotlib.pyplot as plt
+		from python_motion_planning.utils import Plot
 
 		# generation
 		path_x, path_y, path_yaw = [], [], []
@@ -9,7 +9,9 @@ import numpy as np
 from scipy import sparse
 
 from .curve import Curve
+from python_motion_planning.utils import CURVES
 
+@CURVES.register("fem_pos_smoother")
 class FemPosSmoother(Curve):
 	"""
 	Class for Fem-pos smoother.
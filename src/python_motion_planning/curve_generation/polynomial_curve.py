@@ -7,9 +7,10 @@
 import math
 import numpy as np
 
-from python_motion_planning.utils import Plot
 from .curve import Curve
+from python_motion_planning.utils import CURVES
 
+@CURVES.register("polynomial")
 class Polynomial(Curve):
     """
     Class for polynomial curve generation(Quintic).
@@ -172,6 +173,7 @@ class Polynomial(Curve):
         """
         assert len(points) >= 2, "Number of points should be at least 2."
         import matplotlib.pyplot as plt
+        from python_motion_planning.utils import Plot
 
         # generate velocity and acceleration constraints heuristically
         v = [0]
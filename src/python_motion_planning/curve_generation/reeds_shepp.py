@@ -7,9 +7,10 @@
 import math
 import numpy as np
 
-from python_motion_planning.utils import Plot
 from .curve import Curve
+from python_motion_planning.utils import CURVES
 
+@CURVES.register("reeds_shepp")
 class ReedsShepp(Curve):
 	"""
 	Class for Reeds shepp curve generation.
@@ -682,6 +683,7 @@ class ReedsShepp(Curve):
 		"""
 		assert len(points) >= 2, "Number of points should be at least 2."
 		import matplotlib.pyplot as plt
+		from python_motion_planning.utils import Plot
 
 		# generation
 		path_x, path_y, path_yaw = [], [], []
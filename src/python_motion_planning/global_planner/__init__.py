@@ -1,3 +1,10 @@
-from .graph_search import *
-from .sample_search import *
-from .evolutionary_search import *
\ No newline at end of file
+from python_motion_planning.utils import lazyImport
+from . import graph_search, sample_search, evolutionary_search
+
+__all__ = graph_search.__all__ + sample_search.__all__ + evolutionary_search.__all__
+
+__getattr__, __dir__ = lazyImport(__name__, {
+    **{name: ".graph_search" for name in graph_search.__all__},
+    **{name: ".sample_search" for name in sample_search.__all__},
+    **{name: ".evolutionary_search" for name in evolutionary_search.__all__},
+})
@@ -1,4 +1,5 @@
-from .aco import ACO
-from .pso import PSO
+from python_motion_planning.utils import lazyImport
 
-__all__ = ["ACO", "PSO"]
\ No newline at end of file
+__all__ = ["ACO", "PSO"]
+
+__getattr__, __dir__ = lazyImport(__name__, {"ACO": ".aco", "PSO": ".pso"})
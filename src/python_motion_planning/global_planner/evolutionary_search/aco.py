@@ -8,9 +8,10 @@ import random
 from bisect import bisect_left
 
 from .evolutionary_search import EvolutionarySearcher
-from python_motion_planning.utils import Env, Node, Grid
+from python_motion_planning.utils import Env, Node, Grid, SEARCH_PLANNERS
 
 
+@SEARCH_PLANNERS.register("aco")
 class ACO(EvolutionarySearcher):
     """
     Class for Ant Colony Optimization(ACO) motion planning.
@@ -8,13 +8,14 @@ import random, math
 from copy import deepcopy
 
 from .evolutionary_search import EvolutionarySearcher
-from python_motion_planning.utils import Env, MathHelper, Grid
+from python_motion_planning.utils import Env, MathHelper, Grid, SEARCH_PLANNERS
 from python_motion_planning.curve_generation import BSpline
 
 GEN_MODE_CIRCLE = 0
 GEN_MODE_RANDOM = 1
 
 
+@SEARCH_PLANNERS.register("pso")
 class PSO(EvolutionarySearcher):
     """
     Class for Particle Swarm Optimization (PSO) motion planning.
@@ -1,18 +1,7 @@
-from .a_star import AStar
-from .dijkstra import Dijkstra
-from .gbfs import GBFS
-from .jps import JPS
-from .d_star import DStar
-from .lpa_star import LPAStar
-from .d_star_lite import DStarLite
-from .voronoi import VoronoiPlanner
-from .theta_star import ThetaStar
-from .lazy_theta_star import LazyThetaStar
-from .s_theta_star import SThetaStar
-# from .anya import Anya
-# from .hybrid_a_star import HybridAStar
+from python_motion_planning.utils import lazyImport
 
 __all__ = ["AStar",
+           "AdaptiveAStar",
            "Dijkstra",
            "GBFS",
            "JPS",
@@ -20,9 +9,43 @@ __all__ = ["AStar",
            "LPAStar",
            "DStarLite",
            "VoronoiPlanner",
+           "MedialRoadmap",
            "ThetaStar",
            "LazyThetaStar",
            "SThetaStar",
+           "ARAStar",
+           "HPAStar",
+           "GoalBounding",
+           "PathCache",
+           "PortfolioPlanner",
+           "DStarLiteFleet",
+           "SearchStats",
            # "Anya",
            # "HybridAStar"
-        ]
\ No newline at end of file
+        ]
+
+# planners are imported on first access, so using one does not load the others
+__getattr__, __dir__ = lazyImport(__name__, {
+    "AStar": ".a_star",
+    "AdaptiveAStar": ".adaptive_a_star",
+    "Dijkstra": ".dijkstra",
+    "GBFS": ".gbfs",
+    "JPS": ".jps",
+    "DStar": ".d_star",
+    "LPAStar": ".lpa_star",
+    "DStarLite": ".d_star_lite",
+    "VoronoiPlanner": ".voronoi",
+    "MedialRoadmap": ".voronoi",
+    "ThetaStar": ".theta_star",
+    "LazyThetaStar": ".lazy_theta_star",
+    "SThetaStar": ".s_theta_star",
+    "ARAStar": ".ara_star",
+    "HPAStar": ".hpa_star",
+    "GoalBounding": ".goal_bounding",
+    "PathCache": ".path_cache",
+    "PortfolioPlanner": ".portfolio",
+    "DStarLiteFleet": ".fleet",
+    "SearchStats": ".graph_search",
+    # "Anya": ".anya",
+    # "HybridAStar": ".hybrid_a_star",
+})
@@ -6,10 +6,11 @@
 """
 import heapq
 
-from .graph_search import GraphSearcher
-from python_motion_planning.utils import Env, Grid, Node
+from .graph_search import GraphSearcher, SearchStats
+from python_motion_planning.utils import Env, Grid, Node, SEARCH_PLANNERS
 
 
+@SEARCH_PLANNERS.register("a_star")
 class AStar(GraphSearcher):
     """
     Class for A* motion planning.
@@ -19,6 +20,8 @@ class AStar(GraphSearcher):
         goal (tuple): goal point coordinate
         env (Grid): environment
         heuristic_type (str): heuristic function type
+        goal_bounds (GoalBounding): precomputed goal bounds used to prune motions
+        stats_only (bool): return `SearchStats` instead of the expanded nodes
 
     Examples:
         >>> import python_motion_planning as pmp
@@ -30,18 +33,32 @@ class AStar(GraphSearcher):
     References:
         [1] A Formal Basis for the heuristic Determination of Minimum Cost Paths
     """
-    def __init__(self, start: tuple, goal: tuple, env: Grid, heuristic_type: str = "euclidean") -> None:
-        super().__init__(start, goal, env, heuristic_type)
+    def __init__(self, start: tuple = None, goal: tuple = None, env: Grid = None, heuristic_type: str = "euclidean",
+                 goal_bounds=None, stats_only: bool = False) -> None:
+        super().__init__(start, goal, env, heuristic_type, stats_only)
+        self.goal_bounds = goal_bounds
 
     def __str__(self) -> str:
         return "A*"
 
-    def plan(self) -> tuple:
+    def plan(self, start: tuple = None, goal: tuple = None) -> tuple:
+        if start is not None or goal is not None:
+            self.reset(start, goal)
+
         OPEN = []
         heapq.heappush(OPEN, self.start)
         CLOSED = dict()
+        self.stats = SearchStats()
+        self.budget.start()
+        # start and goal in different free-space components: no path, nothing to search
+        if self.disconnected():
+            return self.searchResult([], [], OPEN, CLOSED)
+        bounds = self.activeGoalBounds()
+        occupancy = self.env.occupancy
+        closed = self.closedStamps()
 
         while OPEN:
+            self.stats.pop(len(OPEN))
             node = heapq.heappop(OPEN)
 
             if node.current in CLOSED:
@@ -49,26 +66,30 @@ class AStar(GraphSearcher):
 
             if node == self.goal:
                 CLOSED[node.current] = node
-                cost, path = self.extractPath(CLOSED)
-                return cost, path, list(CLOSED.values())
-
-            for motion in self.motions:
-                neighbor = node + motion
-
-                if self.isCollision(node, neighbor):
-                    continue
-                if neighbor.current in CLOSED:
-                    continue
+                return self.searchResult(*self.extractPath(CLOSED), OPEN, CLOSED)
 
-                step_cost = self.cost(node, neighbor)
-                neighbor.g = node.g + step_cost
-                neighbor.h = self.h(neighbor, self.goal)
-                neighbor.parent = node.current
+            # stop with the best partial result once the budget is spent
+            status = self.budget.exhausted()
+            if status is not None:
+                return self.partialResult(status, OPEN, CLOSED)
 
-                heapq.heappush(OPEN, neighbor)
+            allowed = bounds.allows(node.current, self.goal.current) if bounds else None
+            coords, step_cost, h = self.expandBatch(node, occupancy, allowed, closed)
+            g = node.g + step_cost
+            for current, g_n, h_n in zip(map(tuple, coords.tolist()), g.tolist(), h.tolist()):
+                heapq.heappush(OPEN, Node(current, node.current, g_n, h_n))
 
             CLOSED[node.current] = node
-        return [], [], []
+            closed[node.current] = self.search_id
+        return self.searchResult([], [], OPEN, CLOSED)
+
+    def activeGoalBounds(self):
+        """
+        Goal bounds to prune with, None if unset or outdated by obstacle edits.
+        """
+        if self.goal_bounds is not None and self.goal_bounds.isValid(self.env):
+            return self.goal_bounds
+        return None
 
     def getNeighbor(self, node: Node) -> list:
         """
@@ -80,27 +101,25 @@ class AStar(GraphSearcher):
         Returns:
             neighbors (list): neighbors of current node
         """
-        return [node + motion for motion in self.motions
-                if not self.isCollision(node, node + motion)]
+        return [node + self.motions[i] for i in self.validMotions(node, self.env.occupancy)]
 
-    def extractPath(self, closed_list: dict) -> tuple:
+    def extractPath(self, closed_list: dict, end: tuple = None) -> tuple:
         """
         Extract the path based on the CLOSED list.
 
         Parameters:
             closed_list (dict): CLOSED list
+            end (tuple): last point of the path, the goal if None
 
         Returns:
-            cost (float): the cost of planned path
+            cost (float): the cost of planned path, i.e. g of the end point
             path (list): the planning path
         """
-        cost = 0
-        node = closed_list[self.goal.current]
+        node = closed_list[self.goal.current if end is None else end]
+        cost = node.g
         path = [node.current]
         while node != self.start:
-            node_parent = closed_list[node.parent]
-            cost += self.cost(node, node_parent)
-            node = node_parent
+            node = closed_list[node.parent]
             path.append(node.current)
         return cost, path
 
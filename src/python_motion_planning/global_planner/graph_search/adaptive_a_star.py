@@ -0,0 +1,120 @@
+"""
+@file: adaptive_a_star.py
+@breif: Adaptive A* motion planning
+@update: 2026.10.18
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+from .a_star import AStar
+from python_motion_planning.utils import Env, Grid, Node, SEARCH_PLANNERS
+
+
+@SEARCH_PLANNERS.register("adaptive_a_star")
+class AdaptiveAStar(AStar):
+    """
+    Class for Adaptive A* motion planning, for repeated queries to the same goal.
+
+    After every successful search, the heuristic of each expanded cell is raised
+    to `g(goal) - g(cell)`, a lower bound of its true distance to the goal. The
+    learned values are kept in an array per goal in `env.cache`, so every
+    Adaptive A* planner on the grid shares them, and later searches to the
+    same goal expand fewer cells while staying optimal. Tables survive map
+    updates that only add obstacles, since costs can only rise; a freed cell
+    or an unknown change drops them.
+
+    Parameters:
+        start (tuple): start point coordinate
+        goal (tuple): goal point coordinate
+        env (Grid): environment
+        heuristic_type (str): heuristic function type
+        goal_bounds (GoalBounding): precomputed goal bounds used to prune motions
+        stats_only (bool): return `SearchStats` instead of the expanded nodes
+
+    Examples:
+        >>> import python_motion_planning as pmp
+        >>> planner = pmp.AdaptiveAStar(goal=(45, 25, 5), env=pmp.Grid(51, 31, 11))
+        >>> cost, path, expand = planner.plan((5, 5, 5), (45, 25, 5))
+        >>> cost, path, expand = planner.plan((6, 5, 5), (45, 25, 5))  # fewer expansions
+        >>> planner.run()       # run both planning and animation
+
+    References:
+        [1] Adaptive A*
+        [2] A Simple and Fast Incremental Heuristic Search for Moving Target Search
+    """
+    # number of goals whose heuristic tables are kept, least recently used dropped first
+    MAX_TABLES = 16
+
+    def __init__(self, start: tuple = None, goal: tuple = None, env: Grid = None, heuristic_type: str = "euclidean",
+                 goal_bounds=None, stats_only: bool = False) -> None:
+        super().__init__(start, goal, env, heuristic_type, goal_bounds, stats_only)
+        # learned heuristic of the current goal, see `heuristicTable`
+        self.table = None
+
+    def __str__(self) -> str:
+        return "Adaptive A*"
+
+    def heuristicTable(self) -> np.ndarray:
+        """
+        Learned heuristic of every cell towards the current goal, 0 where
+        nothing was learned yet.
+
+        Returns:
+            table (np.ndarray): float array of the grid shape, shared through `env.cache`
+        """
+        version, tables = self.env.cache.get("adaptive_h", (None, None))
+        if version != self.env.version:
+            changed = None if tables is None else self.env.changedCells(version)
+            # only added obstacles keep the learned values admissible and consistent
+            if changed is None or not self.env.occupancy[tuple(changed.T)].all():
+                tables = OrderedDict()
+            self.env.cache["adaptive_h"] = (self.env.version, tables)
+
+        goal = self.goal.current
+        table = tables.get(goal)
+        if table is None:
+            table = np.zeros(self.env.shape, dtype=np.float64)
+            tables[goal] = table
+            while len(tables) > self.MAX_TABLES:
+                tables.popitem(last=False)
+        tables.move_to_end(goal)
+        return table
+
+    def plan(self, start: tuple = None, goal: tuple = None) -> tuple:
+        """
+        Adaptive A* motion plan function, A* with the learned heuristic.
+
+        Parameters:
+            start (tuple): new start point coordinate, None to keep the current one
+            goal (tuple): new goal point coordinate, None to keep the current one
+
+        Returns:
+            cost (float): path cost
+            path (list): planning path
+            expand (list | SearchStats): expanded nodes or statistics
+        """
+        if start is not None or goal is not None:
+            self.reset(start, goal)
+        self.table = self.heuristicTable()
+        return super().plan()
+
+    def heuristicBatch(self, coords: np.ndarray, goal: Node) -> np.ndarray:
+        """
+        Heuristic of many cells at once, the larger of `h` and the learned value.
+        """
+        h = super().heuristicBatch(coords, goal)
+        if self.table is None or goal.current != self.goal.current:
+            return h
+        return np.maximum(h, self.table[tuple(coords.T)])
+
+    def searchResult(self, cost: float, path: list, OPEN: list, CLOSED: dict, status: str = None) -> tuple:
+        """
+        Learn from the expanded cells of a successful search, then return its
+        result, see `GraphSearcher.searchResult`.
+        """
+        if status is None and len(path) > 0 and self.table is not None and CLOSED:
+            cells = tuple(np.array(list(CLOSED), dtype=np.int64).T)
+            g = np.fromiter((node.g for node in CLOSED.values()), dtype=np.float64, count=len(CLOSED))
+            self.table[cells] = np.maximum(self.table[cells], cost - g)
+        return super().searchResult(cost, path, OPEN, CLOSED, status)
@@ -0,0 +1,208 @@
+"""
+@file: ara_star.py
+@breif: Anytime Repairing A* motion planning
+@update: 2026.10.18
+"""
+import heapq
+import time
+
+from .a_star import AStar
+from .graph_search import SearchStats
+from python_motion_planning.utils import Env, Grid, Node, PlanStatus, SEARCH_PLANNERS
+
+
+@SEARCH_PLANNERS.register("ara_star")
+class ARAStar(AStar):
+    """
+    Class for Anytime Repairing A* (ARA*) motion planning.
+
+    A weighted A* search is run with inflation factor `eps` to quickly find an
+    eps-suboptimal path, then `eps` is decreased and the search is repaired
+    from the previous OPEN/INCONS lists instead of starting over, until either
+    `eps` reaches 1 (optimal) or the wall-clock deadline expires.
+
+    Parameters:
+        start (tuple): start point coordinate
+        goal (tuple): goal point coordinate
+        env (Grid): environment
+        heuristic_type (str): heuristic function type
+        eps (float): initial heuristic inflation factor (>= 1)
+        eps_step (float): decrement of the inflation factor between iterations
+        deadline (float): wall-clock time budget of one planning call in seconds
+        stats_only (bool): return `SearchStats` instead of the expanded nodes
+
+    Examples:
+        >>> import python_motion_planning as pmp
+        >>> planner = pmp.ARAStar((5, 5, 5), (45, 25, 5), pmp.Grid(51, 31, 11), deadline=0.1)
+        >>> cost, path, expand = planner.plan()     # best path found before the deadline
+        >>> for cost, path in planner.improve():    # every improved solution
+        ...     print(cost)
+        >>> planner.run()       # run both planning and animation
+
+    References:
+        [1] ARA*: Anytime A* with Provable Bounds on Sub-Optimality
+    """
+    def __init__(self, start: tuple = None, goal: tuple = None, env: Grid = None, heuristic_type: str = "euclidean",
+                 eps: float = 2.5, eps_step: float = 0.5, deadline: float = 1.0, stats_only: bool = False) -> None:
+        super().__init__(start, goal, env, heuristic_type, stats_only=stats_only)
+        assert eps >= 1.0, "The inflation factor `eps` must be no less than 1."
+        self.eps_init = eps
+        self.eps_step = eps_step
+        self.deadline = deadline
+        # current inflation factor, suboptimality bound of the last published path
+        self.eps = eps
+        # all nodes expanded in any iteration and the OPEN list of the last one
+        self.EXPAND = dict()
+        self.OPEN = []
+
+    def __str__(self) -> str:
+        return "Anytime Repairing A*(ARA*)"
+
+    def plan(self, start: tuple = None, goal: tuple = None) -> tuple:
+        """
+        ARA* motion plan function. Returns the best path found before the deadline.
+
+        Parameters:
+            start (tuple): new start point coordinate, None to keep the current one
+            goal (tuple): new goal point coordinate, None to keep the current one
+
+        Returns:
+            cost (float): path cost
+            path (list): planning path
+            expand (list): all nodes that planner has searched, or `SearchStats`
+        """
+        if start is not None or goal is not None:
+            self.reset(start, goal)
+
+        cost, path = [], []
+        for cost, path in self.improve():
+            pass
+        if not path and self.status is not None:
+            return self.partialResult(self.status, self.OPEN, self.EXPAND)
+        return self.searchResult(cost, path, self.OPEN, self.EXPAND, self.status)
+
+    def improve(self, start: tuple = None, goal: tuple = None):
+        """
+        Anytime search generator: yields `(cost, path)` every time a better path
+        is found, and stops once `eps` reaches 1 or the deadline expires.
+
+        Parameters:
+            start (tuple): new start point coordinate, None to keep the current one
+            goal (tuple): new goal point coordinate, None to keep the current one
+
+        Yields:
+            cost (float): cost of the improved path
+            path (list): the improved path
+        """
+        if start is not None or goal is not None:
+            self.reset(start, goal)
+
+        t_end = time.time() + self.deadline
+        self.eps = self.eps_init
+        self.EXPAND = dict()
+        self.stats = SearchStats()
+        self.budget.start()
+        self.status = None
+
+        # search state reused across iterations
+        g = {self.start.current: 0}
+        nodes = {self.start.current: self.start}
+        OPEN, CLOSED, INCONS = [], set(), dict()
+        self.OPEN = OPEN
+        if self.disconnected():
+            self.status = PlanStatus.NO_PATH
+            return
+
+        self.start.g = 0
+        self.start.h = self.eps * self.h(self.start, self.goal)
+        heapq.heappush(OPEN, self.start)
+
+        best_cost = float("inf")
+        while True:
+            finished = self.improvePath(OPEN, CLOSED, INCONS, g, nodes, t_end)
+
+            goal_g = g.get(self.goal.current, float("inf"))
+            if goal_g < best_cost:
+                best_cost = goal_g
+                yield self.extractPath(nodes)
+
+            if not finished or self.eps <= 1.0:
+                return
+
+            # tighten the bound and repair: OPEN <- OPEN U INCONS, CLOSED <- {}
+            self.eps = max(1.0, self.eps - self.eps_step)
+            frontier = {n.current: nodes[n.current] for n in OPEN
+                        if n.current not in CLOSED and n.g == g[n.current]}
+            frontier.update(INCONS)
+            OPEN[:] = []
+            for node in frontier.values():
+                node.h = self.eps * self.h(node, self.goal)
+                OPEN.append(node)
+            heapq.heapify(OPEN)
+            CLOSED.clear()
+            INCONS.clear()
+
+    def improvePath(self, OPEN: list, CLOSED: set, INCONS: dict, g: dict, nodes: dict, t_end: float) -> bool:
+        """
+        Weighted A* pass with the current inflation factor.
+
+        Parameters:
+            OPEN (list): priority queue of nodes keyed by g + eps * h
+            CLOSED (set): coordinates expanded in this pass
+            INCONS (dict): locally inconsistent closed nodes, delayed to next pass
+            g (dict): best known cost-to-come of each coordinate
+            nodes (dict): best known node of each coordinate
+            t_end (float): wall-clock deadline
+
+        Returns:
+            finished (bool): False if the deadline or the search budget expired during the pass,
+                `status` is TIMEOUT if the deadline expired before any path was found
+        """
+        occupancy = self.env.occupancy
+        while OPEN:
+            # goal is as good as anything left in OPEN under the current bound
+            if g.get(self.goal.current, float("inf")) <= OPEN[0].g + OPEN[0].h:
+                return True
+            if time.time() > t_end:
+                # the deadline only fails the search if no path was found in time
+                if self.goal.current not in g:
+                    self.status = PlanStatus.TIMEOUT
+                return False
+
+            self.stats.pop(len(OPEN))
+            node = heapq.heappop(OPEN)
+
+            # stale heap entry or already expanded in this pass
+            if node.current in CLOSED or node.g > g[node.current]:
+                continue
+
+            # the search budget of `setBudget` ends the anytime search
+            self.status = self.budget.exhausted()
+            if self.status is not None:
+                heapq.heappush(OPEN, node)
+                return False
+
+            CLOSED.add(node.current)
+            self.EXPAND[node.current] = node
+
+            coords, step_cost, h = self.expandBatch(node, occupancy)
+            for current, new_g, h_n in zip(map(tuple, coords.tolist()), (node.g + step_cost).tolist(), h.tolist()):
+                if new_g >= g.get(current, float("inf")):
+                    continue
+
+                g[current] = new_g
+                neighbor = Node(current, node.current, new_g, self.eps * h_n)
+                nodes[current] = neighbor
+
+                if neighbor.current not in CLOSED:
+                    heapq.heappush(OPEN, neighbor)
+                else:
+                    INCONS[neighbor.current] = neighbor
+        return True
+
+    def run(self):
+        """
+        Running both planning and animation.
+        """
+        cost, path, expand = self.plan()
+        self.plot.animation(path, "{} (eps={})".format(str(self), self.eps), cost, expand)
@@ -4,8 +4,11 @@
 @author: Yang Haodong, Wu Maojia
 @update: 2024.6.23
 """
+import heapq
+import numpy as np
+
 from .graph_search import GraphSearcher
-from python_motion_planning.utils import Env, Node, Grid
+from python_motion_planning.utils import Env, Node, Grid, PlanStatus, SEARCH_PLANNERS
 
 
 class DNode(Node):
@@ -27,25 +30,32 @@ class DNode(Node):
         self.k = k
 
     def __add__(self, node):
-        return DNode((self.x + node.x, self.y + node.y, self.z + node.z), 
+        return DNode((self.x + node.x, self.y + node.y, self.z + node.z),
                      self.parent, self.t, self.h + node.h, self.k)
 
     def __str__(self) -> str:
         return "----------\ncurrent:{}\nparent:{}\nt:{}\nh:{}\nk:{}\n----------" \
             .format(self.current, self.parent, self.t, self.h, self.k)
 
+@SEARCH_PLANNERS.register("d_star")
 class DStar(GraphSearcher):
     """
-    Class for D* motion planning.
+    Class for D* motion planning in 3D.
+
+    The records of all cells are kept in flat arrays indexed like the
+    occupancy array: `H` and `K` (float64), `PARENT` (int64, -1 for none) and
+    `TAG` (int8, `TAG_NEW`, `TAG_OPEN` or `TAG_CLOSED`). OPEN is a binary heap
+    of (k, index) entries, stale entries are skipped when they reach the top.
+    `node` returns the record of a cell as a `DNode`.
 
     Parameters:
-        start (tuple): start point coordinate
-        goal (tuple): goal point coordinate
-        env (Grid): environment
+        start (tuple): start point coordinate (x, y, z)
+        goal (tuple): goal point coordinate (x, y, z)
+        env (Grid): 3D environment with z_range specified
 
     Examples:
         >>> import python_motion_planning as pmp
-        >>> planner = pmp.DStar((5, 5), (45, 25), pmp.Grid(51, 31))
+        >>> planner = pmp.DStar((5, 5, 5), (45, 25, 5), pmp.Grid(51, 31, 11))
         >>> cost, path, _ = planner.plan()     # planning results only
         >>> planner.plot.animation(path, str(planner), cost)  # animation
         >>> planner.run()       # run both planning and animation
@@ -53,39 +63,188 @@ class DStar(GraphSearcher):
     References:
         [1]Optimal and Efficient Path Planning for Partially-Known Environments
     """
-    def __init__(self, start: tuple, goal: tuple, env: Grid) -> None:
+    # values of the `TAG` array
+    TAG_NEW, TAG_OPEN, TAG_CLOSED = 0, 1, 2
+    TAGS = ("NEW", "OPEN", "CLOSED")
+
+    def __init__(self, start: tuple = None, goal: tuple = None, env: Grid = None) -> None:
+        if env.z_range is None:
+            raise ValueError("Environment must have z_range specified for 3D planning")
+
         super().__init__(start, goal, env, None)
-        self.start = DNode(start, None, 'NEW', float('inf'), float("inf"))
-        self.goal = DNode(goal, None, 'NEW', 0, float('inf'))
-        # allowed motions
-        self.motions = [DNode(motion.current, None, None, motion.g, 0) for motion in self.env.motions]
-        # OPEN list and EXPAND list
+        # flat index offset of every motion
+        strides = np.array([env.y_range * env.z_range, env.z_range, 1], dtype=np.int64)
+        self.motion_offset = (self.motion_delta @ strides).tolist()
+        # cost of every motion by the altitude of the cell it starts from
+        self.step_cost = [[self.motionCost(k, z) for k in range(len(self.motions))] for z in range(env.z_range)]
+        # motion indices of every value of the motion mask
+        self._mask_motions = dict()
+        if start is not None and goal is not None:
+            self.reset(start, goal)
+
+    def reset(self, start: tuple = None, goal: tuple = None) -> None:
+        """
+        Start a new planning query, re-initializing the map records.
+
+        Parameters:
+            start (tuple): new start point coordinate, None to keep the current one
+            goal (tuple): new goal point coordinate, None to keep the current one
+        """
+        start = self.start.current if start is None else start
+        goal = self.goal.current if goal is None else goal
+        super().reset(start, goal)
+        # record history infomation of map grids
+        size = int(np.prod(self.env.shape))
+        self.H = np.full(size, np.inf)
+        self.K = np.full(size, np.inf)
+        self.PARENT = np.full(size, -1, dtype=np.int64)
+        self.TAG = np.full(size, self.TAG_NEW, dtype=np.int8)
+        # scalar access through memoryviews is several times faster than through the arrays
+        self._h, self._k, self._parent, self._tag = map(memoryview, (self.H, self.K, self.PARENT, self.TAG))
+        # OPEN heap and EXPAND list of flat indices
         self.OPEN = []
         self.EXPAND = []
-        # record history infomation of map grids
-        self.map = {s: DNode(s, None, 'NEW', float("inf"), float("inf")) for s in self.env.grid_map}
-        self.map[self.goal.current] = self.goal
-        self.map[self.start.current] = self.start
         # intialize OPEN list
-        self.insert(self.goal, 0)
+        self.insert(self.index(goal), 0.0)
 
     def __str__(self) -> str:
         return "Dynamic A*(D*)"
 
-    def plan(self) -> tuple:
+    def index(self, current: tuple) -> int:
+        """
+        Flat index of a cell in the record arrays.
+        """
+        x, y, z = current
+        return (x * self.env.y_range + y) * self.env.z_range + z
+
+    def coord(self, index: int) -> tuple:
+        """
+        Cell of a flat index of the record arrays.
+        """
+        xy, z = divmod(int(index), self.env.z_range)
+        x, y = divmod(xy, self.env.y_range)
+        return (x, y, z)
+
+    def node(self, current: tuple) -> DNode:
+        """
+        Record of a cell as a `DNode`.
+
+        Parameters:
+            current (tuple): cell coordinate
+
+        Returns:
+            node (DNode): copy of the record of the cell
+        """
+        i = self.index(current)
+        parent = self.coord(self.PARENT[i]) if self.PARENT[i] >= 0 else None
+        return DNode(tuple(current), parent, self.TAGS[self.TAG[i]], float(self.H[i]), float(self.K[i]))
+
+    def plan(self, start: tuple = None, goal: tuple = None) -> tuple:
         """
         D* static motion planning function.
 
+        Parameters:
+            start (tuple): new start point coordinate, None to keep the current one
+            goal (tuple): new goal point coordinate, None to keep the current one
+
         Returns:
             cost (float): path cost
             path (list): planning path
             _ (None): None
         """
+        if start is not None or goal is not None:
+            self.reset(start, goal)
+
+        if self.disconnected():
+            self.status = PlanStatus.NO_PATH
+            return [], [], None
+
+        self.budget.start()
+        s = self.index(self.start.current)
         while True:
-            self.processState()
-            if self.start.t == 'CLOSED':
+            if self.processState() == -1:
+                # OPEN list exhausted without reaching start
+                self.status = PlanStatus.NO_PATH
+                return [], [], None
+            if self._tag[s] == self.TAG_CLOSED:
                 break
-        cost, path = self.extractPath(self.map)
+            status = self.budget.exhausted()
+            if status is not None:
+                self.status = status
+                return [], [], None
+        self.status = PlanStatus.SUCCESS
+        cost, path = self.extractPath()
+        return cost, path, None
+
+    def updateObstacles(self, added: list = (), removed: list = ()) -> None:
+        """
+        Apply a batch of obstacle changes without planning. Nodes next to a
+        changed cell are put back on the OPEN list, the next `replan` raises
+        or lowers their costs from there.
+
+        Parameters:
+            added (list): coordinates that became occupied
+            removed (list): coordinates that became free
+        """
+        added = set(map(tuple, added)) - self.obstacles
+        removed = set(map(tuple, removed)) & self.obstacles
+        if not added and not removed:
+            return
+        mask_version = self.env.cache.get("motion_mask", (None, None))[0]
+        self.env.update((self.obstacles | added) - removed)
+        if mask_version == self.env.version - 1:
+            self.updateMotionMask(added | removed)
+
+        for cell in added:
+            # an occupied cell must not propagate costs to its neighbors,
+            # its heap entries turn stale with the NEW tag
+            i = self.index(cell)
+            self.PARENT[i], self.TAG[i], self.H[i], self.K[i] = -1, self.TAG_NEW, np.inf, np.inf
+
+        affected = set()
+        for cell in added | removed:
+            affected.update(j for j, _ in self.neighborCosts(self.index(cell)))
+        for j in affected:
+            parent = self.PARENT[j]
+            blocked = parent >= 0 and self.isCollision(Node(self.coord(j)), Node(self.coord(parent)))
+            if self.TAG[j] == self.TAG_CLOSED:
+                # RAISE state if the arc to the parent is blocked, otherwise
+                # LOWER state to propagate the cost into freed cells
+                self.insert(j, np.inf if blocked else self.H[j])
+            elif self.TAG[j] == self.TAG_OPEN and blocked:
+                self.H[j] = np.inf
+
+    def replan(self, start: tuple = None) -> tuple:
+        """
+        Repair the path after `updateObstacles`, processing states until the
+        cost of the start is known again.
+
+        Parameters:
+            start (tuple): new start point coordinate, None to keep the current one
+
+        Returns:
+            cost (float): path cost
+            path (list): planning path
+            _ (None): None
+        """
+        if start is not None:
+            self.start = Node(tuple(start), tuple(start), 0, 0)
+
+        self.EXPAND = []
+        self.budget.start()
+        s = self.index(self.start.current)
+        while self.min_state is not None and (self.TAG[s] != self.TAG_CLOSED or self.min_k < self.H[s]):
+            self.processState()
+            status = self.budget.exhausted()
+            if status is not None:
+                self.status = status
+                return [], [], None
+
+        if self.TAG[s] != self.TAG_CLOSED or self.H[s] == np.inf:
+            self.status = PlanStatus.NO_PATH
+            return [], [], None
+        self.status = PlanStatus.SUCCESS
+        cost, path = self.extractPath()
         return cost, path, None
 
     def run(self) -> None:
@@ -110,11 +269,11 @@ class DStar(GraphSearcher):
         if event.xdata is None or event.ydata is None:
             print("Please click within the plot area!")
             return
-            
+
         x, y = int(event.xdata), int(event.ydata)
         # For 3D, use middle z-coordinate as default
         z = self.env.z_range // 2
-        
+
         if x < 0 or x > self.env.x_range - 1 or y < 0 or y > self.env.y_range - 1:
             print("Please choose right area!")
         else:
@@ -125,41 +284,40 @@ class DStar(GraphSearcher):
                 self.env.update(self.obstacles)
 
                 # move from start to goal, replan locally when meeting collisions
-                node = self.start
+                i, goal = self.index(self.start.current), self.index(self.goal.current)
                 self.EXPAND, path, cost = [], [], 0
-                while node != self.goal:
-                    node_parent = self.map[node.parent]
+                while i != goal:
+                    parent = int(self.PARENT[i])
+                    node, node_parent = Node(self.coord(i)), Node(self.coord(parent))
                     if self.isCollision(node, node_parent):
-                        self.modify(node, node_parent)
+                        self.modify(i, parent)
                         continue
                     path.append(node.current)
                     cost += self.cost(node, node_parent)
-                    node = node_parent
+                    i = parent
 
                 self.plot.clean()
-                self.plot.animation(path, str(self), cost, self.EXPAND)
+                self.plot.animation(path, str(self), cost, [Node(self.coord(i)) for i in self.EXPAND])
 
             self.plot.update()
 
-    def extractPath(self, closed_list: dict) -> tuple:
+    def extractPath(self) -> tuple:
         """
-        Extract the path based on the CLOSED list.
-
-        Parameters:
-            closed_list (dict): CLOSED list
+        Extract the path by following the parents from start to goal.
 
         Returns:
             cost (float): the cost of planning path
             path (list): the planning path
         """
         cost = 0
-        node = self.start
-        path = [node.current]
-        while node != self.goal:
-            node_parent = closed_list[node.parent]
+        i, goal = self.index(self.start.current), self.index(self.goal.current)
+        path = [self.start.current]
+        while i != goal:
+            parent = int(self.PARENT[i])
+            node, node_parent = Node(self.coord(i)), Node(self.coord(parent))
             cost += self.cost(node, node_parent)
-            node = node_parent
-            path.append(node.current)
+            path.append(node_parent.current)
+            i = parent
 
         return cost, path
 
@@ -171,69 +329,77 @@ class DStar(GraphSearcher):
             min_k (float): minimum k value of map
         """
         # get node in OPEN list with min k value
-        node = self.min_state
-        
-        if node is None:
+        i = self.min_state
+
+        if i is None:
             return -1
 
-        self.EXPAND.append(node)
+        self.EXPAND.append(i)
 
+        H, PARENT, TAG = self._h, self._parent, self._tag
         # record the min k value of this iteration
-        k_old = node.k  # Use the actual node's k value instead of min_k property
+        k_old = self._k[i]
         # move node from OPEN list to CLOSED list
-        self.delete(node)  
+        self.delete(i)
+        edges = self.neighborCosts(i)
 
         # k_min < h[x] --> x: RAISE state (try to reduce k value by neighbor)
-        if k_old < node.h:
-            for node_n in self.getNeighbor(node):
-                if node_n.h <= k_old and node.h > node_n.h + self.cost(node, node_n):
+        if k_old < H[i]:
+            for j, cost in edges:
+                if H[j] <= k_old and H[i] > H[j] + cost:
                     # update h_value and choose parent
-                    node.parent = node_n.current
-                    node.h = node_n.h + self.cost(node, node_n)
+                    PARENT[i] = j
+                    H[i] = H[j] + cost
 
         # k_min >= h[x] -- > x: LOWER state (cost reductions)
-        if k_old == node.h:
-            for node_n in self.getNeighbor(node):
-                if node_n.t == 'NEW' or \
-                    (node_n.parent == node.current and node_n.h != node.h + self.cost(node, node_n)) or \
-                    (node_n.parent != node.current and node_n.h > node.h + self.cost(node, node_n)):
+        h = H[i]
+        if k_old == h:
+            for j, cost in edges:
+                if TAG[j] == self.TAG_NEW or \
+                    (PARENT[j] == i and H[j] != h + cost) or \
+                    (PARENT[j] != i and H[j] > h + cost):
                     # Condition:
                     # 1) t[node_n] == 'NEW': not visited
                     # 2) node_n's parent: cost reduction
                     # 3) node_n find a better parent
-                    node_n.parent = node.current
-                    self.insert(node_n, node.h + self.cost(node, node_n))
+                    PARENT[j] = i
+                    self.insert(j, h + cost)
         else:
-            for node_n in self.getNeighbor(node):
-                if node_n.t == 'NEW' or \
-                    (node_n.parent == node.current and node_n.h != node.h + self.cost(node, node_n)):
+            for j, cost in edges:
+                if TAG[j] == self.TAG_NEW or \
+                    (PARENT[j] == i and H[j] != h + cost):
                     # Condition:
                     # 1) t[node_n] == 'NEW': not visited
                     # 2) node_n's parent: cost reduction
-                    node_n.parent = node.current
-                    self.insert(node_n, node.h + self.cost(node, node_n))
+                    PARENT[j] = i
+                    self.insert(j, h + cost)
                 else:
-                    if node_n.parent != node.current and \
-                        node_n.h > node.h + self.cost(node, node_n):
+                    if PARENT[j] != i and \
+                        H[j] > h + cost:
                         # Condition: LOWER happened in OPEN list (s), s should be explored again
-                        self.insert(node, node.h)
+                        self.insert(i, h)
                     else:
-                        if node_n.parent != node.current and \
-                            node.h > node_n.h + self.cost(node, node_n) and \
-                            node_n.t == 'CLOSED' and \
-                            node_n.h > k_old:
+                        if PARENT[j] != i and \
+                            h > H[j] + cost and \
+                            TAG[j] == self.TAG_CLOSED and \
+                            H[j] > k_old:
                             # Condition: LOWER happened in CLOSED list (s_n), s_n should be explored again
-                            self.insert(node_n, node_n.h)
+                            self.insert(j, H[j])
         return self.min_k
 
     @property
-    def min_state(self) -> DNode:
+    def min_state(self) -> int:
         """
-        Choose the node with the minimum k value in OPEN list.
+        Index of the node with the minimum k value in OPEN list, None if it is
+        empty. Stale heap entries on top are dropped.
         """
-        if not self.OPEN:
-            return None
-        return min(self.OPEN, key=lambda node: node.k)
+        OPEN, K, TAG = self.OPEN, self._k, self._tag
+        while OPEN:
+            k, i = OPEN[0]
+            if TAG[i] == self.TAG_OPEN and K[i] == k:
+                return i
+            heapq.heappop(OPEN)
+        return None
 
     @property
     def min_k(self) -> float:
@@ -243,48 +409,114 @@ class DStar(GraphSearcher):
         min_state = self.min_state
         if min_state is None:
             return float('inf')
-        return min_state.k
+        return self._k[min_state]
 
-    def insert(self, node: DNode, h_new: float) -> None:
+    def insert(self, i: int, h_new: float) -> None:
         """
         Insert node into OPEN list.
 
         Parameters:
-            node (DNode): the node to insert
+            i (int): flat index of the node to insert
             h_new (float): new or better cost to come value
         """
-        if node.t == 'NEW':         node.k = h_new
-        elif node.t == 'OPEN':      node.k = min(node.k, h_new)
-        elif node.t == 'CLOSED':    node.k = min(node.h, h_new)
-        node.h, node.t = h_new, 'OPEN'
-        self.OPEN.append(node)
-
-    def delete(self, node: DNode) -> None:
+        t = self._tag[i]
+        if t == self.TAG_NEW:       k = h_new
+        elif t == self.TAG_OPEN:    k = min(self._k[i], h_new)
+        else:                       k = min(self._h[i], h_new)
+        self._k[i], self._h[i], self._tag[i] = k, h_new, self.TAG_OPEN
+        heapq.heappush(self.OPEN, (k, i))
+
+    def delete(self, i: int) -> None:
         """
-        Delete node from OPEN list.
+        Delete node from OPEN list, leaving a stale heap entry.
 
         Parameters:
-            node (DNode): the node to delete
+            i (int): flat index of the node to delete
         """
-        if node.t == 'OPEN':
-            node.t = 'CLOSED'
-        self.OPEN.remove(node)
+        if self._tag[i] == self.TAG_OPEN:
+            self._tag[i] = self.TAG_CLOSED
 
-    def modify(self, node: DNode, node_parent: DNode) -> None:
+    def modify(self, i: int, parent: int) -> None:
         """
         Start processing from node.
 
         Parameters:
-            node (DNode): the node to modify
-            node_parent (DNode): the parent node of `node`
+            i (int): flat index of the node to modify
+            parent (int): flat index of the parent node of `i`
         """
-        if node.t == 'CLOSED':
-            self.insert(node, node_parent.h + self.cost(node, node_parent))
+        if self.TAG[i] == self.TAG_CLOSED:
+            self.insert(i, self.H[parent] + self.cost(Node(self.coord(i)), Node(self.coord(parent))))
         while True:
             k_min = self.processState()
-            if k_min >= node.h:
+            if k_min == -1 or k_min >= self.H[i]:
                 break
 
+    def motionCost(self, k: int, z: int) -> float:
+        """
+        Cost of motion `k` from a cell at altitude z into a free cell, the
+        same value as `cost`.
+        """
+        factor = self.LOW_ALTITUDE_FACTOR if z + self.motions[k].z < self.LOW_ALTITUDE else 1.0
+        return self.dist(Node((0, 0, 0)), self.motions[k]) * factor
+
+    def motionMask(self) -> np.ndarray:
+        """
+        Flat uint32 array over all cells whose bit k is set if motion k leads
+        to a free cell inside the grid. Cached per map version in `env.cache`.
+        """
+        version, mask = self.env.cache.get("motion_mask", (None, None))
+        if version != self.env.version:
+            mask = self.buildMotionMask()
+            self.env.cache["motion_mask"] = (self.env.version, mask)
+        return mask
+
+    def buildMotionMask(self) -> np.ndarray:
+        """
+        Compute the motion mask with one shifted view of the occupancy per motion.
+        """
+        occupancy = self.env.occupancy
+        shape = occupancy.shape
+        blocked = np.pad(occupancy, 1, constant_values=True)
+        mask = np.zeros(shape, dtype=np.uint32)
+        for k, delta in enumerate(self.motion_delta.tolist()):
+            free = ~blocked[tuple(slice(1 + d, 1 + d + n) for d, n in zip(delta, shape))]
+            mask |= free.astype(np.uint32) << np.uint32(k)
+        return mask.ravel()
+
+    def updateMotionMask(self, cells: set) -> None:
+        """
+        Carry the motion mask of the previous map version over to the current
+        one, recomputing only the cells next to the changed ones.
+
+        Parameters:
+            cells (set): coordinates whose occupancy changed
+        """
+        _, mask = self.env.cache["motion_mask"]
+        occupancy = self.env.occupancy
+        coords = (np.array(list(cells))[:, None, :] - self.motion_delta).reshape(-1, 3)
+        coords = np.unique(coords[np.all((coords >= 0) & (coords < occupancy.shape), axis=1)], axis=0)
+        for cell in map(tuple, coords.tolist()):
+            mask[self.index(cell)] = sum(1 << k for k in self.validMotions(Node(cell), occupancy).tolist())
+        self.env.cache["motion_mask"] = (self.env.version, mask)
+
+    def neighborCosts(self, i: int) -> list:
+        """
+        Free neighbors of a node with the motion cost to them.
+
+        Parameters:
+            i (int): flat index of the node
+
+        Returns:
+            edges (list): (flat index of neighbor, cost from node to neighbor)
+        """
+        mask = int(self.motionMask()[i])
+        motions = self._mask_motions.get(mask)
+        if motions is None:
+            motions = [k for k in range(len(self.motions)) if mask >> k & 1]
+            self._mask_motions[mask] = motions
+        offset, cost = self.motion_offset, self.step_cost[i % self.env.z_range]
+        return [(i + offset[k], cost[k]) for k in motions]
+
     def getNeighbor(self, node: DNode) -> list:
         """
         Find neighbors of node.
@@ -293,11 +525,6 @@ class DStar(GraphSearcher):
             node (DNode): current node
 
         Returns:
-            neighbors (list): neighbors of current node
-        """
-        neighbors = []
-        for motion in self.motions:
-            n = self.map[(node + motion).current]
-            if not self.isCollision(node, n):
-                neighbors.append(n)
-        return neighbors
+            neighbors (list): records of the free neighbors of node
+        """
+        return [self.node(self.coord(j)) for j, _ in self.neighborCosts(self.index(node.current))]
@@ -4,13 +4,12 @@
 @author: Yang Haodong, Wu Maojia
 @update: 2024.6.23
 """
-import heapq
-
 from .graph_search import GraphSearcher
 from .lpa_star import LPAStar, LNode
-from python_motion_planning.utils import Env, Grid
+from python_motion_planning.utils import Env, Grid, PlanStatus, IndexedHeap, SEARCH_PLANNERS
 
 
+@SEARCH_PLANNERS.register("d_star_lite")
 class DStarLite(LPAStar):
     """
     Class for D* Lite motion planning in 3D.
@@ -31,21 +30,36 @@ class DStarLite(LPAStar):
     References:
         [1] D* Lite
     """
-    def __init__(self, start: tuple, goal: tuple, env: Grid, heuristic_type: str = "euclidean") -> None:
-        # Ensure 3D coordinates
-        if len(start) != 3 or len(goal) != 3:
-            raise ValueError("Start and goal must be 3D coordinates (x, y, z)")
+    def __init__(self, start: tuple = None, goal: tuple = None, env: Grid = None, heuristic_type: str = "euclidean") -> None:
         if env.z_range is None:
             raise ValueError("Environment must have z_range specified for 3D planning")
-            
+
         GraphSearcher.__init__(self, start, goal, env, heuristic_type)
+        if start is not None and goal is not None:
+            self.reset(start, goal)
+
+    def reset(self, start: tuple = None, goal: tuple = None) -> None:
+        """
+        Start a new planning query, re-initializing the map records.
+
+        Parameters:
+            start (tuple): new start point coordinate, None to keep the current one
+            goal (tuple): new goal point coordinate, None to keep the current one
+        """
+        start = self.start.current if start is None else start
+        goal = self.goal.current if goal is None else goal
+        # Ensure 3D coordinates
+        if len(start) != 3 or len(goal) != 3:
+            raise ValueError("Start and goal must be 3D coordinates (x, y, z)")
+
+        GraphSearcher.reset(self, start, goal)
         # start and goal
         self.start = LNode(start, float('inf'), float('inf'), None)
         self.goal = LNode(goal, float('inf'), 0.0, None)
         # correction
         self.km = 0
-        # OPEN set and expand zone
-        self.U, self.EXPAND = [], []
+        # OPEN set keyed by priority and expand zone
+        self.U, self.EXPAND = IndexedHeap(), []
 
         # intialize global information, record history infomation of map grids
         self.map = {s: LNode(s, float('inf'), float('inf'), None) for s in self.env.grid_map}
@@ -53,7 +67,7 @@ class DStarLite(LPAStar):
         self.map[self.start.current] = self.start
         # OPEN set with priority
         self.goal.key = self.calculateKey(self.goal)
-        heapq.heappush(self.U, self.goal)
+        self.U.push(self.goal, self.goal.key)
 
     def __str__(self) -> str:
         return "D* Lite (3D)"
@@ -85,11 +99,10 @@ class DStarLite(LPAStar):
             self.EXPAND = []
 
             while cur_start != self.goal:
-                neighbors = [node_n for node_n in self.getNeighbor(cur_start)
-                    if not self.isCollision(cur_start, node_n)]
-                next_node = min(neighbors, key=lambda n: n.g)
+                n, _, step = min(self.neighborEdges(cur_start.current), key=lambda e: self.map[e[0]].g + e[2])
+                next_node = self.map[n]
                 path.append(next_node.current)
-                cost += self.cost(cur_start, next_node)
+                cost += step
                 count += 1
                 cur_start = next_node
 
@@ -118,23 +131,65 @@ class DStarLite(LPAStar):
             self.plot.animation(path, str(self), cost, self.EXPAND)
             self.plot.update()
 
+    def replan(self, start: tuple = None) -> tuple:
+        """
+        Repair the path after `updateObstacles`, optionally from the position
+        the robot has moved to. The search runs from the goal, so moving the
+        start only raises the key modifier `km` and keeps all costs.
+
+        Parameters:
+            start (tuple): new start point coordinate, None to keep the current one
+
+        Returns:
+            cost (float): path cost
+            path (list): planning path
+            _ (None): None
+
+        Examples:
+            >>> planner.plan()
+            >>> planner.updateObstacles(added=[(20, 15, 5), (20, 16, 5)])
+            >>> cost, path, _ = planner.replan((8, 6, 5))
+        """
+        if start is not None and tuple(start) != self.start.current:
+            start = self.map[tuple(start)]
+            self.km += self.h(self.start, start)
+            self.start = start
+
+        self.EXPAND = []
+        self.computeShortestPath()
+        if self.status != PlanStatus.SUCCESS:
+            return [], [], None
+        cost, path = self.extractPath()
+        return cost, path, None
+
     def computeShortestPath(self) -> None:
         """
         Perceived dynamic obstacle information to optimize global path.
+        Sets `status`, stopping early when the search budget is spent.
         """
+        self.budget.start()
+        self.status = PlanStatus.SUCCESS
         while True:
-            node = min(self.U, key=lambda node: node.key)
-            if node.key >= self.calculateKey(self.start) and \
+            if not self.U:
+                self.status = PlanStatus.NO_PATH
+                break
+            node = self.U.top()
+            if self.keyExceeds(node.key, self.calculateKey(self.start)) and \
                     self.start.rhs == self.start.g:
                 break
 
+            status = self.budget.exhausted()
+            if status is not None:
+                self.status = status
+                break
+
             self.U.remove(node)
             self.EXPAND.append(node)
 
             # affected by obstacles
             if node.key < self.calculateKey(node):
                 node.key = self.calculateKey(node)
-                heapq.heappush(self.U, node)
+                self.U.push(node, node.key)
             # Locally over-consistent -> Locally consistent
             elif node.g > node.rhs:
                 node.g = node.rhs
@@ -156,16 +211,15 @@ class DStarLite(LPAStar):
         """
         # greed correction(reverse searching)
         if node != self.goal:
-            node.rhs = min([node_n.g + self.cost(node_n, node)
-                        for node_n in self.getNeighbor(node)])
+            node.rhs = min((self.map[n].g + cost for n, _, cost in self.neighborEdges(node.current)),
+                           default=float("inf"))
 
-        if node in self.U:
-            self.U.remove(node)
-
-        # Locally unconsistent nodes should be added into OPEN set (set U)
+        # Locally unconsistent nodes should be in OPEN set (set U) with their current key
         if node.g != node.rhs:
             node.key = self.calculateKey(node)
-            heapq.heappush(self.U, node)
+            self.U.push(node, node.key)
+        elif node in self.U:
+            self.U.remove(node)
 
     def calculateKey(self, node: LNode) -> list:
         """
@@ -182,7 +236,9 @@ class DStarLite(LPAStar):
 
     def extractPath(self) -> tuple:
         """
-        Extract the path based on greedy policy.
+        Extract the path based on greedy policy, following the same edge
+        direction as `updateVertex`. Sets `status` to NO_PATH if the walk does
+        not reach the goal.
 
         Returns:
             cost (float): the cost of planning path
@@ -192,12 +248,13 @@ class DStarLite(LPAStar):
         path = [node.current]
         cost, count = 0, 0
         while node != self.goal:
-            neighbors = [node_n for node_n in self.getNeighbor(node) if not self.isCollision(node, node_n)]
-            next_node = min(neighbors, key=lambda n: n.g)
+            n, _, step = min(self.neighborEdges(node.current), key=lambda e: self.map[e[0]].g + e[2])
+            next_node = self.map[n]
             path.append(next_node.current)
-            cost += self.cost(node, next_node)
+            cost += step
             node = next_node
             count += 1
             if count == 1000:
-                return cost, []
+                self.status = PlanStatus.NO_PATH
+                return [], []
         return cost, list(path)
\ No newline at end of file
@@ -7,9 +7,11 @@
 import heapq
 
 from .a_star import AStar
-from python_motion_planning.utils import Env, Grid
+from .graph_search import SearchStats
+from python_motion_planning.utils import Env, Grid, Node, SEARCH_PLANNERS
 
 
+@SEARCH_PLANNERS.register("dijkstra")
 class Dijkstra(AStar):
     """
     Class for Dijkstra motion planning.
@@ -19,6 +21,7 @@ class Dijkstra(AStar):
         goal (tuple): goal point coordinate
         env (Grid): environment
         heuristic_type (str): heuristic function type
+        stats_only (bool): return `SearchStats` instead of the expanded nodes
 
     Examples:
         >>> import python_motion_planning as pmp
@@ -27,27 +30,43 @@ class Dijkstra(AStar):
         >>> planner.plot.animation(path, str(planner), cost, expand)  # animation
         >>> planner.run()       # run both planning and animation
     """
-    def __init__(self, start: tuple, goal: tuple, env: Grid, heuristic_type: str = "euclidean") -> None:
-        super().__init__(start, goal, env, heuristic_type)
+    def __init__(self, start: tuple = None, goal: tuple = None, env: Grid = None, heuristic_type: str = "euclidean",
+                 stats_only: bool = False) -> None:
+        super().__init__(start, goal, env, heuristic_type, stats_only=stats_only)
     
     def __str__(self) -> str:
         return "Dijkstra"
 
-    def plan(self) -> tuple:
+    def plan(self, start: tuple = None, goal: tuple = None) -> tuple:
         """
         Dijkstra motion plan function.
 
+        Parameters:
+            start (tuple): new start point coordinate, None to keep the current one
+            goal (tuple): new goal point coordinate, None to keep the current one
+
         Returns:
             cost (float): path cost
             path (list): planning path
             expand (list): all nodes that planner has searched
         """
+        if start is not None or goal is not None:
+            self.reset(start, goal)
+
         # OPEN list (priority queue) and CLOSED list (hash table)
         OPEN = []
         heapq.heappush(OPEN, self.start)
         CLOSED = dict()
+        self.stats = SearchStats()
+        self.budget.start()
+        # start and goal in different free-space components: no path, nothing to search
+        if self.disconnected():
+            return self.searchResult([], [], OPEN, CLOSED)
+        occupancy = self.env.occupancy
+        closed = self.closedStamps()
 
         while OPEN:
+            self.stats.pop(len(OPEN))
             node = heapq.heappop(OPEN)
 
             # exists in CLOSED list
@@ -57,22 +76,19 @@ class Dijkstra(AStar):
             # goal found
             if node == self.goal:
                 CLOSED[node.current] = node
-                cost, path = self.extractPath(CLOSED)
-                return cost, path, list(CLOSED.values())
-
-            for node_n in self.getNeighbor(node):
-             
-                # hit the obstacle
-                if node_n.current in self.obstacles:
-                    continue
-                
-                # exists in CLOSED list
-                if node_n.current in CLOSED:
-                    continue
-                
-                node_n.parent = node.current
-                node_n.g = node.g + self.cost(node, node_n)
-                node_n.h = 0   # no heuristic in Dijkstra
+                return self.searchResult(*self.extractPath(CLOSED), OPEN, CLOSED)
+
+            # stop with the best partial result once the budget is spent
+            status = self.budget.exhausted()
+            if status is not None:
+                return self.partialResult(status, OPEN, CLOSED)
+
+            # free neighbours outside CLOSED list and their step costs in one batch
+            coords, step_cost, _ = self.expandBatch(node, occupancy, closed=closed)
+            g = node.g + step_cost
+            for current, g_n in zip(map(tuple, coords.tolist()), g.tolist()):
+                # no heuristic in Dijkstra
+                node_n = Node(current, node.current, g_n, 0)
 
                 # goal found
                 if node_n == self.goal:
@@ -83,4 +99,5 @@ class Dijkstra(AStar):
                 heapq.heappush(OPEN, node_n)
 
             CLOSED[node.current] = node
-        return [], [], []
\ No newline at end of file
+            closed[node.current] = self.search_id
+        return self.searchResult([], [], OPEN, CLOSED)
\ No newline at end of file
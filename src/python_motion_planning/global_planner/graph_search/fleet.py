@@ -0,0 +1,216 @@
+"""
+@file: fleet.py
+@breif: D* Lite searches of several robots sharing one changing grid
+@update: 2026.10.18
+"""
+import multiprocessing as mp
+
+from .d_star_lite import DStarLite
+from python_motion_planning.utils import Grid
+
+
+class _FleetShard(object):
+    """
+    D* Lite searches of a group of robots on one grid. The searches share the
+    grid and its cached neighbor and cost tables.
+    """
+    def __init__(self, env: Grid, heuristic_type: str) -> None:
+        self.env = env
+        self.heuristic_type = heuristic_type
+        self.planners = dict()
+
+    @staticmethod
+    def result(planner: DStarLite, plan: tuple) -> tuple:
+        cost, path, _ = plan
+        return cost, path, planner.status
+
+    def add(self, name, start: tuple, goal: tuple) -> tuple:
+        planner = DStarLite(start, goal, self.env, self.heuristic_type)
+        self.planners[name] = planner
+        return self.result(planner, planner.plan())
+
+    def remove(self, name) -> None:
+        self.planners.pop(name, None)
+
+    def update(self, added: set, removed: set) -> None:
+        self.env.update((self.env.obstacles | added) - removed)
+        for i, planner in enumerate(self.planners.values()):
+            if i == 0:
+                planner.invalidateEdges(added | removed)
+            planner.applyChanges(added, removed)
+
+    def replan(self, starts: dict) -> dict:
+        return {name: self.result(planner, planner.replan(starts.get(name)))
+                for name, planner in self.planners.items()}
+
+
+def _fleetWorker(conn, shape: tuple, obstacles: set, heuristic_type: str) -> None:
+    env = Grid(*shape)
+    env.update(obstacles)
+    shard = _FleetShard(env, heuristic_type)
+    while True:
+        command, args = conn.recv()
+        if command == "close":
+            break
+        try:
+            conn.send(getattr(shard, command)(*args))
+        except Exception as e:
+            conn.send(e)
+    conn.close()
+
+
+class DStarLiteFleet(object):
+    """
+    Class keeping the D* Lite searches of several robots on one versioned grid.
+
+    Obstacle changes are given once with `updateObstacles` and broadcast to
+    every search, then `replan` repairs all of them. With `workers` > 0 the
+    robots are spread over that many worker processes, each holding a copy
+    of the grid that follows the same changes, and the repairs of different
+    workers run in parallel. Searches in one process share the neighbor and
+    cost tables of their grid.
+
+    Parameters:
+        env (Grid): environment, changed only through `updateObstacles`
+        heuristic_type (str): heuristic function type
+        workers (int): number of worker processes, 0 to plan in this process
+
+    Attributes:
+        status (dict): `PlanStatus` of the last search of every robot
+
+    Examples:
+        >>> import python_motion_planning as pmp
+        >>> with pmp.DStarLiteFleet(pmp.Grid(51, 31, 11), workers=2) as fleet:
+        ...     fleet.addRobot("uav1", (5, 5, 5), (45, 25, 5))
+        ...     fleet.addRobot("uav2", (5, 25, 5), (45, 5, 5))
+        ...     fleet.updateObstacles(added=[(25, y, 5) for y in range(5, 26)])
+        ...     paths = fleet.replan({"uav1": (6, 5, 5)})
+    """
+    def __init__(self, env: Grid, heuristic_type: str = "euclidean", workers: int = 0) -> None:
+        if env.z_range is None:
+            raise ValueError("Environment must have z_range specified for 3D planning")
+
+        self.env = env
+        self.heuristic_type = heuristic_type
+        self.status = dict()
+        # worker of every robot, -1 for this process
+        self.owner = dict()
+        self._local = _FleetShard(env, heuristic_type)
+        self._workers = []
+        for _ in range(workers):
+            conn, child = mp.Pipe()
+            process = mp.Process(target=_fleetWorker, daemon=True,
+                                 args=(child, env.shape, set(env.obstacles), heuristic_type))
+            process.start()
+            self._workers.append((process, conn))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Shut down the worker processes.
+        """
+        for process, conn in self._workers:
+            conn.send(("close", ()))
+            process.join()
+        self._workers = []
+
+    @property
+    def robots(self) -> list:
+        return list(self.owner)
+
+    def call(self, workers: list, command: str, *args) -> list:
+        """
+        Run a command on several workers in parallel.
+
+        Parameters:
+            workers (list): worker indices, -1 for this process
+            command (str): `_FleetShard` method name
+            args: method arguments
+
+        Returns:
+            results (list): return value of every worker, in the given order
+        """
+        for w in workers:
+            if w >= 0:
+                self._workers[w][1].send((command, args))
+        results = [getattr(self._local, command)(*args) if w < 0 else None for w in workers]
+        for i, w in enumerate(workers):
+            if w >= 0:
+                results[i] = self._workers[w][1].recv()
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
+    def addRobot(self, name, start: tuple, goal: tuple) -> tuple:
+        """
+        Add a robot and plan its first path on the current grid.
+
+        Parameters:
+            name (hashable): robot name
+            start (tuple): start point coordinate
+            goal (tuple): goal point coordinate
+
+        Returns:
+            cost (float): path cost
+            path (list): planning path
+        """
+        if name in self.owner:
+            raise ValueError("Robot {} already exists".format(name))
+        if self._workers:
+            load = [list(self.owner.values()).count(w) for w in range(len(self._workers))]
+            owner = load.index(min(load))
+        else:
+            owner = -1
+        self.owner[name] = owner
+        cost, path, self.status[name] = self.call([owner], "add", name, tuple(start), tuple(goal))[0]
+        return cost, path
+
+    def removeRobot(self, name) -> None:
+        """
+        Drop the search of a robot.
+        """
+        self.call([self.owner.pop(name)], "remove", name)
+        self.status.pop(name, None)
+
+    def updateObstacles(self, added: list = (), removed: list = ()) -> None:
+        """
+        Apply a batch of obstacle changes to the grid and to every search,
+        without planning.
+
+        Parameters:
+            added (list): coordinates that became occupied
+            removed (list): coordinates that became free
+        """
+        added = set(map(tuple, added)) - self.env.obstacles
+        removed = set(map(tuple, removed)) & self.env.obstacles
+        if not added and not removed:
+            return
+        # the local shard updates `env` itself, workers update their copies
+        self.call([-1] + list(range(len(self._workers))), "update", added, removed)
+
+    def replan(self, starts: dict = None) -> dict:
+        """
+        Repair the paths of all robots after `updateObstacles`.
+
+        Parameters:
+            starts (dict): new start point coordinate of robots that moved
+
+        Returns:
+            paths (dict): (cost, path) of every robot, empty if it has no path
+        """
+        starts = {name: tuple(start) for name, start in (starts or dict()).items()}
+        workers = sorted(set(self.owner.values()))
+        results = dict()
+        for result in self.call(workers, "replan", starts):
+            results.update(result)
+        paths = dict()
+        for name, (cost, path, status) in results.items():
+            paths[name] = (cost, path)
+            self.status[name] = status
+        return paths
@@ -7,9 +7,11 @@
 import heapq
 
 from .a_star import AStar
-from python_motion_planning.utils import Env, Grid
+from .graph_search import SearchStats
+from python_motion_planning.utils import Env, Grid, SEARCH_PLANNERS
 
 
+@SEARCH_PLANNERS.register("gbfs")
 class GBFS(AStar):
     """
     Class for Greedy Best First Search.
@@ -19,6 +21,7 @@ class GBFS(AStar):
         goal (tuple): goal point coordinate
         env (Grid): environment
         heuristic_type (str): heuristic function type
+        stats_only (bool): return `SearchStats` instead of the expanded nodes
 
     Examples:
         >>> import python_motion_planning as pmp
@@ -27,18 +30,28 @@ class GBFS(AStar):
         >>> planner.plot.animation(path, str(planner), cost, expand)  # animation
         >>> planner.run()       # run both planning and animation
     """
-    def __init__(self, start: tuple, goal: tuple, env: Grid, heuristic_type: str = "euclidean") -> None:
-        super().__init__(start, goal, env, heuristic_type)
+    def __init__(self, start: tuple = None, goal: tuple = None, env: Grid = None, heuristic_type: str = "euclidean",
+                 stats_only: bool = False) -> None:
+        super().__init__(start, goal, env, heuristic_type, stats_only=stats_only)
     
     def __str__(self) -> str:
         return "Greedy Best First Search(GBFS)"
 
-    def plan(self) -> tuple:
+    def plan(self, start: tuple = None, goal: tuple = None) -> tuple:
+        if start is not None or goal is not None:
+            self.reset(start, goal)
+
         OPEN = []
         heapq.heappush(OPEN, self.start)
         CLOSED = dict()
+        self.stats = SearchStats()
+        self.budget.start()
+        # start and goal in different free-space components: no path, nothing to search
+        if self.disconnected():
+            return self.searchResult([], [], OPEN, CLOSED)
 
         while OPEN:
+            self.stats.pop(len(OPEN))
             node = heapq.heappop(OPEN)
 
             if node.current in CLOSED:
@@ -47,7 +60,12 @@ class GBFS(AStar):
             if node == self.goal:
                 CLOSED[node.current] = node
                 cost, path = self.extractPath(CLOSED)
-                return cost, path, list(CLOSED.values())
+                return self.searchResult(cost, path, OPEN, CLOSED)
+
+            # stop with the best partial result once the budget is spent
+            status = self.budget.exhausted()
+            if status is not None:
+                return self.partialResult(status, OPEN, CLOSED)
 
             for node_n in self.getNeighbor(node):
                 if node_n.current in self.obstacles:
@@ -74,4 +92,20 @@ class GBFS(AStar):
                 heapq.heappush(OPEN, node_n)
 
             CLOSED[node.current] = node
-        return [], [], []
+        return self.searchResult([], [], OPEN, CLOSED)
+
+    def extractPath(self, closed_list: dict, end: tuple = None) -> tuple:
+        """
+        Extract the path based on the CLOSED list.
+
+        Parameters:
+            closed_list (dict): CLOSED list
+            end (tuple): last point of the path, the goal if None
+
+        Returns:
+            cost (float): the cost of planned path
+            path (list): the planning path
+        """
+        # g of GBFS nodes is not a path cost, so the edges are costed again
+        _, path = super().extractPath(closed_list, end)
+        return self.pathCost(path), path
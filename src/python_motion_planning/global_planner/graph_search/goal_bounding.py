@@ -0,0 +1,225 @@
+"""
+@file: goal_bounding.py
+@breif: Goal bounding preprocessing for grid graph search
+@update: 2026.10.18
+"""
+import hashlib
+from multiprocessing import Pool
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from .graph_search import GraphSearcher
+from python_motion_planning.utils import Grid
+
+# adjacency shared with pool workers, set by `_initWorker`
+_worker_graph = None
+
+
+def _initWorker(graph) -> None:
+    global _worker_graph
+    _worker_graph = graph
+
+
+def _boundChunk(args) -> np.ndarray:
+    sources, shape, motion_code = args
+    return GoalBounding.boundSources(_worker_graph, sources, shape, motion_code)
+
+
+class GoalBounding(object):
+    """
+    Class for goal bounding preprocessing of a static grid.
+
+    For every free cell and every outgoing motion, the axis-aligned bounding box
+    of all goals whose shortest path (under `GraphSearcher.cost`) starts with
+    that motion is stored. A search towards a goal outside the box of an edge
+    can skip the edge without losing optimality, since from every cell the
+    first motion of its own shortest path is always kept.
+
+    The preprocessing runs one Dijkstra search per free cell and is meant to be
+    done once per static map, optionally in a process pool, and saved to disk.
+    The boxes describe edges of the full grid graph, so they are used by `AStar`
+    and not by `JPS`, whose jump and pruning rules skip those edges.
+
+    Parameters:
+        env (Grid): environment
+        processes (int): number of worker processes, None to run in this process
+        chunk_size (int): number of sources searched per Dijkstra call
+
+    Examples:
+        >>> import python_motion_planning as pmp
+        >>> env = pmp.Grid(21, 21, 8)
+        >>> bounds = pmp.GoalBounding(env, processes=4)
+        >>> bounds.save("city.bounds.npz")
+        >>> bounds = pmp.GoalBounding.load("city.bounds.npz", env)
+        >>> planner = pmp.AStar((2, 2, 2), (18, 18, 5), env, goal_bounds=bounds)
+
+    References:
+        [1] Faster Optimal and Suboptimal Hierarchical Search
+        [2] Goal-bounding: Pruning search space with precomputed bounding boxes
+    """
+    def __init__(self, env: Grid, processes: int = None, chunk_size: int = 64) -> None:
+        self.env = env
+        self.version = env.version
+        self.digest = self.occupancyDigest(env)
+        self.bounds = self.build(processes, chunk_size)
+
+    def __str__(self) -> str:
+        return "Goal Bounding"
+
+    @staticmethod
+    def occupancyDigest(env: Grid) -> str:
+        return hashlib.sha1(env.occupancy.tobytes()).hexdigest()
+
+    @staticmethod
+    def motionCode(env: Grid) -> np.ndarray:
+        """
+        Lookup table from (dx + 1, dy + 1, dz + 1) to the index in `env.motions`.
+        """
+        code = np.full((3, 3, 3), -1, dtype=np.int64)
+        for i, motion in enumerate(env.motions):
+            code[motion.x + 1, motion.y + 1, motion.z + 1] = i
+        return code
+
+    def adjacency(self) -> csr_matrix:
+        """
+        Directed grid graph between free cells, weighted like `GraphSearcher.cost`.
+        """
+        occupancy = self.env.occupancy
+        shape = occupancy.shape
+        cells = np.argwhere(~occupancy)
+        rows, cols, weights = [], [], []
+        for motion in self.env.motions:
+            dst = cells + np.array(motion.current)
+            inside = np.all((dst >= 0) & (dst < shape), axis=1)
+            src, dst = cells[inside], dst[inside]
+            valid = ~occupancy[tuple(dst.T)]
+            src, dst = src[valid], dst[valid]
+            rows.append(np.ravel_multi_index(src.T, shape))
+            cols.append(np.ravel_multi_index(dst.T, shape))
+            weights.append(motion.g * np.where(dst[:, 2] < GraphSearcher.LOW_ALTITUDE,
+                                               GraphSearcher.LOW_ALTITUDE_FACTOR, 1.0))
+        n = occupancy.size
+        return csr_matrix((np.concatenate(weights), (np.concatenate(rows), np.concatenate(cols))), shape=(n, n))
+
+    def build(self, processes: int = None, chunk_size: int = 64) -> np.ndarray:
+        """
+        Compute the bounding boxes of every free cell and motion.
+
+        Returns:
+            bounds (np.ndarray): int16 array of shape (x, y, z, motions, 6) with
+                (min x, min y, min z, max x, max y, max z), empty boxes have min > max
+        """
+        occupancy = self.env.occupancy
+        shape = occupancy.shape
+        graph = self.adjacency()
+        motion_code = self.motionCode(self.env)
+
+        sources = np.flatnonzero(~occupancy.ravel())
+        chunks = [(sources[i:i + chunk_size], shape, motion_code) for i in range(0, len(sources), chunk_size)]
+
+        if processes is None:
+            results = [self.boundSources(graph, *chunk) for chunk in chunks]
+        else:
+            with Pool(processes, initializer=_initWorker, initargs=(graph,)) as pool:
+                results = pool.map(_boundChunk, chunks)
+
+        bounds = np.empty((occupancy.size, len(self.env.motions), 6), dtype=np.int16)
+        bounds[..., :3], bounds[..., 3:] = np.iinfo(np.int16).max, -1
+        for (chunk, _, _), result in zip(chunks, results):
+            bounds[chunk] = result
+        return bounds.reshape(shape + bounds.shape[1:])
+
+    @staticmethod
+    def boundSources(graph: csr_matrix, sources: np.ndarray, shape: tuple, motion_code: np.ndarray) -> np.ndarray:
+        """
+        Bounding boxes of a chunk of source cells.
+
+        Parameters:
+            graph (csr_matrix): grid graph
+            sources (np.ndarray): flat indices of the source cells
+            shape (tuple): grid shape
+            motion_code (np.ndarray): lookup table of `motionCode`
+
+        Returns:
+            bounds (np.ndarray): int16 array of shape (len(sources), motions, 6)
+        """
+        num_motions = int(motion_code.max()) + 1
+        coords = np.stack(np.unravel_index(np.arange(graph.shape[0]), shape), axis=1)
+        _, pred = dijkstra(graph, directed=True, indices=sources, return_predecessors=True)
+
+        bounds = np.empty((len(sources), num_motions, 6), dtype=np.int16)
+        bounds[..., :3], bounds[..., 3:] = np.iinfo(np.int16).max, -1
+        index = np.arange(graph.shape[0])
+        for i, source in enumerate(sources):
+            p = pred[i]
+            reached = p >= 0
+            # pointer doubling until every target points at the first cell of its path
+            first = np.where(reached & (p != source), p, index)
+            while True:
+                jumped = first[first]
+                if np.array_equal(jumped, first):
+                    break
+                first = jumped
+
+            targets = np.flatnonzero(reached)
+            delta = coords[first[targets]] - coords[source] + 1
+            move = motion_code[delta[:, 0], delta[:, 1], delta[:, 2]]
+
+            order = np.argsort(move, kind="stable")
+            move, target_coords = move[order], coords[targets[order]]
+            moves, starts = np.unique(move, return_index=True)
+            if len(moves):
+                bounds[i, moves, :3] = np.minimum.reduceat(target_coords, starts, axis=0)
+                bounds[i, moves, 3:] = np.maximum.reduceat(target_coords, starts, axis=0)
+        return bounds
+
+    def isValid(self, env: Grid) -> bool:
+        """
+        Whether the bounds still describe the obstacles of `env`.
+        """
+        if env is not self.env:
+            return False
+        if self.version == env.version:
+            return True
+        changed = env.changedCells(self.version)
+        if changed is not None and len(changed) == 0:
+            self.version = env.version
+            return True
+        return False
+
+    def allows(self, cell: tuple, goal: tuple) -> np.ndarray:
+        """
+        Motions from `cell` that can lie on a shortest path to `goal`.
+
+        Returns:
+            mask (np.ndarray): boolean mask over `env.motions`
+        """
+        box = self.bounds[cell]
+        goal = np.asarray(goal)
+        return np.all((box[:, :3] <= goal) & (goal <= box[:, 3:]), axis=1)
+
+    def save(self, file: str) -> None:
+        """
+        Save the bounds together with the digest of the map they belong to.
+        """
+        np.savez_compressed(file, bounds=self.bounds, digest=self.digest)
+
+    @classmethod
+    def load(cls, file: str, env: Grid):
+        """
+        Load bounds saved by `save` for the same static map.
+
+        Raises:
+            ValueError: if the saved bounds were computed for different obstacles
+        """
+        data = np.load(file)
+        bounding = cls.__new__(cls)
+        bounding.env = env
+        bounding.version = env.version
+        bounding.digest = cls.occupancyDigest(env)
+        if str(data["digest"]) != bounding.digest or data["bounds"].shape[:3] != env.occupancy.shape:
+            raise ValueError("The goal bounds in {} belong to a different map.".format(file))
+        bounding.bounds = data["bounds"]
+        return bounding
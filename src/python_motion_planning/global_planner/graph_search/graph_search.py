@@ -5,7 +5,44 @@
 @update: 2023.1.13
 """
 import math
-from python_motion_planning.utils import Env, Node, Planner, Grid
+import numpy as np
+
+from python_motion_planning.utils import Env, Node, Planner, Grid, PlanStatus
+
+
+class SearchStats(object):
+    """
+    Counters of one search, returned instead of the expanded nodes by planners
+    created with `stats_only=True`.
+
+    Attributes:
+        expanded (int): number of expanded nodes
+        pushed (int): number of nodes pushed to the OPEN list
+        max_open (int): maximum size of the OPEN list
+        collision_checks (int): number of cells and segments checked against obstacles
+    """
+    def __init__(self) -> None:
+        self.expanded = 0
+        self.pushed = 0
+        self.max_open = 0
+        self.collision_checks = 0
+        # number of nodes popped from the OPEN list
+        self.popped = 0
+
+    def __str__(self) -> str:
+        return "SearchStats(expanded={}, pushed={}, max_open={}, collision_checks={})".format(
+            self.expanded, self.pushed, self.max_open, self.collision_checks)
+
+    __repr__ = __str__
+
+    def pop(self, open_size: int) -> None:
+        """
+        Record a pop from an OPEN list of size `open_size`. OPEN only grows
+        between pops, so its maximum is always seen here.
+        """
+        self.popped += 1
+        if open_size > self.max_open:
+            self.max_open = open_size
 
 
 class GraphSearcher(Planner):
@@ -17,15 +54,39 @@ class GraphSearcher(Planner):
         goal (tuple): goal point coordinate
         env (Grid): environment
         heuristic_type (str): heuristic function type
+        stats_only (bool): return `SearchStats` instead of the expanded nodes and
+            free the CLOSED list right after path extraction
+
+    Attributes:
+        path_array (bool): return paths as (N, 3) integer arrays instead of lists of tuples
     """
-    def __init__(self, start: tuple, goal: tuple, env: Grid, heuristic_type: str="euclidean") -> None:
+    # moving below this altitude multiplies the motion cost by LOW_ALTITUDE_FACTOR
+    LOW_ALTITUDE = 5
+    LOW_ALTITUDE_FACTOR = 2.0
+
+    def __init__(self, start: tuple = None, goal: tuple = None, env: Grid = None, heuristic_type: str="euclidean",
+                 stats_only: bool = False) -> None:
         super().__init__(start, goal, env)
         # heuristic type
         self.heuristic_type = heuristic_type
+        # search counters of the last plan
+        self.stats_only = stats_only
+        self.stats = SearchStats()
+        # paths as (N, 3) arrays, off by default since plotting and curves take tuples
+        self.path_array = False
         # allowed motions
         self.motions = self.env.motions
-        # obstacles
-        self.obstacles = self.env.obstacles
+        # motion offsets and lengths for batch expansion
+        self.motion_delta = np.array([motion.current for motion in self.env.motions], dtype=np.int64)
+        self.motion_dist = np.array([motion.g for motion in self.env.motions], dtype=np.float64)
+        # array-backed CLOSED set reused across plans, see `closedStamps`
+        self.closed_stamps = None
+        self.search_id = 0
+
+    @property
+    def obstacles(self) -> set:
+        # read through so that a planner reused across `env.update` sees the current map
+        return self.env.obstacles
 
     def h(self, node: Node, goal: Node) -> float:
         """
@@ -45,6 +106,210 @@ class GraphSearcher(Planner):
         elif self.heuristic_type == "euclidean":
             return math.sqrt((goal.x - node.x)**2 + (goal.y - node.y)**2 + (goal.z - node.z)**2)
 
+    def heuristicBatch(self, coords: np.ndarray, goal: Node) -> np.ndarray:
+        """
+        Calculate heuristic of many cells at once, same values as `h`.
+
+        Parameters:
+            coords (np.ndarray): (N, 3) cell coordinates
+            goal (Node): goal node
+
+        Returns:
+            h (np.ndarray): heuristic function values
+        """
+        diff = coords - np.array(goal.current)
+        if self.heuristic_type == "manhattan":
+            return np.abs(diff).sum(axis=1).astype(np.float64)
+        elif self.heuristic_type == "euclidean":
+            return np.sqrt((diff * diff).sum(axis=1))
+        return np.zeros(len(coords))
+
+    def closedStamps(self) -> np.ndarray:
+        """
+        Array-backed CLOSED set of a new search. A cell is closed in the current
+        search if its stamp equals `search_id`, so a search starts by bumping the
+        id instead of allocating or clearing an array of the grid size.
+
+        Returns:
+            stamps (np.ndarray): stamp of every cell, written by the search as it closes cells
+        """
+        stamps = self.closed_stamps
+        if stamps is None or stamps.shape != self.env.occupancy.shape or \
+                self.search_id == np.iinfo(stamps.dtype).max:
+            self.closed_stamps = stamps = np.zeros(self.env.occupancy.shape, dtype=np.uint16)
+            self.search_id = 0
+        self.search_id += 1
+        return stamps
+
+    def validMotions(self, node: Node, occupancy: np.ndarray, allowed: np.ndarray = None,
+                     closed: np.ndarray = None) -> np.ndarray:
+        """
+        Indices of the motions leading from node to a free cell inside the grid.
+
+        Parameters:
+            node (Node): current node
+            occupancy (np.ndarray): occupancy array of the environment
+            allowed (np.ndarray): optional mask of motions to consider
+            closed (np.ndarray): optional `closedStamps` of the cells to skip
+
+        Returns:
+            index (np.ndarray): indices into `motions`
+        """
+        coords = self.motion_delta + node.current
+        inside = np.all((coords >= 0) & (coords < occupancy.shape), axis=1)
+        if allowed is not None:
+            inside &= allowed
+        index = np.flatnonzero(inside)
+        self.stats.collision_checks += len(index)
+        cells = tuple(coords[index].T)
+        if closed is None:
+            return index[~occupancy[cells]]
+        return index[~occupancy[cells] & (closed[cells] != self.search_id)]
+
+    def expandBatch(self, node: Node, occupancy: np.ndarray, allowed: np.ndarray = None,
+                    closed: np.ndarray = None) -> tuple:
+        """
+        Expand all motions of node in one vectorized step: neighbour coordinates,
+        validity, step costs (same as `cost`) and heuristics.
+
+        Parameters:
+            node (Node): current node
+            occupancy (np.ndarray): occupancy array of the environment
+            allowed (np.ndarray): optional mask of motions to consider
+            closed (np.ndarray): optional `closedStamps` of the cells to skip
+
+        Returns:
+            coords (np.ndarray): (N, 3) coordinates of the free neighbours
+            cost (np.ndarray): step cost from node to each neighbour
+            h (np.ndarray): heuristic of each neighbour
+        """
+        index = self.validMotions(node, occupancy, allowed, closed)
+        coords = self.motion_delta[index] + node.current
+        cost = self.motion_dist[index] * np.where(coords[:, 2] < self.LOW_ALTITUDE, self.LOW_ALTITUDE_FACTOR, 1.0)
+        return coords, cost, self.heuristicBatch(coords, self.goal)
+
+    def neighborEdges(self, current: tuple) -> list:
+        """
+        Free neighbors of a cell with the motion costs between them, the same
+        values as `getNeighbor` and `cost` give. Lists are cached per cell for
+        the current map version in `env.cache`, so all planners on one grid
+        share them; `invalidateEdges` keeps the cache across a change of known
+        cells.
+
+        Parameters:
+            current (tuple): cell coordinate
+
+        Returns:
+            edges (list): (neighbor, cost from neighbor to cell, cost from cell to neighbor)
+        """
+        version, cache = self.env.cache.get("edges", (None, None))
+        if version != self.env.version:
+            cache = dict()
+            self.env.cache["edges"] = (self.env.version, cache)
+
+        edges = cache.get(current)
+        if edges is None:
+            node, edges = Node(current), []
+            for motion in self.motions:
+                neighbor = tuple(c + d for c, d in zip(current, motion.current))
+                if not all(0 <= c < n for c, n in zip(neighbor, self.env.shape)):
+                    continue
+                node_n = Node(neighbor)
+                if not self.isCollision(node, node_n):
+                    edges.append((neighbor, self.cost(node_n, node), self.cost(node, node_n)))
+            cache[current] = edges
+        return edges
+
+    def invalidateEdges(self, cells: set) -> None:
+        """
+        Drop the cached edges around changed cells. Must be called right after
+        the `env.update` that changed exactly these cells, otherwise the whole
+        cache is rebuilt on the next access.
+
+        Parameters:
+            cells (set): coordinates whose occupancy changed
+        """
+        version, cache = self.env.cache.get("edges", (None, None))
+        if version != self.env.version - 1:
+            return
+        for cell in cells:
+            cache.pop(cell, None)
+            for motion in self.motions:
+                cache.pop(tuple(c - d for c, d in zip(cell, motion.current)), None)
+        self.env.cache["edges"] = (self.env.version, cache)
+
+    def disconnected(self) -> bool:
+        """
+        Whether start and goal lie in different components of free space, in
+        which case no path exists and the search can be skipped.
+        """
+        return not self.env.connected(self.start.current, self.goal.current)
+
+    def searchResult(self, cost: float, path: list, OPEN: list, CLOSED: dict, status: str = None) -> tuple:
+        """
+        Planning result with either the expanded nodes or, with `stats_only`,
+        the search statistics. In the latter case CLOSED is cleared so the nodes
+        can be freed as soon as the caller returns. Also sets `status`.
+
+        Parameters:
+            cost (float): path cost
+            path (list | np.ndarray): planning path, empty if no path was found
+            OPEN (list): OPEN list at the end of the search
+            CLOSED (dict): expanded nodes
+            status (str): `PlanStatus` of the search, derived from `path` if None
+
+        Returns:
+            cost (float): path cost
+            path (list | np.ndarray): planning path, an array if `path_array` is set
+            expand (list | SearchStats): expanded nodes (empty if no path was found) or statistics
+        """
+        found = len(path) > 0
+        self.status = status or (PlanStatus.SUCCESS if found else PlanStatus.NO_PATH)
+        if self.path_array:
+            path = np.asarray(path, dtype=np.int64).reshape(-1, 3)
+        elif isinstance(path, np.ndarray):
+            path = list(map(tuple, path.tolist()))
+
+        if not self.stats_only:
+            return cost, path, list(CLOSED.values()) if found else []
+
+        self.stats.expanded = len(CLOSED)
+        self.stats.pushed = self.stats.popped + len(OPEN)
+        CLOSED.clear()
+        return cost, path, self.stats
+
+    def partialResult(self, status: str, OPEN: list, CLOSED: dict) -> tuple:
+        """
+        Best partial result of a search stopped by its budget: the path to the
+        expanded node closest to the goal.
+
+        Parameters:
+            status (str): `PlanStatus` of the exceeded limit
+            OPEN (list): OPEN list at the end of the search
+            CLOSED (dict): expanded nodes
+
+        Returns:
+            cost (float): cost of the partial path
+            path (list): partial path from the node closest to the goal back to start
+            expand (list | SearchStats): expanded nodes or statistics
+        """
+        if not CLOSED:
+            return self.searchResult([], [], OPEN, CLOSED, status)
+        best = min(CLOSED.values(), key=lambda node: self.h(node, self.goal))
+        cost, path = self.extractPath(CLOSED, best.current)
+        return self.searchResult(cost, path, OPEN, CLOSED, status)
+
+    def pathCost(self, path: list) -> float:
+        """
+        Cost of a goal -> start path, recomputed edge by edge with `travelCost`
+        in the start -> goal direction of travel, like the g-values of A*. The
+        edges are not checked for collision again: planners such as Theta*
+        validate them with `Grid.lineOfSight`, whose cells differ from the
+        rounding of `isCollision`.
+        """
+        return sum(self.travelCost(Node(tuple(node_parent)), Node(tuple(node)))
+                   for node, node_parent in zip(path[:-1], path[1:]))
+
     def cost(self, node1: Node, node2: Node) -> float:
         """
         Calculate motion cost with altitude reward/penalty.
@@ -52,18 +317,24 @@ class GraphSearcher(Planner):
         """
         if self.isCollision(node1, node2):
             return float("inf")
+        return self.travelCost(node1, node2)
 
+    def travelCost(self, node1: Node, node2: Node) -> float:
+        """
+        Motion cost of `cost` without the collision check.
+        """
         base_cost = self.dist(node1, node2)
 
         ## If the altitude (z) is lower than 5, then double the motion cost
-        if node2.z < 5:
-            altitude_factor = 2.0
+        if node2.z < self.LOW_ALTITUDE:
+            altitude_factor = self.LOW_ALTITUDE_FACTOR
         else:
             altitude_factor = 1.0
 
         return base_cost * altitude_factor
 
     def isCollision(self, node1, node2):
+        self.stats.collision_checks += 1
         x1, y1, z1 = node1.current
         x2, y2, z2 = node2.current
         dx, dy, dz = x2 - x1, y2 - y1, z2 - z1
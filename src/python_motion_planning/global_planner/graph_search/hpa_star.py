@@ -0,0 +1,415 @@
+"""
+@file: hpa_star.py
+@breif: Hierarchical Path-Finding A* motion planning
+@update: 2026.10.18
+"""
+import heapq
+import numpy as np
+from scipy import ndimage
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from .a_star import AStar
+from .graph_search import SearchStats
+from python_motion_planning.utils import Env, Grid, Node, PlanStatus, SEARCH_PLANNERS
+
+
+class AbstractGraph(object):
+    """
+    Class for the abstract graph of HPA*, built once per grid version.
+
+    Parameters:
+        cluster_size (tuple): cluster size along x, y and z
+        shape (tuple): grid shape
+
+    Attributes:
+        version (int): grid version the graph is consistent with
+        faces (dict): (cluster, axis) -> list of entrance pairs crossing the face
+            between `cluster` and its neighbour along `axis`
+        nodes (dict): cluster -> set of entrance cells inside the cluster
+        edges (dict): cell -> {cell: (cost, path)}, intra-cluster paths and
+            inter-cluster steps of the abstract graph
+    """
+    def __init__(self, cluster_size: tuple, shape: tuple) -> None:
+        self.cluster_size = cluster_size
+        self.shape = shape
+        self.dims = tuple(-(-s // c) for s, c in zip(shape, cluster_size))
+        self.version = -1
+        self.faces = dict()
+        self.nodes = dict()
+        self.edges = dict()
+
+    def clusterOf(self, cell: tuple) -> tuple:
+        return tuple(int(v) // c for v, c in zip(cell, self.cluster_size))
+
+    def bounds(self, cluster: tuple) -> tuple:
+        lo = tuple(i * c for i, c in zip(cluster, self.cluster_size))
+        hi = tuple(min(l + c, s) for l, c, s in zip(lo, self.cluster_size, self.shape))
+        return lo, hi
+
+    @property
+    def clusters(self) -> list:
+        return [tuple(c) for c in np.ndindex(*self.dims)]
+
+
+@SEARCH_PLANNERS.register("hpa_star")
+class HPAStar(AStar):
+    """
+    Class for Hierarchical Path-Finding A* (HPA*) motion planning in 3D.
+
+    The grid is partitioned into clusters, entrances are placed on the free
+    parts of the faces between neighbouring clusters and the paths between
+    entrances of one cluster are precomputed. A query only connects start and
+    goal to the entrances of their clusters, searches the small abstract graph
+    and concatenates the cached paths. The abstract graph is stored in
+    `env.cache` and repaired only for clusters touched by obstacle edits.
+
+    Paths are near-optimal only, since they have to cross cluster faces at
+    entrances. How much more they cost than the optimal A* path depends on
+    the map, the cluster size and the query, and there is no fixed bound:
+    the excess is largest for short queries whose optimal path crosses a
+    face far from an entrance. A smaller `entrance_spacing` narrows the gap
+    at a higher build cost of the abstract graph.
+
+    When the search budget runs out, the path to the expanded abstract node
+    closest to the goal is returned with status `TIMEOUT` or `CANCELLED`,
+    like `partialResult` of the other planners.
+
+    Parameters:
+        start (tuple): start point coordinate
+        goal (tuple): goal point coordinate
+        env (Grid): environment
+        heuristic_type (str): heuristic function type
+        cluster_size (tuple): cluster size along x, y and z
+        entrance_spacing (int): spacing of the entrances placed on wide free
+            parts of a cluster face, larger is faster but less optimal, see above
+        stats_only (bool): return `SearchStats` instead of the expanded nodes
+
+    Examples:
+        >>> import python_motion_planning as pmp
+        >>> planner = pmp.HPAStar((5, 5, 5), (45, 25, 5), pmp.Grid(51, 31, 11), cluster_size=(10, 10, 5))
+        >>> cost, path, expand = planner.plan()     # planning results only
+        >>> planner.run()       # run both planning and animation
+
+    References:
+        [1] Near Optimal Hierarchical Path-Finding
+    """
+    def __init__(self, start: tuple = None, goal: tuple = None, env: Grid = None, heuristic_type: str = "euclidean",
+                 cluster_size: tuple = (10, 10, 10), entrance_spacing: int = 4, stats_only: bool = False) -> None:
+        super().__init__(start, goal, env, heuristic_type, stats_only=stats_only)
+        self.cluster_size = tuple(cluster_size)
+        self.entrance_spacing = entrance_spacing
+
+    def __str__(self) -> str:
+        return "Hierarchical Path-Finding A*(HPA*)"
+
+    def plan(self, start: tuple = None, goal: tuple = None) -> tuple:
+        """
+        HPA* motion plan function.
+
+        Parameters:
+            start (tuple): new start point coordinate, None to keep the current one
+            goal (tuple): new goal point coordinate, None to keep the current one
+
+        Returns:
+            cost (float): path cost
+            path (list): planning path
+            expand (list): abstract nodes that planner has searched, or `SearchStats`
+        """
+        if start is not None or goal is not None:
+            self.reset(start, goal)
+
+        self.stats = SearchStats()
+        self.budget.start()
+        if self.disconnected():
+            return self.searchResult([], [], [], dict())
+        graph = self.abstractGraph()
+        start, goal = self.start.current, self.goal.current
+        start_cluster, goal_cluster = graph.clusterOf(start), graph.clusterOf(goal)
+
+        best_cost, best_path = float("inf"), []
+        # inside one cluster the direct path may beat any detour over entrances
+        if start_cluster == goal_cluster:
+            direct = self.searchCluster(graph, [start], start_cluster, {goal})[start]
+            if goal in direct:
+                best_cost, best_path = direct[goal]
+
+        # connect start and goal to the entrances of their clusters
+        start_edges = self.searchCluster(graph, [start], start_cluster,
+                                         graph.nodes.get(start_cluster, set())).get(start, dict())
+        goal_edges = self.searchCluster(graph, [goal], goal_cluster,
+                                        graph.nodes.get(goal_cluster, set()), reverse=True).get(goal, dict())
+
+        cost, path, expand = self.searchAbstract(graph, start_edges, goal_edges)
+        if len(best_path) and (self.status != PlanStatus.SUCCESS or best_cost <= cost):
+            # the direct path inside one cluster exists and the abstract search did not beat it
+            cost, path = best_cost, best_path
+            self.status = PlanStatus.SUCCESS
+
+        if not len(path):
+            return [], [], self.stats if self.stats_only else []
+        # keep the goal -> start order of `AStar.extractPath`
+        path = path[::-1]
+        if self.path_array:
+            path = np.asarray(path, dtype=np.int64).reshape(-1, 3)
+        return cost, path, expand
+
+    def abstractGraph(self) -> AbstractGraph:
+        """
+        Get the abstract graph of the current grid version, building it on the
+        first call and repairing only the touched clusters after obstacle edits.
+
+        Returns:
+            graph (AbstractGraph): abstract graph consistent with `env.version`
+        """
+        key = ("hpa_star", self.cluster_size, self.entrance_spacing)
+        graph = self.env.cache.get(key)
+        changed = None if graph is None else self.env.changedCells(graph.version)
+
+        if changed is None:
+            graph = AbstractGraph(self.cluster_size, self.env.shape)
+            self.env.cache[key] = graph
+            self.rebuild(graph, graph.clusters, [(c, a) for c in graph.clusters for a in range(3)])
+        elif len(changed):
+            # cells on a cluster border also change the entrances of the neighbour
+            touched = set()
+            for cell in changed:
+                for axis in range(3):
+                    for d in (-1, 0, 1):
+                        moved = list(cell)
+                        moved[axis] += d
+                        if 0 <= moved[axis] < graph.shape[axis]:
+                            touched.add(graph.clusterOf(moved))
+            faces = set()
+            for cluster in touched:
+                for axis in range(3):
+                    faces.add((cluster, axis))
+                    prev = list(cluster)
+                    prev[axis] -= 1
+                    if prev[axis] >= 0:
+                        faces.add((tuple(prev), axis))
+            self.rebuild(graph, touched, faces)
+
+        graph.version = self.env.version
+        return graph
+
+    def rebuild(self, graph: AbstractGraph, clusters, faces) -> None:
+        """
+        Recompute entrances of `faces` and intra-cluster paths of `clusters`.
+
+        Parameters:
+            graph (AbstractGraph): abstract graph to repair in place
+            clusters (iterable): clusters whose intra-cluster paths are recomputed
+            faces (iterable): (cluster, axis) faces whose entrances are recomputed
+        """
+        clusters = set(clusters)
+        for face in faces:
+            for a, b in graph.faces.get(face, []):
+                graph.edges.get(a, {}).pop(b, None)
+                graph.edges.get(b, {}).pop(a, None)
+            graph.faces[face] = self.findEntrances(graph, *face)
+            # both sides of a rebuilt face need new intra-cluster paths
+            other = list(face[0])
+            other[face[1]] += 1
+            clusters.update((face[0], tuple(other)))
+
+        for cluster in clusters:
+            if not all(0 <= c < d for c, d in zip(cluster, graph.dims)):
+                continue
+            old = graph.nodes.get(cluster, set())
+            new = set()
+            for axis in range(3):
+                prev = list(cluster)
+                prev[axis] -= 1
+                new.update(a for a, _ in graph.faces.get((cluster, axis), []))
+                new.update(b for _, b in graph.faces.get((tuple(prev), axis), []))
+            graph.nodes[cluster] = new
+
+            for cell in old - new:
+                graph.edges.pop(cell, None)
+            intra = self.searchCluster(graph, list(new), cluster, new)
+            for cell in new:
+                edges = graph.edges.setdefault(cell, dict())
+                for other in [c for c in edges if graph.clusterOf(c) == cluster]:
+                    del edges[other]
+                edges.update(intra.get(cell, dict()))
+
+        for face in faces:
+            for a, b in graph.faces[face]:
+                node_a, node_b = Node(a), Node(b)
+                graph.edges.setdefault(a, dict())[b] = (self.cost(node_a, node_b), [a, b])
+                graph.edges.setdefault(b, dict())[a] = (self.cost(node_b, node_a), [b, a])
+
+    def findEntrances(self, graph: AbstractGraph, cluster: tuple, axis: int) -> list:
+        """
+        Find entrances on the face between `cluster` and its neighbour along `axis`.
+        Every connected free part of the face gets an entrance at its centre,
+        wide parts additionally every `entrance_spacing` cells.
+
+        Parameters:
+            graph (AbstractGraph): abstract graph
+            cluster (tuple): cluster on the lower side of the face
+            axis (int): axis the face is orthogonal to
+
+        Returns:
+            entrances (list): (cell in cluster, cell in neighbour) pairs
+        """
+        lo, hi = graph.bounds(cluster)
+        if hi[axis] >= graph.shape[axis]:
+            return []
+
+        occupancy = self.env.occupancy
+        side_a = [slice(l, h) for l, h in zip(lo, hi)]
+        side_b = list(side_a)
+        side_a[axis], side_b[axis] = hi[axis] - 1, hi[axis]
+        free = ~occupancy[tuple(side_a)] & ~occupancy[tuple(side_b)]
+
+        others = [i for i in range(3) if i != axis]
+        labels, num = ndimage.label(free)
+        spacing = self.entrance_spacing
+        entrances = []
+        for k in range(1, num + 1):
+            cells = np.argwhere(labels == k)
+            centre = cells[np.argmin(np.linalg.norm(cells - cells.mean(axis=0), axis=1))]
+            grid = np.all(cells % spacing == spacing // 2, axis=1)
+            for cell in np.vstack((centre, cells[grid & np.any(cells != centre, axis=1)])):
+                a = [0, 0, 0]
+                for i, v in zip(others, cell):
+                    a[i] = lo[i] + int(v)
+                a[axis] = hi[axis] - 1
+                b = list(a)
+                b[axis] = hi[axis]
+                entrances.append((tuple(a), tuple(b)))
+        return entrances
+
+    def searchCluster(self, graph: AbstractGraph, sources: list, cluster: tuple,
+                      targets: set, reverse: bool = False) -> dict:
+        """
+        Dijkstra searches restricted to one cluster, run together on a sparse
+        graph of the cluster cells.
+
+        Parameters:
+            graph (AbstractGraph): abstract graph
+            sources (list): source cells
+            cluster (tuple): cluster the searches may not leave
+            targets (set): cells to find paths to
+            reverse (bool): search paths from targets to sources instead
+
+        Returns:
+            paths (dict): source -> {target: (cost, path)}, paths ordered in moving direction
+        """
+        lo, hi = graph.bounds(cluster)
+        box = tuple(slice(l, h) for l, h in zip(lo, hi))
+        size = tuple(h - l for l, h in zip(lo, hi))
+        free = ~self.env.occupancy[box]
+
+        sources = [s for s in sources if free[tuple(np.subtract(s, lo))]]
+        targets = [t for t in targets if free[tuple(np.subtract(t, lo))]]
+        if not sources or not targets:
+            return {s: dict() for s in sources}
+
+        # directed edges between free cells of the cluster, weighted as `cost`
+        cells = np.argwhere(free)
+        rows, cols, weights = [], [], []
+        for motion in self.motions:
+            dst = cells + np.array(motion.current)
+            inside = np.all((dst >= 0) & (dst < size), axis=1)
+            src, dst = cells[inside], dst[inside]
+            valid = free[tuple(dst.T)]
+            src, dst = src[valid], dst[valid]
+            z = dst[:, 2] + lo[2]
+            rows.append(np.ravel_multi_index(src.T, size))
+            cols.append(np.ravel_multi_index(dst.T, size))
+            weights.append(np.where(z < self.LOW_ALTITUDE, self.LOW_ALTITUDE_FACTOR, 1.0) * motion.g)
+        n = int(np.prod(size))
+        adjacency = csr_matrix((np.concatenate(weights), (np.concatenate(rows), np.concatenate(cols))), shape=(n, n))
+        if reverse:
+            adjacency = adjacency.T.tocsr()
+
+        source_idx = [int(np.ravel_multi_index(tuple(np.subtract(s, lo)), size)) for s in sources]
+        target_idx = [int(np.ravel_multi_index(tuple(np.subtract(t, lo)), size)) for t in targets]
+        dist, pred = dijkstra(adjacency, directed=True, indices=source_idx, return_predecessors=True)
+
+        paths = dict()
+        for i, source in enumerate(sources):
+            paths[source] = dict()
+            for target, t in zip(targets, target_idx):
+                if target == source or not np.isfinite(dist[i, t]):
+                    continue
+                path, v = [], t
+                while v >= 0:
+                    path.append(tuple(int(c + l) for c, l in zip(np.unravel_index(v, size), lo)))
+                    v = pred[i, v]
+                paths[source][target] = (float(dist[i, t]), path if reverse else path[::-1])
+        return paths
+
+    def searchAbstract(self, graph: AbstractGraph, start_edges: dict, goal_edges: dict) -> tuple:
+        """
+        A* search on the abstract graph extended with start and goal, then
+        refinement by concatenating the cached low-level paths.
+
+        Parameters:
+            graph (AbstractGraph): abstract graph
+            start_edges (dict): entrance -> (cost, path) from start
+            goal_edges (dict): entrance -> (cost, path) to goal
+
+        Returns:
+            cost (float): path cost
+            path (list): grid path from start to goal
+            expand (list): expanded abstract nodes, or `SearchStats`
+        """
+        start, goal = self.start.current, self.goal.current
+        g, parent, segment = {start: 0}, {start: None}, {start: [start]}
+        OPEN = [(self.h(self.start, self.goal), 0, start)]
+        CLOSED = dict()
+
+        while OPEN:
+            self.stats.pop(len(OPEN))
+            _, g_u, u = heapq.heappop(OPEN)
+            if u in CLOSED:
+                continue
+
+            # stop with the path to the expanded node closest to the goal once the budget is spent
+            status = self.budget.exhausted()
+            if status is not None:
+                if not CLOSED:
+                    return self.searchResult(float("inf"), [], OPEN, CLOSED, status)
+                best = min(CLOSED.values(), key=lambda node: self.h(node, self.goal))
+                return self.searchResult(best.g, self.refinePath(parent, segment, best.current),
+                                         OPEN, CLOSED, status)
+            CLOSED[u] = Node(u, parent[u], g_u, 0)
+
+            if u == goal:
+                return self.searchResult(g_u, self.refinePath(parent, segment, goal), OPEN, CLOSED)
+
+            edges = dict(graph.edges.get(u, {}))
+            if u == start:
+                edges.update(start_edges)
+            if u in goal_edges:
+                edges[goal] = goal_edges[u]
+
+            for v, (c, seg) in edges.items():
+                if v in CLOSED or g_u + c >= g.get(v, float("inf")):
+                    continue
+                g[v], parent[v], segment[v] = g_u + c, u, seg
+                heapq.heappush(OPEN, (g_u + c + self.h(Node(v), self.goal), g_u + c, v))
+        return self.searchResult(float("inf"), [], OPEN, CLOSED)
+
+    def refinePath(self, parent: dict, segment: dict, end: tuple) -> list:
+        """
+        Grid path from start to an abstract node, concatenating the cached
+        low-level segments of the abstract edges.
+
+        Parameters:
+            parent (dict): abstract node -> previous abstract node, None for start
+            segment (dict): abstract node -> grid path of the edge reaching it
+            end (tuple): last abstract node of the path
+
+        Returns:
+            path (list): grid path from start to end
+        """
+        path, v = [], end
+        while v is not None:
+            path.extend(segment[v][::-1][:-1] if parent[v] is not None else segment[v])
+            v = parent[v]
+        return path[::-1]
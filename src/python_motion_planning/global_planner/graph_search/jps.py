@@ -1,27 +1,48 @@
 import heapq
+import numpy as np
+
 from .a_star import AStar
-from python_motion_planning.utils import Node, Grid
+from .graph_search import SearchStats
+from python_motion_planning.utils import Node, Grid, SEARCH_PLANNERS
 
+@SEARCH_PLANNERS.register("jps")
 class JPS(AStar):
     """
     Iterative, efficient 3D Jump Point Search planner.
+
+    With `jump_table=True` the jump distances of every cell and motion are
+    precomputed once per grid version (JPS+) and each jump takes O(1).
     """
 
-    def __init__(self, start: tuple, goal: tuple, env: Grid, heuristic_type: str = "euclidean"):
-        super().__init__(start, goal, env, heuristic_type)
+    def __init__(self, start: tuple = None, goal: tuple = None, env: Grid = None, heuristic_type: str = "euclidean",
+                 jump_table: bool = False, stats_only: bool = False) -> None:
+        super().__init__(start, goal, env, heuristic_type, stats_only=stats_only)
+        # use precomputed jump distances instead of stepping cell by cell
+        self.jump_table = jump_table
+        self.motion_index = {motion.current: i for i, motion in enumerate(self.motions)}
 
     def __str__(self):
         return "Jump Point Search(JPS)"
 
-    def plan(self):
+    def plan(self, start: tuple = None, goal: tuple = None):
+        if start is not None or goal is not None:
+            self.reset(start, goal)
+
         OPEN = []
         self.start.g = 0
         self.start.h = self.h(self.start, self.goal)
         self.start.f = self.start.g + self.start.h
         heapq.heappush(OPEN, (self.start.f, self.start))
         CLOSED = dict()
+        self.stats = SearchStats()
+        self.budget.start()
+        # start and goal in different free-space components: no path, nothing to search
+        if self.disconnected():
+            return self.searchResult([], [], OPEN, CLOSED)
+        jump = self.tableJump if self.jump_table else self.jump
 
         while OPEN:
+            self.stats.pop(len(OPEN))
             _, node = heapq.heappop(OPEN)
 
             if node.current in CLOSED:
@@ -30,11 +51,16 @@ class JPS(AStar):
 
             if node == self.goal:
                 cost, path = self.extractPath(CLOSED)
-                return cost, path, list(CLOSED.values())
+                return self.searchResult(cost, path, OPEN, CLOSED)
+
+            # stop with the best partial result once the budget is spent
+            status = self.budget.exhausted()
+            if status is not None:
+                return self.partialResult(status, OPEN, CLOSED)
 
             # Explore jump points from current node
             for motion in self.prune_motions(node):
-                jp, g_inc = self.jump(node, motion)
+                jp, g_inc = jump(node, motion)
                 if jp and (jp.current not in CLOSED or jp.g > node.g + g_inc):
                     jp.g = node.g + g_inc
                     jp.h = self.h(jp, self.goal)
@@ -42,17 +68,18 @@ class JPS(AStar):
                     jp.parent = node.current
                     heapq.heappush(OPEN, (jp.f, jp))
 
-        return [], [], []
+        return self.searchResult([], [], OPEN, CLOSED)
 
     def jump(self, node: Node, motion: Node):
         """
         Iterative jump along the motion direction.
         Returns a jump point node and the incremental cost from `node`.
-        Properly accumulates altitude-adjusted cost.
+        The altitude-adjusted cost comes from `rayCost` as in `tableJump`, so
+        both variants give bit-identical g values and break ties alike.
         """
         dx, dy, dz = motion.current
         x, y, z = node.current
-        g_inc = 0
+        steps = 0
 
         while True:
             nx, ny, nz = x + dx, y + dy, z + dz
@@ -64,35 +91,174 @@ class JPS(AStar):
             if (nx, ny, nz) in self.obstacles:
                 return None, None
 
-            # Compute step cost from previous to new node
-            prev_node = Node((x, y, z), None, 0, 0)
-            next_node = Node((nx, ny, nz), None, 0, 0)
-            step_cost = self.cost(prev_node, next_node)
-            if step_cost == float("inf"):
-                return None, None
-
-            g_inc += step_cost
-
             # Move to next step
             x, y, z = nx, ny, nz
+            steps += 1
             current = Node((x, y, z), node.current, 0, 0)
 
             # Goal found
             if current == self.goal:
-                return current, g_inc
+                return current, self.rayCost(node.z, dz, steps, motion.g)
 
             # Forced neighbor triggers jump point
             if self.detectForceNeighbor(current, motion):
-                return current, g_inc
+                return current, self.rayCost(node.z, dz, steps, motion.g)
 
             # If moving along a single axis, stop here (1D motion)
             if abs(dx) + abs(dy) + abs(dz) == 1:
-                return current, g_inc
+                return current, self.rayCost(node.z, dz, steps, motion.g)
 
             # For diagonals: check orthogonal directions iteratively
             # Only stop if detectForceNeighbor triggers (already handled)
 
 
+    def tableJump(self, node: Node, motion: Node):
+        """
+        Jump along the motion direction using the precomputed jump table.
+        Same result as `jump`, in constant time.
+        """
+        table = self.jumpTable()
+        x, y, z = node.current
+        dx, dy, dz = motion.current
+        dist = int(table[x, y, z, self.motion_index[motion.current]])
+        # free steps before a wall, or steps to the next jump point
+        reach = abs(dist)
+
+        # the goal stops the jump before any jump point behind it
+        steps = None
+        for c, g, d in zip(node.current, self.goal.current, motion.current):
+            if d == 0:
+                if c != g:
+                    steps = None
+                    break
+            else:
+                t = (g - c) * d
+                if t < 1 or (steps is not None and t != steps):
+                    steps = None
+                    break
+                steps = t
+        if steps is not None and steps <= reach:
+            jp = Node(self.goal.current, node.current, 0, 0)
+        elif dist > 0:
+            steps = dist
+            jp = Node((x + dx * steps, y + dy * steps, z + dz * steps), node.current, 0, 0)
+        else:
+            return None, None
+
+        return jp, self.rayCost(z, dz, steps, motion.g)
+
+    def rayCost(self, z: int, dz: int, steps: int, step_len: float) -> float:
+        """
+        Cost of `steps` straight steps of length `step_len` starting at altitude z,
+        with the altitude factor of `cost` applied to every step. Summing the
+        steps one by one would round differently.
+        """
+        if dz == 0:
+            low = steps if z < self.LOW_ALTITUDE else 0
+        elif dz > 0:
+            low = min(steps, max(0, self.LOW_ALTITUDE - z - 1))
+        else:
+            low = steps - min(steps, max(0, z - self.LOW_ALTITUDE))
+        return step_len * (steps + (self.LOW_ALTITUDE_FACTOR - 1) * low)
+
+    def jumpTable(self) -> np.ndarray:
+        """
+        Jump table of the current grid version, cached in `env.cache`.
+
+        Returns:
+            table (np.ndarray): int16 array of shape (x, y, z, motions). A positive
+                value is the number of steps to the next jump point, otherwise its
+                magnitude is the number of free steps before hitting a wall.
+        """
+        version, table = self.env.cache.get("jps_table", (None, None))
+        if version != self.env.version:
+            table = self.buildJumpTable()
+            self.env.cache["jps_table"] = (self.env.version, table)
+        return table
+
+    def buildJumpTable(self) -> np.ndarray:
+        """
+        Compute the jump table with one sweep per motion over the occupancy array.
+        """
+        occupancy = self.env.occupancy
+        shape = occupancy.shape
+        # out-of-range cells are free for forced neighbours but block the jump
+        in_obstacles = np.pad(occupancy, 1, constant_values=False)
+        blocked = np.pad(occupancy, 1, constant_values=True)
+
+        def shifted(padded, offset):
+            return padded[tuple(slice(1 + o, 1 + o + n) for o, n in zip(offset, shape))]
+
+        table = np.zeros(shape + (len(self.motions),), dtype=np.int16)
+        for k, motion in enumerate(self.motions):
+            d = motion.current
+            forced = np.pad(self.forcedNeighborMask(in_obstacles, d), 1, constant_values=False)
+            next_free = ~shifted(blocked, d)
+            stop = next_free & (shifted(forced, d) | (sum(map(abs, d)) == 1))
+
+            # sweep against the motion along one of its moving axes
+            axis = next(i for i in range(3) if d[i])
+            order = range(shape[axis] - 1, -1, -1) if d[axis] > 0 else range(shape[axis])
+            dist = np.zeros(tuple(n + 2 for n in shape), dtype=np.int32)
+            for i in order:
+                cur = [slice(1, 1 + n) for n in shape]
+                nxt = [slice(1 + o, 1 + o + n) for o, n in zip(d, shape)]
+                cur[axis], nxt[axis] = 1 + i, 1 + i + d[axis]
+                sub = [slice(None)] * 3
+                sub[axis] = i
+                sub = tuple(sub)
+
+                dist_next = dist[tuple(nxt)]
+                dist[tuple(cur)] = np.where(next_free[sub], np.where(stop[sub], 1,
+                    np.where(dist_next > 0, dist_next + 1, dist_next - 1)), 0)
+            table[..., k] = shifted(dist, (0, 0, 0))
+        return table
+
+    def forcedNeighborMask(self, in_obstacles: np.ndarray, direction: tuple) -> np.ndarray:
+        """
+        Vectorized `detectForceNeighbor` for every cell of the grid.
+
+        Parameters:
+            in_obstacles (np.ndarray): occupancy padded by one free cell
+            direction (tuple): motion direction
+
+        Returns:
+            forced (np.ndarray): True where a node moving along `direction` has a forced neighbor
+        """
+        shape = tuple(n - 2 for n in in_obstacles.shape)
+        x_dir, y_dir, z_dir = direction
+
+        def O(dx, dy, dz):
+            return in_obstacles[1 + dx:1 + dx + shape[0], 1 + dy:1 + dy + shape[1], 1 + dz:1 + dz + shape[2]]
+
+        forced = np.zeros(shape, dtype=bool)
+        if x_dir and not y_dir and not z_dir:
+            for dy in [-1, 1]:
+                for dz in [-1, 1]:
+                    forced |= O(0, dy, dz) & ~O(x_dir, dy, dz)
+        if not x_dir and y_dir and not z_dir:
+            for dx in [-1, 1]:
+                for dz in [-1, 1]:
+                    forced |= O(dx, 0, dz) & ~O(dx, y_dir, dz)
+        if not x_dir and not y_dir and z_dir:
+            for dx in [-1, 1]:
+                for dy in [-1, 1]:
+                    forced |= O(dx, dy, 0) & ~O(dx, dy, z_dir)
+        if x_dir and y_dir and not z_dir:
+            forced |= O(-x_dir, 0, 0) & ~O(-x_dir, y_dir, 0)
+            forced |= O(0, -y_dir, 0) & ~O(x_dir, -y_dir, 0)
+        if x_dir and not y_dir and z_dir:
+            forced |= O(-x_dir, 0, 0) & ~O(-x_dir, 0, z_dir)
+            forced |= O(0, 0, -z_dir) & ~O(x_dir, 0, -z_dir)
+        if not x_dir and y_dir and z_dir:
+            forced |= O(0, -y_dir, 0) & ~O(0, -y_dir, z_dir)
+            forced |= O(0, 0, -z_dir) & ~O(0, y_dir, -z_dir)
+        if x_dir and y_dir and z_dir:
+            forced |= O(-x_dir, 0, 0) & ~O(-x_dir, y_dir, z_dir)
+            forced |= O(0, -y_dir, 0) & ~O(x_dir, -y_dir, z_dir)
+            forced |= O(0, 0, -z_dir) & ~O(x_dir, y_dir, -z_dir)
+        return forced
+
     def prune_motions(self, node: Node):
         if not node.parent:
             return self.motions  # At start, all motions allowed
@@ -7,8 +7,10 @@
 import heapq
 
 from .theta_star import ThetaStar
-from python_motion_planning.utils import Env, Node, Grid
+from .graph_search import SearchStats
+from python_motion_planning.utils import Env, Node, Grid, SEARCH_PLANNERS
 
+@SEARCH_PLANNERS.register("lazy_theta_star")
 class LazyThetaStar(ThetaStar):
     """
     Class for Lazy Theta* motion planning.
@@ -18,6 +20,7 @@ class LazyThetaStar(ThetaStar):
         goal (tuple): goal point coordinate
         env (Grid): environment
         heuristic_type (str): heuristic function type
+        stats_only (bool): return `SearchStats` instead of the expanded nodes
 
     Examples:
         >>> import python_motion_planning as pmp
@@ -29,27 +32,41 @@ class LazyThetaStar(ThetaStar):
     References:
         [1] Lazy Theta*: Any-Angle Path Planning and Path Length Analysis in 3D
     """
-    def __init__(self, start: tuple, goal: tuple, env: Grid, heuristic_type: str = "euclidean") -> None:
-        super().__init__(start, goal, env, heuristic_type)
+    def __init__(self, start: tuple = None, goal: tuple = None, env: Grid = None, heuristic_type: str = "euclidean",
+                 stats_only: bool = False) -> None:
+        super().__init__(start, goal, env, heuristic_type, stats_only=stats_only)
 
     def __str__(self) -> str:
         return "Lazy Theta*"
 
-    def plan(self) -> tuple:
+    def plan(self, start: tuple = None, goal: tuple = None) -> tuple:
         """
         Lazy Theta* motion plan function.
 
+        Parameters:
+            start (tuple): new start point coordinate, None to keep the current one
+            goal (tuple): new goal point coordinate, None to keep the current one
+
         Returns:
             cost (float): path cost
             path (list): planning path
             expand (list): all nodes that planner has searched
         """
+        if start is not None or goal is not None:
+            self.reset(start, goal)
+
         # OPEN list (priority queue) and CLOSED list (hash table)
         OPEN = []
         heapq.heappush(OPEN, self.start)
         CLOSED = dict()
+        self.stats = SearchStats()
+        self.budget.start()
+        # start and goal in different free-space components: no path, nothing to search
+        if self.disconnected():
+            return self.searchResult([], [], OPEN, CLOSED)
 
         while OPEN:
+            self.stats.pop(len(OPEN))
             node = heapq.heappop(OPEN)
 
             # set vertex: path 1
@@ -72,7 +89,12 @@ class LazyThetaStar(ThetaStar):
             if node == self.goal:
                 CLOSED[node.current] = node
                 cost, path = self.extractPath(CLOSED)
-                return cost, path, list(CLOSED.values())
+                return self.searchResult(cost, path, OPEN, CLOSED)
+
+            # stop with the best partial result once the budget is spent
+            status = self.budget.exhausted()
+            if status is not None:
+                return self.partialResult(status, OPEN, CLOSED)
 
             for node_n in self.getNeighbor(node):                
                 # exists in CLOSED list
@@ -98,7 +120,7 @@ class LazyThetaStar(ThetaStar):
                 heapq.heappush(OPEN, node_n)
             
             CLOSED[node.current] = node
-        return [], [], []
+        return self.searchResult([], [], OPEN, CLOSED)
     
     def updateVertex(self, node_p: Node, node_c: Node) -> None:
         """
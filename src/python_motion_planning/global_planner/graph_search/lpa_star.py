@@ -4,10 +4,8 @@
 @author: Yang Haodong, Wu Maojia
 @update: 2024.6.23
 """
-import heapq
-
 from .graph_search import GraphSearcher
-from python_motion_planning.utils import Env, Node, Grid
+from python_motion_planning.utils import Env, Node, Grid, PlanStatus, IndexedHeap, SEARCH_PLANNERS
 
 class LNode(Node):
     """
@@ -48,6 +46,7 @@ class LNode(Node):
     def z(self) -> float:
         return self.current[2]
 
+@SEARCH_PLANNERS.register("lpa_star")
 class LPAStar(GraphSearcher):
     """
     Class for LPA* motion planning in 3D.
@@ -68,19 +67,37 @@ class LPAStar(GraphSearcher):
     References:
         [1] Lifelong Planning A*
     """
-    def __init__(self, start: tuple, goal: tuple, env: Grid, heuristic_type: str = "euclidean") -> None:
-        # Ensure 3D coordinates
-        if len(start) != 3 or len(goal) != 3:
-            raise ValueError("Start and goal must be 3D coordinates (x, y, z)")
+    # keys closer than this are ties, so rounding noise cannot stop the search early
+    KEY_TOLERANCE = 1e-9
+
+    def __init__(self, start: tuple = None, goal: tuple = None, env: Grid = None, heuristic_type: str = "euclidean") -> None:
         if env.z_range is None:
             raise ValueError("Environment must have z_range specified for 3D planning")
-            
+
         super().__init__(start, goal, env, heuristic_type)
+        if start is not None and goal is not None:
+            self.reset(start, goal)
+
+    def reset(self, start: tuple = None, goal: tuple = None) -> None:
+        """
+        Start a new planning query, re-initializing the map records.
+
+        Parameters:
+            start (tuple): new start point coordinate, None to keep the current one
+            goal (tuple): new goal point coordinate, None to keep the current one
+        """
+        start = self.start.current if start is None else start
+        goal = self.goal.current if goal is None else goal
+        # Ensure 3D coordinates
+        if len(start) != 3 or len(goal) != 3:
+            raise ValueError("Start and goal must be 3D coordinates (x, y, z)")
+
+        super().reset(start, goal)
         # start and goal
         self.start = LNode(start, float('inf'), 0.0, None)
         self.goal = LNode(goal, float('inf'), float('inf'), None)
-        # OPEN set and expand zone
-        self.U, self.EXPAND = [], []
+        # OPEN set keyed by priority and expand zone
+        self.U, self.EXPAND = IndexedHeap(), []
 
         # intialize global information, record history infomation of map grids
         self.map = {s: LNode(s, float('inf'), float('inf'), None) for s in self.env.grid_map}
@@ -88,21 +105,98 @@ class LPAStar(GraphSearcher):
         self.map[self.start.current] = self.start
         # OPEN set with priority
         self.start.key = self.calculateKey(self.start)
-        heapq.heappush(self.U, self.start)
+        self.U.push(self.start, self.start.key)
 
     def __str__(self) -> str:
         return "Lifelong Planning A* (3D)"
 
-    def plan(self) -> tuple:
+    def plan(self, start: tuple = None, goal: tuple = None) -> tuple:
         """
         LPA* dynamic motion planning function.
 
+        Parameters:
+            start (tuple): new start point coordinate, None to keep the current one
+            goal (tuple): new goal point coordinate, None to keep the current one
+
         Returns:
             cost (float): path cost
             path (list): planning path
             _ (None): None
         """
+        if start is not None or goal is not None:
+            self.reset(start, goal)
+
+        if self.disconnected():
+            self.status = PlanStatus.NO_PATH
+            return [], [], None
+
         self.computeShortestPath()
+        if self.status != PlanStatus.SUCCESS:
+            return [], [], None
+        cost, path = self.extractPath()
+        return cost, path, None
+
+    def updateObstacles(self, added: list = (), removed: list = ()) -> None:
+        """
+        Apply a batch of obstacle changes without planning. Only the changed
+        cells and their neighbors are re-evaluated, the next `replan` repairs
+        the search from them.
+
+        Parameters:
+            added (list): coordinates that became occupied
+            removed (list): coordinates that became free
+        """
+        added = set(map(tuple, added)) - self.obstacles
+        removed = set(map(tuple, removed)) & self.obstacles
+        if not added and not removed:
+            return
+        self.env.update((self.obstacles | added) - removed)
+        self.invalidateEdges(added | removed)
+        self.applyChanges(added, removed)
+
+    def applyChanges(self, added: set, removed: set) -> None:
+        """
+        Re-evaluate the vertices around cells whose occupancy has already
+        changed in `env`, e.g. by another planner sharing the grid.
+
+        Parameters:
+            added (set): coordinates that became occupied
+            removed (set): coordinates that became free
+        """
+        for cell in added:
+            # an occupied cell is no one's neighbor, forget its cost so it
+            # starts over if it is freed again
+            node = self.map[cell]
+            node.g = node.rhs = float("inf")
+            if node in self.U:
+                self.U.remove(node)
+
+        affected = set(self.map[cell] for cell in removed)
+        for cell in added | removed:
+            affected.update(self.getNeighbor(self.map[cell]))
+        for node in affected:
+            self.updateVertex(node)
+
+    def replan(self, start: tuple = None) -> tuple:
+        """
+        Repair the path after `updateObstacles`. LPA* searches from the start,
+        so a new start re-initializes the search.
+
+        Parameters:
+            start (tuple): new start point coordinate, None to keep the current one
+
+        Returns:
+            cost (float): path cost
+            path (list): planning path
+            _ (None): None
+        """
+        if start is not None and tuple(start) != self.start.current:
+            self.reset(tuple(start), None)
+
+        self.EXPAND = []
+        self.computeShortestPath()
+        if self.status != PlanStatus.SUCCESS:
+            return [], [], None
         cost, path = self.extractPath()
         return cost, path, None
 
@@ -162,13 +256,24 @@ class LPAStar(GraphSearcher):
     def computeShortestPath(self) -> None:
         """
         Perceived dynamic obstacle information to optimize global path.
+        Sets `status`, stopping early when the search budget is spent.
         """
+        self.budget.start()
+        self.status = PlanStatus.SUCCESS
         while True:
-            node = min(self.U, key=lambda node: node.key)
-            if node.key >= self.calculateKey(self.goal) and \
+            if not self.U:
+                self.status = PlanStatus.NO_PATH
+                break
+            node = self.U.top()
+            if self.keyExceeds(node.key, self.calculateKey(self.goal)) and \
                     self.goal.rhs == self.goal.g:
                 break
 
+            status = self.budget.exhausted()
+            if status is not None:
+                self.status = status
+                break
+
             self.U.remove(node)
             self.EXPAND.append(node)
 
@@ -192,16 +297,36 @@ class LPAStar(GraphSearcher):
         """
         # greed correction
         if node != self.start:
-            node.rhs = min([node_n.g + self.cost(node_n, node)
-                        for node_n in self.getNeighbor(node)])
+            node.rhs = min((self.map[n].g + cost for n, cost, _ in self.neighborEdges(node.current)),
+                           default=float("inf"))
 
-        if node in self.U:
-            self.U.remove(node)
-
-        # Locally unconsistent nodes should be added into OPEN set (set U)
+        # Locally unconsistent nodes should be in OPEN set (set U) with their current key
         if node.g != node.rhs:
             node.key = self.calculateKey(node)
-            heapq.heappush(self.U, node)
+            self.U.push(node, node.key)
+        elif node in self.U:
+            self.U.remove(node)
+
+    def keyExceeds(self, key: list, bound: list) -> bool:
+        """
+        Whether `key` is lexicographically greater than `bound` by more than
+        `KEY_TOLERANCE`. Keys within the tolerance count as ties and are still
+        expanded, since sums of the same costs in a different order can differ
+        in the last bits.
+
+        Parameters:
+            key (list): priority to test
+            bound (list): priority to compare with
+
+        Returns:
+            exceeds (bool): True if key is clearly greater than bound
+        """
+        for k, b in zip(key, bound):
+            if k > b + self.KEY_TOLERANCE:
+                return True
+            if k < b - self.KEY_TOLERANCE:
+                return False
+        return False
 
     def calculateKey(self, node: LNode) -> list:
         """
@@ -226,13 +351,7 @@ class LPAStar(GraphSearcher):
         Returns:
             neighbors (list): neighbors of node
         """
-        neighbors = []
-        for motion in self.motions:
-            neighbor_coord = (node + motion).current
-            # Check if neighbor is within environment bounds
-            if neighbor_coord in self.map and neighbor_coord not in self.obstacles:
-                neighbors.append(self.map[neighbor_coord])
-        return neighbors
+        return [self.map[n] for n, _, _ in self.neighborEdges(node.current)]
 
     def extractPath(self):
         """
@@ -246,13 +365,15 @@ class LPAStar(GraphSearcher):
         path = [node.current]
         cost, count = 0, 0
         while node != self.start:
-            neighbors = [node_n for node_n in self.getNeighbor(node) if not self.isCollision(node, node_n)]
-            next_node = min(neighbors, key=lambda n: n.g)
+            # walking back from the goal, the step of travel is from the neighbor to the cell
+            n, step, _ = min(self.neighborEdges(node.current), key=lambda e: self.map[e[0]].g + e[1])
+            next_node = self.map[n]
             path.append(next_node.current)
-            cost += self.cost(node, next_node)
+            cost += step
             node = next_node
             count += 1
             if count == 1000:
-                return cost, []
+                self.status = PlanStatus.NO_PATH
+                return [], []
         return cost, list(reversed(path))
 
@@ -0,0 +1,189 @@
+"""
+@file: path_cache.py
+@breif: LRU cache of planning results for graph search planners
+@update: 2026.10.18
+"""
+import sys
+from collections import OrderedDict
+
+import numpy as np
+
+from .graph_search import GraphSearcher, SearchStats
+from python_motion_planning.utils import PlanStatus
+
+
+class PathCache(object):
+    """
+    Class wrapping a graph search planner with an LRU cache of its results.
+
+    Results are stored as `(cost, path)` under `(planner type, start, goal,
+    heuristic, grid version)`. When the grid changes, the cache is carried over
+    to the new version instead of being dropped: if obstacles were only added,
+    exactly the entries whose path passes through a changed cell are evicted,
+    since every other path is still collision free and, for planners optimal on
+    the grid graph, no cheaper path can have appeared. If any cell was freed, or
+    the change is not known any more, the whole cache is cleared.
+
+    Parameters:
+        planner (GraphSearcher): planner answering cache misses
+        max_entries (int): maximum number of cached results
+        max_bytes (int): maximum estimated memory of the cached paths
+
+    Examples:
+        >>> import python_motion_planning as pmp
+        >>> planner = pmp.PathCache(pmp.AStar(env=pmp.Grid(51, 31, 11)), max_entries=256)
+        >>> cost, path, expand = planner.plan((5, 5, 5), (45, 25, 5))    # planned
+        >>> cost, path, expand = planner.plan((5, 5, 5), (45, 25, 5))    # cached, expand is empty
+        >>> planner.hits, planner.misses
+        (1, 1)
+    """
+    def __init__(self, planner: GraphSearcher, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.planner = planner
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # key -> (cost, path, cells, bytes), most recently used last
+        self.entries = OrderedDict()
+        # cell -> keys of the cached paths through it
+        self.cell_index = dict()
+        self.bytes = 0
+        self.hits, self.misses = 0, 0
+        # grid version the cached entries are valid for
+        self.version = self.env.version
+        self.env.occupancy
+
+    def __str__(self) -> str:
+        return "Cached {}".format(str(self.planner))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __getattr__(self, name):
+        # everything else, e.g. `plot` or `env`, is the wrapped planner's
+        if name == "planner":
+            raise AttributeError(name)
+        return getattr(self.planner, name)
+
+    def key(self, start: tuple, goal: tuple) -> tuple:
+        return (type(self.planner).__name__, tuple(start), tuple(goal),
+                self.planner.heuristic_type, self.version)
+
+    def plan(self, start: tuple = None, goal: tuple = None) -> tuple:
+        """
+        Return the cached result of the query, or plan and cache it.
+
+        Parameters:
+            start (tuple): new start point coordinate, None to keep the current one
+            goal (tuple): new goal point coordinate, None to keep the current one
+
+        Returns:
+            cost (float): path cost
+            path (list): planning path
+            expand (list): nodes searched by the planner (or `SearchStats`), empty on a cache hit
+        """
+        if start is not None or goal is not None:
+            self.planner.reset(start, goal)
+        self.sync()
+
+        key = self.key(self.planner.start.current, self.planner.goal.current)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            self.planner.status = PlanStatus.SUCCESS if len(entry[1]) else PlanStatus.NO_PATH
+            path = np.array(entry[1], dtype=np.int64) if self.planner.path_array else list(entry[1])
+            return entry[0], path, SearchStats() if self.planner.stats_only else []
+
+        self.misses += 1
+        cost, path, expand = self.planner.plan()
+        # results cut short by the search budget are not answers to the query
+        if self.planner.status in (PlanStatus.SUCCESS, PlanStatus.NO_PATH):
+            self.insert(key, cost, path)
+        return cost, path, expand
+
+    def run(self):
+        """
+        Running both planning and animation.
+        """
+        cost, path, expand = self.plan()
+        self.plot.animation(path, str(self), cost, expand)
+
+    def insert(self, key: tuple, cost: float, path: list) -> None:
+        """
+        Cache a result and evict least recently used entries beyond the bounds.
+        """
+        path = list(map(tuple, np.asarray(path, dtype=np.int64).reshape(-1, 3).tolist()))
+        cells = self.pathCells(path)
+        size = sys.getsizeof(path) + sum(sys.getsizeof(p) for p in path) + sys.getsizeof(cells)
+        if size > self.max_bytes:
+            return
+
+        self.entries[key] = (cost, path, cells, size)
+        self.bytes += size
+        for cell in cells:
+            self.cell_index.setdefault(cell, set()).add(key)
+
+        while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+            self.remove(next(iter(self.entries)))
+
+    def remove(self, key: tuple) -> None:
+        _, _, cells, size = self.entries.pop(key)
+        self.bytes -= size
+        for cell in cells:
+            keys = self.cell_index[cell]
+            keys.discard(key)
+            if not keys:
+                del self.cell_index[cell]
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.cell_index.clear()
+        self.bytes = 0
+
+    def sync(self) -> None:
+        """
+        Carry the cache over to the current grid version.
+        """
+        if self.version == self.env.version:
+            return
+
+        changed = self.env.changedCells(self.version)
+        occupancy = self.env.occupancy
+        if changed is None or not occupancy[tuple(changed.T)].all():
+            # unknown change or freed cells: any cached path may be suboptimal
+            self.clear()
+        else:
+            stale = set()
+            for cell in map(tuple, changed.tolist()):
+                stale |= self.cell_index.get(cell, set())
+            for key in stale:
+                self.remove(key)
+
+        version = self.env.version
+        entries = OrderedDict((key[:-1] + (version,), entry) for key, entry in self.entries.items())
+        self.entries = entries
+        self.cell_index = {cell: {key[:-1] + (version,) for key in keys} for cell, keys in self.cell_index.items()}
+        self.version = version
+
+    @staticmethod
+    def pathCells(path: list) -> frozenset:
+        """
+        Grid cells that a collision check of the path may look at.
+
+        Segments longer than one cell (any-angle and jump point paths) are
+        sampled at every step of their driving axis. The minor axes are rounded
+        both ways at exact halves, which covers the sampling of
+        `GraphSearcher.isCollision` as well as the Bresenham lines of `ThetaStar`.
+        """
+        if not path:
+            return frozenset()
+        points = np.asarray(path, dtype=np.int64)
+        cells = [points]
+        for p, q in zip(points[:-1], points[1:]):
+            steps = int(np.abs(q - p).max())
+            if steps > 1:
+                pos = p + (q - p) * np.arange(1, steps)[:, None] / steps
+                low, high = np.ceil(pos - 0.5).astype(np.int64), np.floor(pos + 0.5).astype(np.int64)
+                for choice in range(1 << points.shape[1]):
+                    mask = (choice >> np.arange(points.shape[1])) & 1 == 1
+                    cells.append(np.where(mask, high, low))
+        return frozenset(map(tuple, np.vstack(cells).tolist()))
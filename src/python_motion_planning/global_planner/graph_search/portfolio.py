@@ -0,0 +1,215 @@
+"""
+@file: portfolio.py
+@breif: Portfolio planner racing several graph search planners in parallel
+@update: 2026.10.18
+"""
+import time
+import queue
+import weakref
+import multiprocessing as mp
+
+import numpy as np
+
+from .graph_search import GraphSearcher
+from python_motion_planning.utils import Grid, PlanStatus, CancelToken, SEARCH_PLANNERS
+
+# shared grid and cancellation flag of a pool worker, set by `_initWorker`
+_worker_state = None
+
+
+def _initWorker(buffer, shape, event) -> None:
+    global _worker_state
+    _worker_state = {"buffer": buffer, "shape": shape, "token": CancelToken(event),
+                     "version": None, "env": None, "planners": dict()}
+
+
+def _closePool(pool) -> None:
+    pool.terminate()
+    pool.join()
+
+
+def _planTask(args) -> tuple:
+    name, config, budget, start, goal, version = args
+    state = _worker_state
+    if state["version"] != version:
+        # the parent copied a new map into shared memory, rebuild the local grid
+        occupancy = np.frombuffer(state["buffer"], dtype=bool).reshape(state["shape"])
+        env = Grid(*state["shape"])
+        env.update(set(map(tuple, np.argwhere(occupancy).tolist())))
+        state["env"], state["version"], state["planners"] = env, version, dict()
+
+    planner = state["planners"].get(name)
+    if planner is None:
+        planner = SEARCH_PLANNERS.get(name)(env=state["env"], **config)
+        state["planners"][name] = planner
+    planner.setBudget(*budget, cancel_token=state["token"])
+
+    t = time.perf_counter()
+    cost, path, _ = planner.plan(start, goal)
+    return name, cost, list(map(tuple, path)), planner.status, time.perf_counter() - t
+
+
+@SEARCH_PLANNERS.register("portfolio")
+class PortfolioPlanner(GraphSearcher):
+    """
+    Class racing several graph search planners on the same query.
+
+    Every planner runs in its own worker process of a persistent pool. The grid
+    occupancy is kept in shared memory and copied only when `env.version`
+    changes; workers rebuild their grid and planners from it once per version.
+    The first path whose cost is within `bound` times the straight-line
+    distance is returned and the other searches are cancelled through their
+    search budgets. If no path meets the bound, the cheapest one is returned.
+
+    Parameters:
+        start (tuple): start point coordinate
+        goal (tuple): goal point coordinate
+        env (Grid): environment
+        heuristic_type (str): heuristic function type
+        planners (list): registry names of the planners to race
+        configs (dict): extra constructor arguments of each planner by name
+        bound (float): accepted ratio of path cost to straight-line distance,
+            inf to accept the first path found
+
+    Attributes:
+        winner (str): name of the planner whose result was returned
+        timings (dict): planning time of every planner that finished, in seconds
+
+    Examples:
+        >>> import python_motion_planning as pmp
+        >>> with pmp.PortfolioPlanner(env=pmp.Grid(51, 31, 11), planners=["a_star", "jps"]) as planner:
+        ...     cost, path, expand = planner.plan((5, 5, 5), (45, 25, 5))
+        ...     planner.winner
+        'jps'
+    """
+    # seconds between checks of the cancel token while waiting for workers
+    POLL_INTERVAL = 0.005
+
+    def __init__(self, start: tuple = None, goal: tuple = None, env: Grid = None, heuristic_type: str = "euclidean",
+                 planners: list = ("a_star", "jps", "gbfs", "theta_star"), configs: dict = None,
+                 bound: float = float("inf")) -> None:
+        super().__init__(start, goal, env, heuristic_type)
+        self.planners = list(planners)
+        self.configs = configs or dict()
+        self.bound = bound
+        self.winner = None
+        self.timings = dict()
+        self._pool = None
+        self._finalizer = None
+        self._buffer = None
+        self._cancel = None
+        self._version = None
+
+    def __str__(self) -> str:
+        return "Portfolio({})".format(", ".join(self.planners))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Shut down the worker processes. Also done when the planner is garbage
+        collected or at interpreter exit if it was never closed.
+        """
+        if self._pool is not None:
+            self._finalizer()
+            self._pool = None
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            shape = self.env.occupancy.shape
+            self._buffer = mp.RawArray("b", int(np.prod(shape)))
+            self._cancel = mp.Event()
+            self._version = None
+            self._pool = mp.Pool(len(self.planners), initializer=_initWorker,
+                                 initargs=(self._buffer, shape, self._cancel))
+            # the finalizer must not reference self, or the planner would never be collected
+            self._finalizer = weakref.finalize(self, _closePool, self._pool)
+        return self._pool
+
+    def syncGrid(self) -> None:
+        """
+        Copy the occupancy of the current map version into shared memory.
+        """
+        if self._version != self.env.version:
+            shared = np.frombuffer(self._buffer, dtype=bool).reshape(self.env.occupancy.shape)
+            np.copyto(shared, self.env.occupancy)
+            self._version = self.env.version
+
+    def plan(self, start: tuple = None, goal: tuple = None) -> tuple:
+        """
+        Portfolio motion plan function.
+
+        Parameters:
+            start (tuple): new start point coordinate, None to keep the current one
+            goal (tuple): new goal point coordinate, None to keep the current one
+
+        Returns:
+            cost (float): path cost
+            path (list): planning path
+            expand (list): empty, the expanded nodes stay in the worker processes
+        """
+        if start is not None or goal is not None:
+            self.reset(start, goal)
+
+        self.winner, self.timings = None, dict()
+        if self.disconnected():
+            return self.searchResult([], [], [], dict())
+
+        pool = self.pool
+        self.syncGrid()
+        budget = (self.budget.max_expansions, self.budget.max_time)
+        done = queue.Queue()
+        for name in self.planners:
+            task = (name, self.configs.get(name, dict()), budget,
+                    self.start.current, self.goal.current, self._version)
+            pool.apply_async(_planTask, (task,), callback=done.put, error_callback=done.put)
+
+        lower_bound = self.h(self.start, self.goal)
+        best, partial, error = None, None, None
+        pending = len(self.planners)
+        while pending:
+            try:
+                result = done.get(timeout=self.POLL_INTERVAL)
+            except queue.Empty:
+                if self.budget.cancel_token is not None and self.budget.cancel_token.cancelled:
+                    self._cancel.set()
+                continue
+            pending -= 1
+
+            if isinstance(result, BaseException):
+                error = error or result
+                continue
+            name, cost, path, status, elapsed = result
+            self.timings[name] = elapsed
+            if status != PlanStatus.SUCCESS:
+                # stopped by the budget or without a path, kept as a fallback
+                if partial is None or (path and not partial[2]):
+                    partial = result
+                continue
+            if best is None or cost < best[1]:
+                best = result
+            if cost <= self.bound * lower_bound:
+                # good enough: cancel the remaining searches and wait for them to stop
+                self._cancel.set()
+
+        self._cancel.clear()
+        if best is None and error is not None:
+            raise error
+
+        result = best or partial
+        if result is None:
+            return self.searchResult([], [], [], dict())
+        self.winner, cost, path, status, _ = result
+        return self.searchResult(cost, path, [], dict(), status)
+
+    def run(self):
+        """
+        Running both planning and animation.
+        """
+        cost, path, expand = self.plan()
+        self.plot.animation(path, str(self), cost, expand)
@@ -8,9 +8,11 @@ import heapq
 from math import acos
 
 from .theta_star import ThetaStar
-from python_motion_planning.utils import Env, Node, Grid
+from .graph_search import SearchStats
+from python_motion_planning.utils import Env, Node, Grid, SEARCH_PLANNERS
 
 
+@SEARCH_PLANNERS.register("s_theta_star")
 class SThetaStar(ThetaStar):
     """
     Class for S-Theta* motion planning.
@@ -20,6 +22,7 @@ class SThetaStar(ThetaStar):
         goal (tuple): goal point coordinate
         env (Grid): environment
         heuristic_type (str): heuristic function type
+        stats_only (bool): return `SearchStats` instead of the expanded nodes
 
     Examples:
         >>> import python_motion_planning as pmp
@@ -32,27 +35,41 @@ class SThetaStar(ThetaStar):
         [1] S-Theta*: low steering path-planning algorithm
     """
 
-    def __init__(self, start: tuple, goal: tuple, env: Grid, heuristic_type: str = "euclidean") -> None:
-        super().__init__(start, goal, env, heuristic_type)
+    def __init__(self, start: tuple = None, goal: tuple = None, env: Grid = None, heuristic_type: str = "euclidean",
+                 stats_only: bool = False) -> None:
+        super().__init__(start, goal, env, heuristic_type, stats_only=stats_only)
 
     def __str__(self) -> str:
         return "S-Theta*"
 
-    def plan(self) -> tuple:
+    def plan(self, start: tuple = None, goal: tuple = None) -> tuple:
         """
         S-Theta* motion plan function.
 
+        Parameters:
+            start (tuple): new start point coordinate, None to keep the current one
+            goal (tuple): new goal point coordinate, None to keep the current one
+
         Returns:
             cost (float): path cost
             path (list): planning path
             expand (list): all nodes that planner has searched
         """
+        if start is not None or goal is not None:
+            self.reset(start, goal)
+
         # OPEN list (priority queue) and CLOSED list (hash table)
         OPEN = []
         heapq.heappush(OPEN, self.start)
         CLOSED = dict()
+        self.stats = SearchStats()
+        self.budget.start()
+        # start and goal in different free-space components: no path, nothing to search
+        if self.disconnected():
+            return self.searchResult([], [], OPEN, CLOSED)
 
         while OPEN:
+            self.stats.pop(len(OPEN))
             node = heapq.heappop(OPEN)
 
             # exists in CLOSED list
@@ -63,25 +80,28 @@ class SThetaStar(ThetaStar):
             if node == self.goal:
                 CLOSED[node.current] = node
                 cost, path = self.extractPath(CLOSED)
-                return cost, path, list(CLOSED.values())
+                return self.searchResult(cost, path, OPEN, CLOSED)
 
-            for node_n in self.getNeighbor(node):
-                # exists in CLOSED list
-                if node_n.current in CLOSED:
-                    continue
+            # stop with the best partial result once the budget is spent
+            status = self.budget.exhausted()
+            if status is not None:
+                return self.partialResult(status, OPEN, CLOSED)
 
+            # neighbors not in CLOSED list, checked against the parent in one batch
+            neighbors = [node_n for node_n in self.getNeighbor(node) if node_n.current not in CLOSED]
+            node_p = CLOSED.get(node.parent)
+            visible = self.lineOfSightBatch(neighbors, node_p) if node_p else [None] * len(neighbors)
+
+            for node_n, los in zip(neighbors, visible):
                 # path1
                 node_n.parent = node.current
                 node_n.h = self.h(node_n, self.goal)
 
                 alpha = 0.0
-                node_p = CLOSED.get(node.parent)
                 if node_p:
                     alpha = self.getAlpha(node_p, node_n)
                     node_n.g += alpha
-
-                if node_p:
-                    self.updateVertex(node_p, node_n, alpha)
+                    self.updateVertex(node_p, node_n, alpha, los)
 
                 # goal found
                 if node_n == self.goal:
@@ -92,9 +112,9 @@ class SThetaStar(ThetaStar):
                 heapq.heappush(OPEN, node_n)
 
             CLOSED[node.current] = node
-        return [], [], []
+        return self.searchResult([], [], OPEN, CLOSED)
 
-    def updateVertex(self, node_p: Node, node_c: Node, alpha: float) -> None:
+    def updateVertex(self, node_p: Node, node_c: Node, alpha: float, visible: bool = None) -> None:
         """
         Update extend node information with current node's parent node.
 
@@ -102,9 +122,12 @@ class SThetaStar(ThetaStar):
             node_p (Node): parent node
             node_c (Node): current node
             alpha (float): alpha angle
+            visible (bool): line of sight from node_c to node_p if already known
         """
         # if alpha == 0 or self.lineOfSight(node_c, node_p):    # "alpha == 0" will cause the path to penetrate obstacles
-        if self.lineOfSight(node_c, node_p):
+        if visible is None:
+            visible = self.lineOfSight(node_c, node_p)
+        if visible:
             # path 2
             new_g = node_p.g + self.dist(node_c, node_p) + alpha
             if new_g <= node_c.g:
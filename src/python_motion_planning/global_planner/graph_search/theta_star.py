@@ -7,9 +7,11 @@
 import heapq
 
 from .a_star import AStar
-from python_motion_planning.utils import Env, Node, Grid
+from .graph_search import SearchStats
+from python_motion_planning.utils import Env, Node, Grid, SEARCH_PLANNERS
 
 
+@SEARCH_PLANNERS.register("theta_star")
 class ThetaStar(AStar):
     """
     Class for Theta* motion planning.
@@ -23,6 +25,8 @@ class ThetaStar(AStar):
             environment
         heuristic_type (str):
             heuristic function type
+        stats_only (bool):
+            return `SearchStats` instead of the expanded nodes
 
     Examples:
         >>> import python_motion_planning as pmp
@@ -35,27 +39,41 @@ class ThetaStar(AStar):
         [1] Theta*: Any-Angle Path Planning on Grids
         [2] Any-angle path planning on non-uniform costmaps
     """
-    def __init__(self, start: tuple, goal: tuple, env: Grid, heuristic_type: str = "euclidean") -> None:
-        super().__init__(start, goal, env, heuristic_type)
+    def __init__(self, start: tuple = None, goal: tuple = None, env: Grid = None, heuristic_type: str = "euclidean",
+                 stats_only: bool = False) -> None:
+        super().__init__(start, goal, env, heuristic_type, stats_only=stats_only)
 
     def __str__(self) -> str:
         return "Theta*"
 
-    def plan(self) -> tuple:
+    def plan(self, start: tuple = None, goal: tuple = None) -> tuple:
         """
         Theta* motion plan function.
 
+        Parameters:
+            start (tuple): new start point coordinate, None to keep the current one
+            goal (tuple): new goal point coordinate, None to keep the current one
+
         Returns:
             cost (float): path cost
             path (list): planning path
             expand (list): all nodes that planner has searched
         """
+        if start is not None or goal is not None:
+            self.reset(start, goal)
+
         # OPEN list (priority queue) and CLOSED list (hash table)
         OPEN = []
         heapq.heappush(OPEN, self.start)
         CLOSED = dict()
+        self.stats = SearchStats()
+        self.budget.start()
+        # start and goal in different free-space components: no path, nothing to search
+        if self.disconnected():
+            return self.searchResult([], [], OPEN, CLOSED)
 
         while OPEN:
+            self.stats.pop(len(OPEN))
             node = heapq.heappop(OPEN)
 
             # exists in CLOSED list
@@ -66,21 +84,25 @@ class ThetaStar(AStar):
             if node == self.goal:
                 CLOSED[node.current] = node
                 cost, path = self.extractPath(CLOSED)
-                return cost, path, list(CLOSED.values())
+                return self.searchResult(cost, path, OPEN, CLOSED)
 
-            for node_n in self.getNeighbor(node):                
-                # exists in CLOSED list
-                if node_n.current in CLOSED:
-                    continue
-                
+            # stop with the best partial result once the budget is spent
+            status = self.budget.exhausted()
+            if status is not None:
+                return self.partialResult(status, OPEN, CLOSED)
+
+            # neighbors not in CLOSED list, checked against the parent in one batch
+            neighbors = [node_n for node_n in self.getNeighbor(node) if node_n.current not in CLOSED]
+            node_p = CLOSED.get(node.parent)
+            visible = self.lineOfSightBatch(neighbors, node_p) if node_p else [None] * len(neighbors)
+
+            for node_n, los in zip(neighbors, visible):
                 # path1
                 node_n.parent = node.current
                 node_n.h = self.h(node_n, self.goal)
 
-                node_p = CLOSED.get(node.parent)
-
                 if node_p:
-                    self.updateVertex(node_p, node_n)
+                    self.updateVertex(node_p, node_n, los)
 
                 # goal found
                 if node_n == self.goal:
@@ -91,17 +113,36 @@ class ThetaStar(AStar):
                 heapq.heappush(OPEN, node_n)
 
             CLOSED[node.current] = node
-        return [], [], []
+        return self.searchResult([], [], OPEN, CLOSED)
+
+    def extractPath(self, closed_list: dict, end: tuple = None) -> tuple:
+        """
+        Extract the path based on the CLOSED list.
 
-    def updateVertex(self, node_p: Node, node_c: Node) -> None:
+        Parameters:
+            closed_list (dict): CLOSED list
+            end (tuple): last point of the path, the goal if None
+
+        Returns:
+            cost (float): the cost of planned path
+            path (list): the planning path
+        """
+        # g of Theta* nodes is the length without the altitude penalty, so the edges are costed again
+        _, path = super().extractPath(closed_list, end)
+        return self.pathCost(path), path
+
+    def updateVertex(self, node_p: Node, node_c: Node, visible: bool = None) -> None:
         """
         Update extend node information with current node's parent node.
 
         Parameters:
             node_p (Node): parent node
             node_c (Node): current node
+            visible (bool): line of sight from node_c to node_p if already known
         """
-        if self.lineOfSight(node_c, node_p):
+        if visible is None:
+            visible = self.lineOfSight(node_c, node_p)
+        if visible:
             # path 2
             if node_p.g + self.dist(node_c, node_p) <= node_c.g:
                 node_c.g = node_p.g + self.dist(node_c, node_p)
@@ -118,93 +159,21 @@ class ThetaStar(AStar):
         Returns:
             line_of_sight (bool): True if line of sight exists ( no collision ) else False
         """
-        if node1.current in self.obstacles or node2.current in self.obstacles:
-            return False
-
-        x1, y1, z1 = node1.current
-        x2, y2, z2 = node2.current
-
-        # Boundary checks
-        if x1 < 0 or x1 >= self.env.x_range or y1 < 0 or y1 >= self.env.y_range or z1 < 0 or z1 >= self.env.z_range:
-            return False
-        if x2 < 0 or x2 >= self.env.x_range or y2 < 0 or y2 >= self.env.y_range or z2 < 0 or z2 >= self.env.z_range:
-            return False
-
-        # 3D Bresenham line algorithm - improved version
-        dx = abs(x2 - x1)
-        dy = abs(y2 - y1) 
-        dz = abs(z2 - z1)
-        
-        x_inc = 1 if x2 > x1 else -1
-        y_inc = 1 if y2 > y1 else -1
-        z_inc = 1 if z2 > z1 else -1
-        
-        # Find the driving axis (the one with maximum change)
-        if dx >= dy and dx >= dz:
-            # X is driving axis
-            err_1 = 2 * dy - dx
-            err_2 = 2 * dz - dx
-            x, y, z = x1, y1, z1
-            
-            while x != x2:
-                if (int(x), int(y), int(z)) in self.obstacles:
-                    return False
-                    
-                if err_1 > 0:
-                    y += y_inc
-                    err_1 -= 2 * dx
-                if err_2 > 0:
-                    z += z_inc
-                    err_2 -= 2 * dx
-                    
-                err_1 += 2 * dy
-                err_2 += 2 * dz
-                x += x_inc
-                
-        elif dy >= dx and dy >= dz:
-            # Y is driving axis
-            err_1 = 2 * dx - dy
-            err_2 = 2 * dz - dy
-            x, y, z = x1, y1, z1
-            
-            while y != y2:
-                if (int(x), int(y), int(z)) in self.obstacles:
-                    return False
-                    
-                if err_1 > 0:
-                    x += x_inc
-                    err_1 -= 2 * dy
-                if err_2 > 0:
-                    z += z_inc
-                    err_2 -= 2 * dy
-                    
-                err_1 += 2 * dx
-                err_2 += 2 * dz
-                y += y_inc
-                
-        else:
-            # Z is driving axis
-            err_1 = 2 * dx - dz
-            err_2 = 2 * dy - dz
-            x, y, z = x1, y1, z1
-            
-            while z != z2:
-                if (int(x), int(y), int(z)) in self.obstacles:
-                    return False
-                    
-                if err_1 > 0:
-                    x += x_inc
-                    err_1 -= 2 * dz
-                if err_2 > 0:
-                    y += y_inc
-                    err_2 -= 2 * dz
-                    
-                err_1 += 2 * dx
-                err_2 += 2 * dy
-                z += z_inc
-        
-        # Check the final point
-        if (int(x2), int(y2), int(z2)) in self.obstacles:
-            return False
-            
-        return True
+        self.stats.collision_checks += 1
+        return self.env.lineOfSight(node1.current, node2.current)
+
+    def lineOfSightBatch(self, nodes: list, node_p: Node) -> list:
+        """
+        Line of sight from every node in `nodes` to `node_p` in one pass.
+
+        Parameters:
+            nodes (list): start nodes
+            node_p (Node): common end node, usually the parent of the expanded node
+
+        Returns:
+            line_of_sight (list): True for each node with line of sight to node_p
+        """
+        if not nodes:
+            return []
+        self.stats.collision_checks += len(nodes)
+        return self.env.lineOfSightBatch([node.current for node in nodes], node_p.current)
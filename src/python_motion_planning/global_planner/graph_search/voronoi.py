@@ -4,17 +4,255 @@
 @author: Yang Haodong, Wu Maojia
 @update: 2024.6.23
 """
-import heapq, math
+import os
+import heapq
+import hashlib
+
 import numpy as np
-from scipy.spatial import cKDTree, Voronoi
+from scipy.spatial import cKDTree
+from scipy.sparse import csr_matrix
+from scipy.ndimage import distance_transform_edt
 
 from .graph_search import GraphSearcher
-from python_motion_planning.utils import Env, Node, Grid
+from python_motion_planning.utils import Env, Node, Grid, SEARCH_PLANNERS
+
+
+class MedialRoadmap(object):
+    """
+    Class for a roadmap on the medial axis (generalized Voronoi diagram) of
+    the free space of a grid.
+
+    A free cell lies on the medial axis if a neighbor along some axis has its
+    nearest obstacle cell at least `MIN_SEPARATION` away from its own, both
+    taken from the Euclidean distance transform. The medial cells are thinned
+    to the one with the largest clearance per block of `sample_step` cells,
+    and each node is joined to at most `n_knn` nearest nodes within
+    `max_edge_len` whose segment keeps more than `inflation_r` clearance.
+
+    Parameters:
+        env (Grid): environment
+        n_knn (int): maximum number of edges from one node
+        max_edge_len (float): maximum edge length
+        inflation_r (float): minimum clearance along edges
+        sample_step (int): block size of the thinning in cells
+
+    Attributes:
+        nodes (np.ndarray): (N, dim) integer node cells
+        graph (csr_matrix): symmetric (N, N) edge lengths
+        distance (np.ndarray): Euclidean distance from every cell to the nearest obstacle
+
+    Examples:
+        >>> import python_motion_planning as pmp
+        >>> roadmap = pmp.MedialRoadmap(pmp.Grid(51, 31, 11))
+        >>> roadmap.save("city.roadmap.npz")
+        >>> roadmap = pmp.MedialRoadmap.load("city.roadmap.npz", env)
+    """
+    # minimum distance between the nearest obstacles of two neighbor cells of the axis
+    MIN_SEPARATION = 3.0
+    # distance between the clearance samples of a segment, in cells
+    SEGMENT_STEP = 0.5
+    # number of segments checked at once, bounds the memory of `segmentsFree`
+    SEGMENT_CHUNK = 4096
+
+    def __init__(self, env: Grid, n_knn: int = 10, max_edge_len: float = 10.0, inflation_r: float = 1.0,
+                 sample_step: int = 3) -> None:
+        self.env = env
+        self.params = (int(n_knn), float(max_edge_len), float(inflation_r), int(sample_step))
+        self.digest = self.occupancyDigest(env)
+        self.distance = self.distanceField(env)
+        self._adjacency = None
+        self._tree = None
+        self.nodes = self.medialNodes()
+        self.graph = self.connect()
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    @staticmethod
+    def occupancyDigest(env: Grid) -> str:
+        return hashlib.sha1(env.occupancy.tobytes()).hexdigest()
+
+    @staticmethod
+    def distanceField(env: Grid) -> np.ndarray:
+        occupancy = env.occupancy
+        if not occupancy.any():
+            return np.full(occupancy.shape, np.inf)
+        return distance_transform_edt(~occupancy)
+
+    def medialNodes(self) -> np.ndarray:
+        """
+        Thinned cells of the medial axis with more than `inflation_r` clearance.
+
+        Returns:
+            nodes (np.ndarray): (N, dim) integer cells
+        """
+        occupancy = self.env.occupancy
+        dim = occupancy.ndim
+        if not occupancy.any():
+            return np.zeros((0, dim), dtype=np.int64)
+
+        _, _, inflation_r, sample_step = self.params
+        distance = self.distance
+        feature = distance_transform_edt(~occupancy, return_distances=False, return_indices=True)
+        medial = np.zeros(occupancy.shape, dtype=bool)
+        for axis in range(dim):
+            lo, hi = [slice(None)] * dim, [slice(None)] * dim
+            lo[axis], hi[axis] = slice(0, -1), slice(1, None)
+            lo, hi = tuple(lo), tuple(hi)
+            gap = ((feature[(slice(None),) + lo] - feature[(slice(None),) + hi]) ** 2).sum(axis=0)
+            split = gap >= self.MIN_SEPARATION ** 2
+            # keep the side of the split that is farther from the obstacles
+            medial[lo] |= split & (distance[lo] >= distance[hi])
+            medial[hi] |= split & (distance[hi] >= distance[lo])
+        medial &= distance > inflation_r
+
+        cells = np.argwhere(medial)
+        if not len(cells):
+            return cells
+        blocks = cells // sample_step
+        block = np.ravel_multi_index(blocks.T, tuple(blocks.max(axis=0) + 1))
+        order = np.lexsort((-distance[medial], block))
+        first = np.r_[True, block[order][1:] != block[order][:-1]]
+        return cells[order][first]
+
+    def segmentsFree(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """
+        Whether segments keep more than `inflation_r` clearance, sampled every
+        `SEGMENT_STEP` cells including both ends.
+
+        Parameters:
+            a (np.ndarray): (M, dim) segment starts
+            b (np.ndarray): (M, dim) segment ends
+
+        Returns:
+            free (np.ndarray): (M,) boolean mask
+        """
+        a, b = np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+        free = np.zeros(len(a), dtype=bool)
+        if not len(a):
+            return free
+        inflation_r = self.params[2]
+        upper = np.array(self.distance.shape) - 1
+        for i in range(0, len(a), self.SEGMENT_CHUNK):
+            start, delta = a[i:i + self.SEGMENT_CHUNK], b[i:i + self.SEGMENT_CHUNK] - a[i:i + self.SEGMENT_CHUNK]
+            length = np.sqrt((delta * delta).sum(axis=1)).max()
+            t = np.linspace(0.0, 1.0, int(np.ceil(length / self.SEGMENT_STEP)) + 1)
+            samples = np.rint(start[:, None, :] + t[None, :, None] * delta[:, None, :]).astype(np.int64)
+            samples = np.clip(samples, 0, upper)
+            clearance = self.distance[tuple(np.moveaxis(samples, -1, 0))]
+            free[i:i + self.SEGMENT_CHUNK] = np.all(clearance > inflation_r, axis=1)
+        return free
+
+    def connect(self) -> csr_matrix:
+        """
+        Join every node to its nearest free neighbors with bounded-k KD-tree queries.
+
+        Returns:
+            graph (csr_matrix): symmetric (N, N) edge lengths
+        """
+        n_knn, max_edge_len, _, _ = self.params
+        n = len(self.nodes)
+        if n < 2:
+            return csr_matrix((n, n))
+
+        _, index = self.tree.query(self.nodes, k=min(n_knn + 1, n), distance_upper_bound=max_edge_len)
+        i = np.repeat(np.arange(n), index.shape[1])
+        j = index.ravel()
+        valid = (j < n) & (j != i)
+        pairs = np.unique(np.sort(np.stack((i[valid], j[valid]), axis=1), axis=1), axis=0)
+        pairs = pairs[self.segmentsFree(self.nodes[pairs[:, 0]], self.nodes[pairs[:, 1]])]
+
+        i, j = pairs.T
+        length = np.sqrt(((self.nodes[i] - self.nodes[j]) ** 2).sum(axis=1))
+        return csr_matrix((np.r_[length, length], (np.r_[i, j], np.r_[j, i])), shape=(n, n))
+
+    def links(self, cell: tuple) -> list:
+        """
+        Roadmap nodes that a cell can be joined to. The links only have to be
+        free of obstacles, see `Grid.lineOfSightBatch`, not keep the clearance
+        of roadmap edges, so start and goal may lie close to obstacles.
+
+        Parameters:
+            cell (tuple): cell coordinate
+
+        Returns:
+            links (list): (node index, edge length) of at most `n_knn` nodes
+        """
+        n_knn, max_edge_len, _, _ = self.params
+        if not len(self.nodes):
+            return []
+        length, index = self.tree.query(cell, k=min(n_knn, len(self.nodes)), distance_upper_bound=max_edge_len)
+        length, index = np.atleast_1d(length), np.atleast_1d(index)
+        valid = index < len(self.nodes)
+        length, index = length[valid], index[valid]
+        free = np.array(self.env.lineOfSightBatch(list(map(tuple, self.nodes[index].tolist())), cell), dtype=bool)
+        return list(zip(index[free].tolist(), length[free].tolist()))
+
+    @property
+    def tree(self) -> cKDTree:
+        """
+        KD-tree of the nodes, built on first use.
+        """
+        if self._tree is None:
+            self._tree = cKDTree(self.nodes)
+        return self._tree
+
+    @property
+    def adjacency(self) -> list:
+        """
+        (neighbor, length) lists of every node, built from `graph` on first use.
+        """
+        if self._adjacency is None:
+            indptr, indices, data = self.graph.indptr, self.graph.indices.tolist(), self.graph.data.tolist()
+            self._adjacency = [list(zip(indices[indptr[i]:indptr[i + 1]], data[indptr[i]:indptr[i + 1]]))
+                               for i in range(len(self.nodes))]
+        return self._adjacency
+
+    def save(self, file: str) -> None:
+        """
+        Save the roadmap together with its parameters and the digest of its map.
+        """
+        graph = self.graph.tocsr()
+        np.savez_compressed(file, nodes=self.nodes, indptr=graph.indptr, indices=graph.indices,
+                            data=graph.data, params=np.array(self.params, dtype=np.float64),
+                            digest=self.digest)
 
+    @classmethod
+    def load(cls, file: str, env: Grid):
+        """
+        Load a roadmap saved by `save` for the same map.
+
+        Raises:
+            ValueError: if the saved roadmap was built for different obstacles
+        """
+        data = np.load(file)
+        roadmap = cls.__new__(cls)
+        roadmap.env = env
+        roadmap.digest = cls.occupancyDigest(env)
+        if str(data["digest"]) != roadmap.digest:
+            raise ValueError("The roadmap in {} belongs to a different map.".format(file))
+        n_knn, max_edge_len, inflation_r, sample_step = data["params"].tolist()
+        roadmap.params = (int(n_knn), max_edge_len, inflation_r, int(sample_step))
+        roadmap.distance = cls.distanceField(env)
+        roadmap.nodes = data["nodes"]
+        n = len(roadmap.nodes)
+        roadmap.graph = csr_matrix((data["data"], data["indices"], data["indptr"]), shape=(n, n))
+        roadmap._adjacency = None
+        roadmap._tree = None
+        return roadmap
+
+
+@SEARCH_PLANNERS.register("voronoi")
 class VoronoiPlanner(GraphSearcher):
     """
     Class for Voronoi-based motion planning.
 
+    The roadmap on the medial axis of the free space (see `MedialRoadmap`) is
+    built once per grid version and kept in `env.cache`; with `roadmap_file`
+    it is also saved to disk and loaded again as long as the map and the
+    parameters are the same. A query only joins start and goal to the roadmap
+    and searches it.
+
     Parameters:
         start (tuple): start point coordinate
         goal (tuple): goal point coordinate
@@ -23,16 +261,20 @@ class VoronoiPlanner(GraphSearcher):
         n_knn (int): number of edges from one sampled point
         max_edge_len (float): maximum edge length
         inflation_r (float): inflation range
+        sample_step (int): block size of the medial axis thinning in cells
+        roadmap_file (str): `.npz` file the roadmap is loaded from or saved to, None to keep it in memory
 
     Examples:
         >>> import python_motion_planning as pmp
-        >>> planner = pmp.VoronoiPlanner((5, 5), (45, 25), pmp.Grid(51, 31))
-        >>> cost, path, _ = planner.plan()     # planning results only
+        >>> planner = pmp.VoronoiPlanner((5, 5, 5), (45, 25, 5), pmp.Grid(51, 31, 11),
+        ...                              roadmap_file="city.roadmap.npz")
+        >>> cost, path, expand = planner.plan()     # planning results only
         >>> planner.plot.animation(path, str(planner), cost, expand)  # animation
         >>> planner.run()       # run both planning and animation
     """
-    def __init__(self, start: tuple, goal: tuple, env: Grid, heuristic_type: str = "euclidean", \
-                 n_knn: int = 10, max_edge_len: float = 10.0, inflation_r: float = 1.0) -> None:
+    def __init__(self, start: tuple = None, goal: tuple = None, env: Grid = None, heuristic_type: str = "euclidean", \
+                 n_knn: int = 10, max_edge_len: float = 10.0, inflation_r: float = 1.0, sample_step: int = 3,
+                 roadmap_file: str = None) -> None:
         super().__init__(start, goal, env, heuristic_type)
         # number of edges from one sampled point
         self.n_knn = n_knn
@@ -40,48 +282,62 @@ class VoronoiPlanner(GraphSearcher):
         self.max_edge_len = max_edge_len
         # inflation range
         self.inflation_r = inflation_r
+        # medial axis thinning and persistent roadmap
+        self.sample_step = sample_step
+        self.roadmap_file = roadmap_file
 
     def __str__(self) -> str:
         return "Voronoi-based Planner"
 
-    def plan(self):
+    @property
+    def roadmap(self) -> MedialRoadmap:
+        """
+        Roadmap of the current grid version, loaded, built or taken from `env.cache`.
+        """
+        params = (int(self.n_knn), float(self.max_edge_len), float(self.inflation_r), int(self.sample_step))
+        key = ("medial_roadmap",) + params
+        version, roadmap = self.env.cache.get(key, (None, None))
+        if version == self.env.version:
+            return roadmap
+
+        roadmap = None
+        if self.roadmap_file is not None and os.path.exists(self.roadmap_file):
+            try:
+                roadmap = MedialRoadmap.load(self.roadmap_file, self.env)
+            except ValueError:
+                roadmap = None
+            if roadmap is not None and roadmap.params != params:
+                roadmap = None
+        if roadmap is None:
+            roadmap = MedialRoadmap(self.env, *params)
+            if self.roadmap_file is not None:
+                roadmap.save(self.roadmap_file)
+        self.env.cache[key] = (self.env.version, roadmap)
+        return roadmap
+
+    def plan(self, start: tuple = None, goal: tuple = None):
         """
         Voronoi-based motion plan function.
 
+        Parameters:
+            start (tuple): new start point coordinate, None to keep the current one
+            goal (tuple): new goal point coordinate, None to keep the current one
+
         Returns:
             cost (float): path cost
             path (list): planning path
-            expand (list): voronoi sampled nodes
+            expand (list): roadmap nodes, empty if no path was found
         """
-        # sampling voronoi diagram
-        vor = Voronoi(np.array(list(self.env.obstacles)))
-        vx_list = [ix for [ix, _] in vor.vertices] + [self.start.x, self.goal.x]
-        vy_list = [iy for [_, iy] in vor.vertices] + [self.start.y, self.goal.y]
-        sample_num = len(vx_list)
-        expand = [Node((vx_list[i], vy_list[i])) for i in range(sample_num)]
+        if start is not None or goal is not None:
+            self.reset(start, goal)
 
-        # generate road map for voronoi nodes
-        road_map = {}
-        node_tree = cKDTree(np.vstack((vx_list, vy_list)).T)
+        roadmap = self.roadmap
+        CLOSED = {cell: Node(cell) for cell in map(tuple, roadmap.nodes.tolist())}
+        if self.start.current in self.obstacles or self.goal.current in self.obstacles:
+            return self.searchResult([], [], [], CLOSED)
 
-        for node in expand:
-            edges = []
-            _, index_list = node_tree.query([node.x, node.y], k=sample_num)
-
-            for i in range(1, len(index_list)):
-                node_n = expand[index_list[i]]
-
-                if not self.isCollision(node, node_n):
-                    edges.append(node_n)
-
-                if len(edges) >= self.n_knn:
-                    break
-
-            road_map[node] = edges
-
-        # calculate shortest path using graph search algorithm
-        cost, path = self.getShortestPath(road_map)
-        return cost, path, expand
+        cost, path = self.getShortestPath(roadmap)
+        return self.searchResult(cost, path, [], CLOSED)
 
     def run(self):
         """
@@ -89,77 +345,71 @@ class VoronoiPlanner(GraphSearcher):
         """
         cost, path, expand = self.plan()
         self.plot.animation(path, str(self), cost, expand)
-    
-    def getShortestPath(self, road_map: dict, dijkstra: bool = True) -> list:
+
+    def getShortestPath(self, roadmap: MedialRoadmap, dijkstra: bool = True) -> tuple:
         """
-        Calculate shortest path using graph search algorithm(A*, Dijkstra, etc).
+        Calculate shortest path on the roadmap joined with start and goal,
+        using Dijkstra or A*.
 
         Parameters:
-            road_map (dict): road map for voronoi diagram, which store KNN for one voronoi node
+            roadmap (MedialRoadmap): roadmap of the current grid
             dijkstra (bool): using Dijkstra if true, else A*
 
         Returns:
             cost (float): path cost
             path (list): planning path
         """
-        # OPEN list (priority queue) and CLOSED list (hash table)
-        OPEN = []
-        heapq.heappush(OPEN, self.start)
-        CLOSED = dict()
-
+        n = len(roadmap)
+        # start and goal are the extra vertices n and n + 1
+        start, goal = n, n + 1
+        cells = roadmap.nodes.tolist() + [self.start.current, self.goal.current]
+        goal_links = dict(roadmap.links(self.goal.current))
+        start_links = roadmap.links(self.start.current)
+        direct = self.dist(self.start, self.goal)
+        if direct < self.max_edge_len and self.env.lineOfSight(self.start.current, self.goal.current):
+            start_links.append((goal, direct))
+
+        def heuristic(i: int) -> float:
+            return 0.0 if dijkstra else self.h(Node(tuple(cells[i])), self.goal)
+
+        OPEN = [(heuristic(start), 0.0, start)]
+        g, parent = {start: 0.0}, {start: None}
+        CLOSED = set()
         while OPEN:
-            node = heapq.heappop(OPEN)
-
-            # exists in CLOSED list
-            if node.current in CLOSED:
+            _, g_i, i = heapq.heappop(OPEN)
+            if i in CLOSED:
                 continue
-
-            # goal found
-            if node == self.goal:
-                CLOSED[node.current] = node
-                return self.extractPath(CLOSED)
-
-            for node_n in road_map[node]:                
-                # exists in CLOSED set
-                if node_n.current in CLOSED:
-                    continue
-                
-                node_n.parent = node.current
-                node_n.g = self.dist(node_n, node)
-                if not dijkstra:
-                    node_n.h = self.h(node_n, self.goal)
-
-                # goal found
-                if node_n == self.goal:
-                    heapq.heappush(OPEN, node_n)
-                    break
-                
-                # update OPEN set
-                heapq.heappush(OPEN, node_n)
-
-            CLOSED[node.current] = node
+            CLOSED.add(i)
+            if i == goal:
+                return g_i, self.extractPath(parent, cells, goal)
+
+            edges = start_links if i == start else roadmap.adjacency[i]
+            if i in goal_links:
+                edges = edges + [(goal, goal_links[i])]
+            for j, length in edges:
+                g_j = g_i + length
+                if j not in CLOSED and g_j < g.get(j, float("inf")):
+                    g[j], parent[j] = g_j, i
+                    heapq.heappush(OPEN, (g_j + heuristic(j), g_j, j))
         return [], []
 
-    def extractPath(self, closed_list: dict):
+    def extractPath(self, parent: dict, cells: list, goal: int) -> list:
         """
-        Extract the path based on the CLOSED list.
+        Extract the path from the parents of the roadmap search.
 
         Parameters:
-            closed_list (dict): CLOSED list
+            parent (dict): parent vertex of every reached vertex, None for the start
+            cells (list): cell of every vertex
+            goal (int): goal vertex
 
         Returns:
-            cost (float): the cost of planning path
-            path (list): the planning path
-        """
-        cost = 0
-        node = closed_list[self.goal.current]
-        path = [node.current]
-        while node != self.start:
-            node_parent = closed_list[node.parent]
-            cost += self.dist(node, node_parent)
-            node = node_parent
-            path.append(node.current)
-        return cost, path
+            path (list): the planning path from goal to start
+        """
+        path, i = [], goal
+        while i is not None:
+            path.append(tuple(cells[i]))
+            i = parent[i]
+        return path
 
     def isCollision(self, node1: Node, node2: Node) -> bool:
         """
@@ -174,27 +424,6 @@ class VoronoiPlanner(GraphSearcher):
         """
         if node1.current in self.obstacles or node2.current in self.obstacles:
             return True
-        
-        yaw = self.angle(node1, node2)
-        dist = self.dist(node1, node2)
-
-        if dist >= self.max_edge_len:
-            return True
-
-        d_dist = self.inflation_r
-        n_step = round(dist / d_dist)
-
-        x, y = node1.current
-        for _ in range(n_step):
-            dist_to_obs, _ = self.env.obstacles_tree.query([x, y])
-            if dist_to_obs <= self.inflation_r:
-                return True
-            x += d_dist * math.cos(yaw)
-            y += d_dist * math.sin(yaw)
-
-        # goal point check
-        dist_to_obs, _ = self.env.obstacles_tree.query(node2.current)
-        if dist_to_obs <= self.inflation_r:
+        if self.dist(node1, node2) >= self.max_edge_len:
             return True
-
-        return False
\ No newline at end of file
+        return not self.env.lineOfSight(node1.current, node2.current)
@@ -1,6 +1,11 @@
-from .rrt import RRT
-from .rrt_connect import RRTConnect
-from .rrt_star import RRTStar
-from .informed_rrt import InformedRRT
+from python_motion_planning.utils import lazyImport
 
-__all__ = ['RRT', 'RRTConnect', 'RRTStar', 'InformedRRT']
\ No newline at end of file
+__all__ = ['RRT', 'RRTConnect', 'RRTStar', 'InformedRRT', 'PRM']
+
+__getattr__, __dir__ = lazyImport(__name__, {
+    'RRT': '.rrt',
+    'RRTConnect': '.rrt_connect',
+    'RRTStar': '.rrt_star',
+    'InformedRRT': '.informed_rrt',
+    'PRM': '.prm',
+})
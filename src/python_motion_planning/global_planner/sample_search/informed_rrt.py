@@ -6,10 +6,9 @@
 """
 import numpy as np
 from functools import partial
-import matplotlib.pyplot as plt
 
 from .rrt_star import RRTStar
-from python_motion_planning.utils import Env, Node, Map
+from python_motion_planning.utils import Env, Node, Map, SEARCH_PLANNERS
 
 
 class Ellipse:
@@ -33,6 +32,7 @@ class Ellipse:
         return T
 
 
+@SEARCH_PLANNERS.register("informed_rrt")
 class InformedRRT(RRTStar):
     """
     Class for Informed RRT* motion planning.
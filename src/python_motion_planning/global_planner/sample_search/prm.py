@@ -0,0 +1,437 @@
+"""
+@file: prm.py
+@breif: Multi-query probabilistic roadmap motion planning
+@update: 2026.10.18
+"""
+import math
+import heapq
+from multiprocessing import Pool
+
+import numpy as np
+from scipy.spatial import cKDTree
+from scipy.sparse import csr_matrix
+
+from .sample_search import SampleSearcher
+from python_motion_planning.utils import Env, Node, Grid, Map, PlanStatus, SEARCH_PLANNERS
+
+# environment and inflation shared with pool workers, set by `_initWorker`
+_worker_env = None
+_worker_delta = None
+
+
+def _initWorker(env, delta: float) -> None:
+    global _worker_env, _worker_delta
+    if isinstance(env, tuple):
+        # a grid is sent as its shape and obstacles, see `PRM.build`
+        shape, obstacles = env
+        env = Grid(*shape)
+        env.update(obstacles)
+    _worker_env, _worker_delta = env, delta
+
+
+def _sampleChunk(args) -> np.ndarray:
+    sample_num, seed = args
+    return PRM.sampleFree(_worker_env, _worker_delta, sample_num, seed)
+
+
+class Roadmap(object):
+    """
+    Roadmap of a probabilistic roadmap planner on one version of a map.
+
+    Edges are stored as a symmetric CSR matrix of Euclidean lengths. Whether an
+    edge is collision-free is only known once a query has checked it, see
+    `PRM.plan`; the result is kept in `state`, aligned with the CSR entries,
+    so later queries skip edges known to be blocked and do not check known
+    free ones again.
+
+    Parameters:
+        nodes (np.ndarray): (N, dim) collision-free samples
+        graph (csr_matrix): symmetric (N, N) edge lengths
+
+    Attributes:
+        tree (cKDTree): KD-tree of the nodes
+        state (list): `UNKNOWN`, `FREE` or `BLOCKED` of every CSR entry
+        mirror (np.ndarray): CSR entry of the reverse edge of every CSR entry
+    """
+    UNKNOWN, FREE, BLOCKED = 0, 1, 2
+
+    def __init__(self, nodes: np.ndarray, graph: csr_matrix) -> None:
+        self.nodes = nodes
+        self.points = nodes.tolist()
+        self.graph = graph
+        self.graph.sort_indices()
+        self.tree = cKDTree(nodes) if len(nodes) else None
+        self.state = [self.UNKNOWN] * graph.nnz
+        # the reverse of entry (i, j) is entry (j, i), found as the same entry of the transpose
+        entries = csr_matrix((np.arange(1, graph.nnz + 1), graph.indices, graph.indptr), shape=graph.shape)
+        transpose = entries.T.tocsr()
+        transpose.sort_indices()
+        self.mirror = transpose.data - 1
+        # (neighbor, length, entry) lists of every node
+        indptr, indices, data = graph.indptr.tolist(), graph.indices.tolist(), graph.data.tolist()
+        self.adjacency = [list(zip(indices[indptr[i]:indptr[i + 1]], data[indptr[i]:indptr[i + 1]],
+                                   range(indptr[i], indptr[i + 1])))
+                          for i in range(len(nodes))]
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def mark(self, entry: int, free: bool) -> None:
+        """
+        Record the collision check of an edge in both directions, so `free`
+        must hold for both directions of travel, see `PRM.edgesFree`.
+        """
+        state = self.FREE if free else self.BLOCKED
+        self.state[entry] = state
+        self.state[self.mirror[entry]] = state
+
+
+@SEARCH_PLANNERS.register("prm")
+class PRM(SampleSearcher):
+    """
+    Class for multi-query probabilistic roadmap (PRM) motion planning.
+
+    The roadmap is sampled once per map version and kept in `env.cache`, so
+    every planner with the same parameters on that map shares it. Edges are
+    checked lazily: a query joins start and goal to their nearest nodes, runs
+    A* on the roadmap, and only checks the edges of the path found. Blocked
+    edges are recorded in the roadmap and the search is repeated until a path
+    survives. Sampling and sample validation of the roadmap can run in a
+    process pool.
+
+    On a `Grid` the samples are free cells and edges are checked with
+    `Grid.lineOfSight`; on a 2D `Map` they are points and edges are checked
+    against the obstacles inflated by `delta`.
+
+    Parameters:
+        start (tuple): start point coordinate
+        goal (tuple): goal point coordinate
+        env (Env): environment, `Grid` or 2D `Map`
+        sample_num (int): number of samples drawn for the roadmap
+        n_knn (int): number of nearest nodes every node is joined to
+        max_edge_len (float): maximum edge length
+        workers (int): number of worker processes sampling the roadmap, 0 to sample in this process
+        seed (int): random seed of the samples, None for a random roadmap
+        delta (float): inflation of the obstacles of a `Map`
+
+    Examples:
+        >>> import python_motion_planning as pmp
+        >>> planner = pmp.PRM((5, 5, 5), (45, 25, 5), pmp.Grid(51, 31, 11), workers=4)
+        >>> cost, path, expand = planner.plan()     # planning results only
+        >>> cost, path, expand = planner.plan((6, 6, 5), (40, 20, 8))   # reuses the roadmap
+        >>> planner.plot.animation(path, str(planner), cost, expand)  # animation
+        >>> planner.run()       # run both planning and animation
+
+    References:
+        [1] Probabilistic Roadmaps for Path Planning in High-Dimensional Configuration Spaces
+        [2] Path Planning Using Lazy PRM
+    """
+    # number of samples drawn and validated per pool task
+    CHUNK_SIZE = 1024
+
+    def __init__(self, start: tuple = None, goal: tuple = None, env: Env = None, sample_num: int = 2000,
+                 n_knn: int = 10, max_edge_len: float = 10.0, workers: int = 0, seed: int = None,
+                 delta: float = 0.5) -> None:
+        super().__init__(start, goal, env, delta)
+        if isinstance(env, Map) and env.z_range is not None:
+            raise ValueError("PRM supports 2D maps only, use a Grid for 3D planning")
+        # number of samples drawn for the roadmap
+        self.sample_num = sample_num
+        # number of nearest nodes every node is joined to
+        self.n_knn = n_knn
+        # maximum edge length
+        self.max_edge_len = max_edge_len
+        # number of worker processes sampling the roadmap
+        self.workers = workers
+        # random seed of the samples
+        self.seed = seed
+
+    def __str__(self) -> str:
+        return "Probabilistic Roadmap(PRM)"
+
+    @property
+    def roadmap(self) -> Roadmap:
+        """
+        Roadmap of the current map version, built on first use or taken from `env.cache`.
+        """
+        key = ("prm", self.sample_num, self.n_knn, self.max_edge_len, self.seed, self.delta)
+        version, roadmap = self.env.cache.get(key, (None, None))
+        if version != self.env.version:
+            roadmap = self.build()
+            self.env.cache[key] = (self.env.version, roadmap)
+        return roadmap
+
+    def build(self) -> Roadmap:
+        """
+        Sample the roadmap and join every node to its nearest nodes, without
+        checking the edges.
+
+        Returns:
+            roadmap (Roadmap): roadmap of the current map
+        """
+        sizes = [min(self.CHUNK_SIZE, self.sample_num - i) for i in range(0, self.sample_num, self.CHUNK_SIZE)]
+        # one seed per chunk, so the roadmap does not depend on the number of workers
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+        chunks = list(zip(sizes, seeds))
+        if self.workers:
+            env = (self.env.shape, set(self.env.obstacles)) if isinstance(self.env, Grid) else self.env
+            with Pool(self.workers, initializer=_initWorker, initargs=(env, self.delta)) as pool:
+                samples = pool.map(_sampleChunk, chunks)
+        else:
+            samples = [self.sampleFree(self.env, self.delta, *chunk) for chunk in chunks]
+
+        dim = 2 if isinstance(self.env, Map) else len(self.env.shape)
+        nodes = np.concatenate(samples) if samples else np.zeros((0, dim))
+        if isinstance(self.env, Grid):
+            nodes = np.unique(nodes, axis=0)
+        n = len(nodes)
+        if n < 2:
+            return Roadmap(nodes, csr_matrix((n, n)))
+
+        _, index = cKDTree(nodes).query(nodes, k=min(self.n_knn + 1, n), distance_upper_bound=self.max_edge_len,
+                                        workers=-1 if self.workers else 1)
+        i = np.repeat(np.arange(n), index.shape[1])
+        j = index.ravel()
+        valid = (j < n) & (j != i)
+        pairs = np.unique(np.sort(np.stack((i[valid], j[valid]), axis=1), axis=1), axis=0)
+        i, j = pairs.T
+        length = np.sqrt(((nodes[i] - nodes[j]) ** 2).sum(axis=1))
+        graph = csr_matrix((np.r_[length, length], (np.r_[i, j], np.r_[j, i])), shape=(n, n))
+        return Roadmap(nodes, graph)
+
+    @staticmethod
+    def sampleFree(env: Env, delta: float, sample_num: int, seed) -> np.ndarray:
+        """
+        Draw uniform samples and keep the collision-free ones.
+
+        Parameters:
+            env (Env): environment
+            delta (float): inflation of the obstacles of a `Map`
+            sample_num (int): number of samples drawn
+            seed (SeedSequence): seed of the samples
+
+        Returns:
+            samples (np.ndarray): (M, dim) free samples, M <= sample_num
+        """
+        rng = np.random.default_rng(seed)
+        if isinstance(env, Grid):
+            cells = rng.integers(0, env.shape, size=(sample_num, len(env.shape)))
+            return cells[~env.occupancy[tuple(cells.T)]]
+
+        points = rng.uniform((delta, delta), (env.x_range - delta, env.y_range - delta), size=(sample_num, 2))
+        return points[PRM.segmentsFree(env, delta, points, points)]
+
+    @staticmethod
+    def segmentsFree(env: Env, delta: float, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """
+        Whether segments are collision-free, vectorized over the segments.
+
+        Parameters:
+            env (Env): environment
+            delta (float): inflation of the obstacles of a `Map`
+            a (np.ndarray): (M, dim) segment starts
+            b (np.ndarray): (M, dim) segment ends
+
+        Returns:
+            free (np.ndarray): (M,) boolean mask
+        """
+        if isinstance(env, Grid):
+            a, b = np.rint(a).astype(np.int64), np.rint(b).astype(np.int64)
+            if len(a) < env.LOS_BATCH_MIN:
+                return np.array([env.lineOfSight(tuple(s), tuple(e)) for s, e in zip(a.tolist(), b.tolist())],
+                                dtype=bool)
+            return env.traceSegments(a, b)
+
+        a, b = np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+        d = b - a
+        free = np.ones(len(a), dtype=bool)
+        # circles: closest point of the segment to the center
+        dd = np.maximum((d * d).sum(axis=1), 1e-12)
+        for ox, oy, r in env.obs_circ:
+            center = np.array([ox, oy], dtype=np.float64)
+            t = np.clip(((center - a) * d).sum(axis=1) / dd, 0.0, 1.0)
+            closest = a + t[:, None] * d
+            free &= np.hypot(*(closest - center).T) > r + delta
+        # rectangles and boundary: slab test of the segment against the inflated box
+        for ox, oy, w, h in list(env.obs_rect) + list(env.boundary):
+            lo = np.array([ox - delta, oy - delta])
+            hi = np.array([ox + w + delta, oy + h + delta])
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t1, t2 = (lo - a) / d, (hi - a) / d
+            inside = (a >= lo) & (a <= hi)
+            moving = d != 0
+            t_min = np.where(moving, np.minimum(t1, t2), np.where(inside, -np.inf, np.inf))
+            t_max = np.where(moving, np.maximum(t1, t2), np.where(inside, np.inf, -np.inf))
+            free &= np.maximum(t_min.max(axis=1), 0.0) > np.minimum(t_max.min(axis=1), 1.0)
+        return free
+
+    def plan(self, start: tuple = None, goal: tuple = None) -> tuple:
+        """
+        PRM motion plan function.
+
+        Parameters:
+            start (tuple): new start point coordinate, None to keep the current one
+            goal (tuple): new goal point coordinate, None to keep the current one
+
+        Returns:
+            cost (float): path cost
+            path (list): planning path
+            expand (list): roadmap nodes
+        """
+        if start is not None or goal is not None:
+            self.reset(start, goal)
+
+        roadmap = self.roadmap
+        expand = [Node(tuple(p)) for p in roadmap.points]
+        s, g = self.start.current, self.goal.current
+        if not self.segmentsFree(self.env, self.delta, np.array([s, g]), np.array([s, g])).all():
+            self.status = PlanStatus.NO_PATH
+            return 0, None, expand
+
+        # start and goal are the extra vertices n and n + 1, their edges are checked per query
+        n = len(roadmap)
+        points = [s, g]
+        links = {n: self.links(roadmap, s), n + 1: dict(self.links(roadmap, g))}
+        direct = math.dist(s, g)
+        if direct <= self.max_edge_len:
+            links[n].append((n + 1, direct))
+        checked = dict()
+
+        self.budget.start()
+        while True:
+            result = self.search(roadmap, links, points, checked)
+            if result is None:
+                return 0, None, expand
+            edges, parent, cost = result
+
+            # check the unknown edges of the path at once, in a single vectorized call
+            unknown = [e for e in edges if self.edgeState(roadmap, checked, e) == Roadmap.UNKNOWN]
+            if unknown:
+                a = np.array([self.vertex(roadmap, points, u) for u, _, _ in unknown])
+                b = np.array([self.vertex(roadmap, points, v) for _, v, _ in unknown])
+                for e, free in zip(unknown, self.edgesFree(a, b).tolist()):
+                    if e[2] is None:
+                        checked[frozenset(e[:2])] = free
+                    else:
+                        roadmap.mark(e[2], free)
+                if not all(self.edgeState(roadmap, checked, e) == Roadmap.FREE for e in unknown):
+                    continue
+
+            self.status = PlanStatus.SUCCESS
+            path, i = [], n + 1
+            while i is not None:
+                path.append(tuple(self.vertex(roadmap, points, i)))
+                i = parent[i]
+            return cost, path, expand
+
+    def edgesFree(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """
+        Whether roadmap edges are collision-free in both directions. The
+        Bresenham line of sight of a `Grid` visits different cells from either
+        end, so an edge recorded once is only free if both traces are.
+
+        Parameters:
+            a (np.ndarray): (M, dim) edge starts
+            b (np.ndarray): (M, dim) edge ends
+
+        Returns:
+            free (np.ndarray): (M,) boolean mask
+        """
+        free = self.segmentsFree(self.env, self.delta, a, b)
+        if isinstance(self.env, Grid) and free.any():
+            free[free] = self.segmentsFree(self.env, self.delta, b[free], a[free])
+        return free
+
+    def links(self, roadmap: Roadmap, point: tuple) -> list:
+        """
+        Unchecked edges joining a point to its nearest roadmap nodes.
+
+        Returns:
+            links (list): (node index, edge length) of at most `n_knn` nodes
+        """
+        if not len(roadmap):
+            return []
+        length, index = roadmap.tree.query(point, k=min(self.n_knn, len(roadmap)),
+                                           distance_upper_bound=self.max_edge_len)
+        length, index = np.atleast_1d(length), np.atleast_1d(index)
+        valid = index < len(roadmap)
+        return list(zip(index[valid].tolist(), length[valid].tolist()))
+
+    @staticmethod
+    def vertex(roadmap: Roadmap, points: list, i: int) -> tuple:
+        n = len(roadmap)
+        return points[i - n] if i >= n else roadmap.points[i]
+
+    @staticmethod
+    def edgeState(roadmap: Roadmap, checked: dict, edge: tuple) -> int:
+        u, v, entry = edge
+        if entry is not None:
+            return roadmap.state[entry]
+        free = checked.get(frozenset((u, v)))
+        return Roadmap.UNKNOWN if free is None else Roadmap.FREE if free else Roadmap.BLOCKED
+
+    def search(self, roadmap: Roadmap, links: dict, points: list, checked: dict):
+        """
+        A* from start to goal on the roadmap, skipping edges known to be blocked.
+
+        Parameters:
+            roadmap (Roadmap): roadmap of the current map
+            links (dict): unchecked edges of the start vertex and the goal vertex
+            points (list): start and goal points
+            checked (dict): collision checks of the start and goal edges of this query
+
+        Returns:
+            result (tuple): (u, v, CSR entry or None) edges of the path, parent of
+                every reached vertex and path cost, or None if there is no path
+        """
+        n = len(roadmap)
+        start, goal = n, n + 1
+        goal_point = np.array(points[1], dtype=np.float64)
+        goal_links = links[goal]
+
+        def heuristic(i: int) -> float:
+            return 0.0 if i == goal else math.dist(self.vertex(roadmap, points, i), goal_point)
+
+        OPEN = [(heuristic(start), 0.0, start)]
+        g, parent, via = {start: 0.0}, {start: None}, {start: None}
+        CLOSED = set()
+        while OPEN:
+            _, g_i, i = heapq.heappop(OPEN)
+            if i in CLOSED:
+                continue
+            CLOSED.add(i)
+            if i == goal:
+                edges, j = [], goal
+                while parent[j] is not None:
+                    edges.append((parent[j], j, via[j]))
+                    j = parent[j]
+                return list(reversed(edges)), parent, g_i
+
+            status = self.budget.exhausted()
+            if status is not None:
+                self.status = status
+                return None
+
+            if i == start:
+                edges = [(j, length, None) for j, length in links[start]]
+            else:
+                edges = [(j, length, e) for j, length, e in roadmap.adjacency[i]
+                         if roadmap.state[e] != Roadmap.BLOCKED]
+                if i in goal_links:
+                    edges.append((goal, goal_links[i], None))
+            for j, length, e in edges:
+                if e is None and checked.get(frozenset((i, j))) is False:
+                    continue
+                g_j = g_i + length
+                if j not in CLOSED and g_j < g.get(j, float("inf")):
+                    g[j], parent[j], via[j] = g_j, i, e
+                    heapq.heappush(OPEN, (g_j + heuristic(j), g_j, j))
+        self.status = PlanStatus.NO_PATH
+        return None
+
+    def run(self) -> None:
+        """
+        Running both plannig and animation.
+        """
+        cost, path, expand = self.plan()
+        self.plot.animation(path, str(self), cost, expand)
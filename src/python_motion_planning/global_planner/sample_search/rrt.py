@@ -8,9 +8,10 @@ import math
 import numpy as np
 
 from .sample_search import SampleSearcher
-from python_motion_planning.utils import Env, Node, Map
+from python_motion_planning.utils import Env, Node, Map, SEARCH_PLANNERS
 
 
+@SEARCH_PLANNERS.register("rrt")
 class RRT(SampleSearcher):
     """
     Class for RRT motion planning.
@@ -7,9 +7,10 @@
 import math
 
 from .rrt import RRT
-from python_motion_planning.utils import Env, Node, Map
+from python_motion_planning.utils import Env, Node, Map, SEARCH_PLANNERS
 
 
+@SEARCH_PLANNERS.register("rrt_connect")
 class RRTConnect(RRT):
     """
     Class for RRT-Connect motion planning.
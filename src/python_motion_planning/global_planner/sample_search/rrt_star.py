@@ -5,9 +5,10 @@
 @update: 2024.6.23
 """
 from .rrt import RRT
-from python_motion_planning.utils import Env, Node, Map
+from python_motion_planning.utils import Env, Node, Map, SEARCH_PLANNERS
 
 
+@SEARCH_PLANNERS.register("rrt_star")
 class RRTStar(RRT):
     """
     Class for RRT-Star motion planning.
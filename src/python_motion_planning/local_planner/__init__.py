@@ -1,9 +1,4 @@
-from .dwa import DWA
-from .pid import PID
-from .apf import APF
-from .rpp import RPP
-from .lqr import LQR
-from .mpc import MPC
+from python_motion_planning.utils import lazyImport
 
 __all__ = [
     "DWA",
@@ -12,4 +7,13 @@ __all__ = [
     "RPP",
     "LQR",
     "MPC"
-]
\ No newline at end of file
+]
+
+__getattr__, __dir__ = lazyImport(__name__, {
+    "DWA": ".dwa",
+    "PID": ".pid",
+    "APF": ".apf",
+    "RPP": ".rpp",
+    "LQR": ".lqr",
+    "MPC": ".mpc",
+})
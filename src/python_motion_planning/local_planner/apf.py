@@ -9,8 +9,9 @@ import numpy as np
 from scipy.spatial.distance import cdist
 
 from .local_planner import LocalPlanner
-from python_motion_planning.utils import Env
+from python_motion_planning.utils import Env, CONTROL_PLANNERS
 
+@CONTROL_PLANNERS.register("apf")
 class APF(LocalPlanner):
     """
     Class for Artificial Potential Field(APF) motion planning.
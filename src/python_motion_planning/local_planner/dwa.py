@@ -9,9 +9,10 @@ from itertools import product
 from scipy.spatial.distance import cdist
 
 from .local_planner import LocalPlanner
-from python_motion_planning.utils import Env
+from python_motion_planning.utils import Env, CONTROL_PLANNERS
 
 
+@CONTROL_PLANNERS.register("dwa")
 class DWA(LocalPlanner):
     """
     Class for Dynamic Window Approach(DWA) motion planning.
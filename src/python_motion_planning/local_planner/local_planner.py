@@ -6,7 +6,7 @@
 """
 import math
 
-from python_motion_planning.utils import Env, Planner, SearchFactory, Plot, Robot, MathHelper
+from python_motion_planning.utils import Env, Planner, SearchFactory, Robot, MathHelper
 
 
 class LocalPlanner(Planner):
@@ -31,8 +31,8 @@ class LocalPlanner(Planner):
         self.env = env
         # obstacles
         self.obstacles = self.env.obstacles
-        # graph handler
-        self.plot = Plot(start, goal, env)
+        # graph handler, created on first use
+        self._plot = None
         # robot
         self.robot = Robot(start[0], start[1], start[2], 0, 0)
 
@@ -7,8 +7,9 @@
 import numpy as np
 
 from .local_planner import LocalPlanner
-from python_motion_planning.utils import Env
+from python_motion_planning.utils import Env, CONTROL_PLANNERS
 
+@CONTROL_PLANNERS.register("lqr")
 class LQR(LocalPlanner):
     """
     Class for Linear Quadratic Regulator(LQR) motion planning.
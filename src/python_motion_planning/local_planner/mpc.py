@@ -9,8 +9,9 @@ import numpy as np
 from scipy import sparse
 
 from .local_planner import LocalPlanner
-from python_motion_planning.utils import Env
+from python_motion_planning.utils import Env, CONTROL_PLANNERS
 
+@CONTROL_PLANNERS.register("mpc")
 class MPC(LocalPlanner):
     """
     Class for Model Predicted Control (MPC) motion planning.
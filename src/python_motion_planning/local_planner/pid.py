@@ -8,9 +8,10 @@ import numpy as np
 import math
 
 from .local_planner import LocalPlanner
-from python_motion_planning.utils import Env, MathHelper
+from python_motion_planning.utils import Env, MathHelper, CONTROL_PLANNERS
 
 
+@CONTROL_PLANNERS.register("pid")
 class PID(LocalPlanner):
     """
     Class for PID motion planning.
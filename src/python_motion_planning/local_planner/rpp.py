@@ -9,9 +9,10 @@ import numpy as np
 from scipy.spatial.distance import cdist
 
 from .local_planner import LocalPlanner
-from python_motion_planning.utils import Env
+from python_motion_planning.utils import Env, CONTROL_PLANNERS
 
 
+@CONTROL_PLANNERS.register("rpp")
 class RPP(LocalPlanner):
     """
     Class for RPP motion planning.
@@ -1,19 +1,23 @@
-from .helper import MathHelper
+from .helper import MathHelper, IndexedHeap, lazyImport
 from .agent.agent import Robot
 from .environment.env import Env, Grid, Map
 from .environment.node import Node
 from .environment.point2d import Point2D
 from .environment.pose2d import Pose2D
-from .plot.plot import Plot
 from .planner.planner import Planner
+from .planner.budget import PlanStatus, CancelToken, SearchBudget
+from .planner.registry import Registry, SEARCH_PLANNERS, CONTROL_PLANNERS, CURVES
 from .planner.search_factory import SearchFactory
 from .planner.curve_factory import CurveFactory
 from .planner.control_factory import ControlFactory
 
 __all__ = [
-    "MathHelper",
+    "MathHelper", "IndexedHeap",
     "Env", "Grid", "Map", "Node", "Point2D", "Pose2D",
-    "Plot", 
-    "Planner", "SearchFactory", "CurveFactory", "ControlFactory",
+    "Planner", "PlanStatus", "CancelToken", "SearchBudget",
+    "Registry", "SearchFactory", "CurveFactory", "ControlFactory",
     "Robot"
-]
\ No newline at end of file
+]
+
+# matplotlib is only loaded once plotting is actually requested
+__getattr__, __dir__ = lazyImport(__name__, {"Plot": ".plot.plot"})
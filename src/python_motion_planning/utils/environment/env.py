@@ -6,7 +6,7 @@
 """
 from math import sqrt
 from abc import ABC, abstractmethod
-from scipy.spatial import cKDTree
+from collections import OrderedDict
 import numpy as np
 
 from .node import Node
@@ -46,11 +46,23 @@ class Grid(Env):
     """
     Class for discrete 3-d grid map.
 
+    Every call of `update` bumps `version`, so structures derived from the
+    obstacles (occupancy array, planner preprocessing kept in `cache`) can be
+    reused until the map changes and then repaired from `changedCells`.
+    Obstacles edited in place only take effect after `update` is called.
+
     Parameters:
         x_range (int): x-axis range of enviroment
         y_range (int): y-axis range of environmet
         z_range (int): z-axis range of environment
     """
+    # number of occupancy diffs kept for incremental repair
+    HISTORY_SIZE = 64
+    # number of line-of-sight results memoized for the current version
+    LOS_CACHE_SIZE = 1 << 16
+    # fewer segments than this are traced one by one, NumPy call overhead outweighs the work
+    LOS_BATCH_MIN = 16
+
     def __init__(self, x_range: int, y_range: int, z_range: int = None) -> None:
         super().__init__(x_range, y_range, z_range)
         # allowed motions (26 neighbors in 3D, 8 in 2D)
@@ -65,7 +77,28 @@ class Grid(Env):
                     self.motions.append(Node((dx, dy, dz), None, cost, None))
         # obstacles
         self.obstacles = None
-        self.obstacles_tree = None
+        # KD-tree of obstacles, built on first use for the current version
+        self._obstacles_tree = None
+        self._obstacles_tree_version = -1
+        # connected-component labels of free space, built on first use for the current version
+        self._components = None
+        self._components_version = -1
+        # memoized line-of-sight results of the current version, most recently used last
+        self._los_cache = OrderedDict()
+        self._los_cache_version = -1
+        # clearance field of free space, built on first use for the current version
+        self._clearance = None
+        self._clearance_version = -1
+        # flat view of the clearance field for tracing single segments in Python
+        self._los_clearance = None
+        # map version, increased by every update
+        self.version = 0
+        # derived data of planners, e.g. preprocessing tables, keyed by name
+        self.cache = dict()
+        # materialized occupancy array and diffs between materialized versions
+        self._occupancy = None
+        self._occupancy_version = -1
+        self._history = []
         self.init()
 
     def init(self) -> None:
@@ -96,13 +129,284 @@ class Grid(Env):
 
     def update(self, obstacles):
         self.obstacles = obstacles 
-        self.obstacles_tree = cKDTree(np.array(list(obstacles)))
+        self.version += 1
+
+    @property
+    def obstacles_tree(self):
+        """
+        KD-tree of the obstacles of the current version.
+        """
+        if self._obstacles_tree_version != self.version:
+            from scipy.spatial import cKDTree
+            self._obstacles_tree = cKDTree(np.array(list(self.obstacles)))
+            self._obstacles_tree_version = self.version
+        return self._obstacles_tree
+
+    @property
+    def components(self) -> np.ndarray:
+        """
+        Connected-component labels of the free cells of the current version,
+        0 for obstacles. Cells are connected through the grid `motions`, so two
+        cells with different labels cannot be joined by any path.
+        """
+        if self._components_version != self.version:
+            from scipy.ndimage import label
+            structure = np.ones((3,) * len(self.shape), dtype=bool)
+            self._components, _ = label(~self.occupancy, structure=structure)
+            self._components_version = self.version
+        return self._components
+
+    @property
+    def clearance(self) -> np.ndarray:
+        """
+        Chessboard distance from every cell to the nearest obstacle cell of the
+        current version, 0 for obstacles. Every cell closer than
+        `clearance[c]` to cell `c` along each axis is free.
+        """
+        if self._clearance_version != self.version:
+            occupancy = self.occupancy
+            if occupancy.any():
+                from scipy.ndimage import distance_transform_cdt
+                self._clearance = distance_transform_cdt(~occupancy, metric="chessboard")
+            else:
+                self._clearance = np.full(occupancy.shape, max(occupancy.shape), dtype=np.int32)
+            self._clearance_version = self.version
+        return self._clearance
+
+    def connected(self, cell1: tuple, cell2: tuple) -> bool:
+        """
+        Whether two cells are free and lie in the same component of free space.
+
+        Parameters:
+            cell1 (tuple): first cell
+            cell2 (tuple): second cell
+
+        Returns:
+            connected (bool): False if no path can join the cells
+        """
+        components = self.components
+        for cell in (cell1, cell2):
+            if any(c < 0 or c >= n for c, n in zip(cell, components.shape)):
+                return False
+        label = components[tuple(cell1)]
+        return label != 0 and label == components[tuple(cell2)]
+
+    def lineOfSight(self, start: tuple, end: tuple) -> bool:
+        """
+        Whether the segment between two cells is free, see `lineOfSightBatch`.
+
+        Parameters:
+            start (tuple): first cell of the segment
+            end (tuple): last cell of the segment
+
+        Returns:
+            line_of_sight (bool): True if no cell on the segment is an obstacle
+        """
+        cache = self.losCache()
+        key = (tuple(start), tuple(end))
+        visible = cache.get(key)
+        if visible is not None:
+            cache.move_to_end(key)
+            return visible
+
+        visible = self.traceSegment(*key)
+        cache[key] = visible
+        if len(cache) > self.LOS_CACHE_SIZE:
+            cache.popitem(last=False)
+        return visible
+
+    def lineOfSightBatch(self, starts: list, end: tuple) -> list:
+        """
+        Line of sight from many cells to one common cell, e.g. from the
+        children of an expanded node to its parent. Up to `LOS_BATCH_MIN`
+        segments are traced one by one with `traceSegment`, larger batches in
+        one NumPy pass with `traceSegments`.
+
+        The cells of a segment are those of the 3D Bresenham line from start
+        to end: along the axis of largest extent `D` the k-th cell moves k
+        steps, and an axis of extent `d` has moved `(2dk + D - 1) // 2D`
+        steps. Results are memoized per (start, end) until the map changes.
+
+        Parameters:
+            starts (list): first cells of the segments
+            end (tuple): last cell of all segments
+
+        Returns:
+            line_of_sight (list): True for each start with line of sight to end
+        """
+        cache = self.losCache()
+        end = tuple(end)
+        keys = [(tuple(start), end) for start in starts]
+        result, missing = [], []
+        for i, key in enumerate(keys):
+            visible = cache.get(key)
+            if visible is None:
+                missing.append(i)
+            else:
+                cache.move_to_end(key)
+            result.append(visible)
+        if not missing:
+            return result
+
+        if len(missing) < self.LOS_BATCH_MIN:
+            traced = [self.traceSegment(keys[i][0], end) for i in missing]
+        else:
+            traced = self.traceSegments(np.array([keys[i][0] for i in missing], dtype=np.int64).reshape(len(missing), -1),
+                                        np.array(end, dtype=np.int64)).tolist()
+        for i, visible in zip(missing, traced):
+            result[i] = visible
+            cache[keys[i]] = visible
+        while len(cache) > self.LOS_CACHE_SIZE:
+            cache.popitem(last=False)
+        return result
+
+    def losCache(self) -> OrderedDict:
+        """
+        Line-of-sight memo of the current version, cleared when the map changes.
+        """
+        if self._los_cache_version != self.version:
+            self._los_cache.clear()
+            self._los_clearance = memoryview(self.clearance.ravel())
+            self._los_cache_version = self.version
+        return self._los_cache
+
+    def traceSegment(self, start: tuple, end: tuple) -> bool:
+        """
+        Uncached line of sight of one segment, the same cells as `traceSegments`
+        without the NumPy call overhead that dominates for a single short segment.
+
+        The cells are visited by sphere stepping: the cell j steps further on
+        the line is at most j cells away along every axis, so a cell with
+        clearance `c` proves the next `c - 1` cells free. In open space the
+        segment is crossed in a few large hops and only cells next to obstacles
+        are visited one by one.
+        """
+        shape = self.shape
+        for c, n in zip(start + end, shape + shape):
+            if c < 0 or c >= n:
+                return False
+
+        length = max(abs(e - s) for s, e in zip(start, end))
+        scale = max(length, 1)
+        stride, axes = 1, []
+        for s, e, n in reversed(list(zip(start, end, shape))):
+            axes.append((s * stride, stride if e > s else -stride, 2 * abs(e - s)))
+            stride *= n
+        self.losCache()
+        clearance = self._los_clearance
+        k = 0
+        while k <= length:
+            index = 0
+            for base, step, extent in axes:
+                index += base + step * ((extent * k + scale - 1) // (2 * scale))
+            c = clearance[index]
+            if c == 0:
+                return False
+            k += c
+        return True
+
+    def traceSegments(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """
+        Uncached line of sight of segments, see `lineOfSightBatch`.
+
+        Segments covered by the clearance of their two end cells, see
+        `traceSegment`, are accepted without visiting their cells.
+
+        Parameters:
+            starts (np.ndarray): (N, dim) first cells of the segments
+            ends (np.ndarray): (N, dim) or (dim,) last cells of the segments
+
+        Returns:
+            line_of_sight (np.ndarray): boolean array, True for free segments
+        """
+        occupancy = self.occupancy
+        shape = np.array(occupancy.shape)
+        strides = np.array(occupancy.strides) // occupancy.itemsize
+        starts, ends = np.broadcast_arrays(starts, ends)
+        delta = ends - starts
+        extent = np.abs(delta)
+        length = extent.max(axis=1)
+        inside = np.all((starts >= 0) & (starts < shape) & (ends >= 0) & (ends < shape), axis=1)
+
+        # out-of-grid segments are rejected by `inside`, clipping only keeps the lookups in range
+        clearance = self.clearance.ravel()
+        c_start = np.take(clearance, starts @ strides, mode="clip")
+        c_end = np.take(clearance, ends @ strides, mode="clip")
+        free = inside & (c_start > 0) & (c_end > 0)
+        # steps 0 .. c_start - 1 and D - c_end + 1 .. D are proven free
+        visible = free & (c_start + c_end > length)
+
+        todo = np.flatnonzero(free & ~visible)
+        if len(todo):
+            starts, delta, extent, length = starts[todo], delta[todo], extent[todo], length[todo]
+            # cells k = 0 .. D of every segment as flat indices, shorter segments repeat their end cell
+            k = np.minimum(np.arange(int(length.max()) + 1), length[:, None])
+            scale = np.maximum(length, 1)[:, None, None]
+            moved = ((2 * extent)[:, None, :] * k[:, :, None] + (scale - 1)) // (2 * scale)
+            index = (starts @ strides)[:, None] + np.einsum("nkd,nd->nk", moved, np.sign(delta) * strides)
+            visible[todo] = ~np.take(occupancy.ravel(), index).any(axis=1)
+        return visible
+
+    @property
+    def shape(self) -> tuple:
+        if self.z_range is not None:
+            return (self.x_range, self.y_range, self.z_range)
+        else:
+            return (self.x_range, self.y_range)
+
+    @property
+    def occupancy(self) -> np.ndarray:
+        """
+        Boolean occupancy array of the current version, True for obstacles.
+        """
+        if self._occupancy_version != self.version:
+            occupancy = np.zeros(self.shape, dtype=bool)
+            if self.obstacles:
+                cells = np.array(list(self.obstacles), dtype=np.int64).reshape(-1, len(self.shape))
+                inside = np.all((cells >= 0) & (cells < np.array(self.shape)), axis=1)
+                occupancy[tuple(cells[inside].T)] = True
+
+            if self._occupancy is not None:
+                changed = np.argwhere(occupancy != self._occupancy)
+                self._history.append((self._occupancy_version, self.version, changed))
+                del self._history[:-self.HISTORY_SIZE]
+
+            self._occupancy = occupancy
+            self._occupancy_version = self.version
+        return self._occupancy
+
+    def changedCells(self, version: int) -> np.ndarray:
+        """
+        Cells whose occupancy changed since `version`.
+
+        Parameters:
+            version (int): version at which the caller last read `occupancy`
+
+        Returns:
+            cells (np.ndarray): (N, dim) array of changed cells, or None if the
+                diff is no longer known and the caller has to rebuild
+        """
+        self.occupancy
+        if version == self.version:
+            return np.empty((0, len(self.shape)), dtype=np.int64)
+
+        chunks = []
+        for v_from, v_to, cells in self._history:
+            if v_from == version:
+                chunks.append(cells)
+                version = v_to
+        if version != self.version:
+            return None
+        return np.unique(np.vstack(chunks), axis=0)
 
 
 class Map(Env):
     """
     Class for continuous 2-d map.
 
+    Like `Grid`, every call of `update` bumps `version`, and planner
+    preprocessing of the current version can be kept in `cache`.
+
     Parameters:
         x_range (int): x-axis range of enviroment
         y_range (int): y-axis range of environmet
@@ -112,6 +416,10 @@ class Map(Env):
         self.boundary = None
         self.obs_circ = None
         self.obs_rect = None
+        # map version, increased by every update
+        self.version = 0
+        # derived data of planners, e.g. roadmaps, keyed by name
+        self.cache = dict()
         self.init()
 
     def init(self):
@@ -141,3 +449,4 @@ class Map(Env):
         self.boundary = boundary if boundary else self.boundary
         self.obs_circ = obs_circ if obs_circ else self.obs_circ
         self.obs_rect = obs_rect if obs_rect else self.obs_rect
+        self.version += 1
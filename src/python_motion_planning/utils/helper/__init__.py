@@ -1,3 +1,5 @@
 from .math_helper import MathHelper
+from .lazy_import import lazyImport
+from .indexed_heap import IndexedHeap
 
-__all__ = ["MathHelper"]
\ No newline at end of file
+__all__ = ["MathHelper", "lazyImport", "IndexedHeap"]
@@ -0,0 +1,129 @@
+"""
+@file: indexed_heap.py
+@breif: Binary min-heap with an item index for priority updates
+@update: 2026.10.18
+"""
+
+
+class IndexedHeap(object):
+    """
+    Binary min-heap that keeps the position of every item, so the priority of
+    an item can be changed and any item removed in O(log n), and the top is
+    read in O(1). Items must be hashable, priorities comparable.
+
+    Examples:
+        >>> heap = IndexedHeap()
+        >>> heap.push("a", [2, 0])
+        >>> heap.push("b", [1, 5])
+        >>> heap.top()
+        'b'
+        >>> heap.push("b", [3, 0])     # update the priority of "b"
+        >>> heap.pop()
+        'a'
+        >>> "a" in heap, len(heap)
+        (False, 1)
+    """
+    def __init__(self) -> None:
+        # [priority, item] entries in heap order
+        self._heap = []
+        # item -> position in `_heap`
+        self._index = dict()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __bool__(self) -> bool:
+        return bool(self._heap)
+
+    def __contains__(self, item) -> bool:
+        return item in self._index
+
+    def __iter__(self):
+        return (entry[1] for entry in self._heap)
+
+    def top(self):
+        """
+        Item with the smallest priority.
+        """
+        return self._heap[0][1]
+
+    def topPriority(self):
+        """
+        Smallest priority in the heap.
+        """
+        return self._heap[0][0]
+
+    def priority(self, item):
+        return self._heap[self._index[item]][0]
+
+    def push(self, item, priority) -> None:
+        """
+        Insert an item, or change its priority if it is already in the heap.
+        """
+        i = self._index.get(item)
+        if i is None:
+            self._heap.append([priority, item])
+            self._index[item] = len(self._heap) - 1
+            self._siftUp(len(self._heap) - 1)
+            return
+
+        old = self._heap[i][0]
+        self._heap[i][0] = priority
+        if priority < old:
+            self._siftUp(i)
+        else:
+            self._siftDown(i)
+
+    def pop(self):
+        """
+        Remove and return the item with the smallest priority.
+        """
+        item = self._heap[0][1]
+        self.remove(item)
+        return item
+
+    def remove(self, item) -> None:
+        """
+        Remove an item, raising KeyError if it is not in the heap.
+        """
+        i = self._index.pop(item)
+        last = self._heap.pop()
+        if i == len(self._heap):
+            return
+        self._heap[i] = last
+        self._index[last[1]] = i
+        if i > 0 and last[0] < self._heap[(i - 1) >> 1][0]:
+            self._siftUp(i)
+        else:
+            self._siftDown(i)
+
+    def _siftUp(self, i: int) -> None:
+        heap, index = self._heap, self._index
+        entry = heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if not entry[0] < heap[parent][0]:
+                break
+            heap[i] = heap[parent]
+            index[heap[i][1]] = i
+            i = parent
+        heap[i] = entry
+        index[entry[1]] = i
+
+    def _siftDown(self, i: int) -> None:
+        heap, index = self._heap, self._index
+        n = len(heap)
+        entry = heap[i]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and heap[child + 1][0] < heap[child][0]:
+                child += 1
+            if not heap[child][0] < entry[0]:
+                break
+            heap[i] = heap[child]
+            index[heap[i][1]] = i
+            i = child
+        heap[i] = entry
+        index[entry[1]] = i
@@ -0,0 +1,37 @@
+"""
+@file: lazy_import.py
+@breif: Lazy attribute loading for packages
+@update: 2026.10.18
+"""
+import sys
+from importlib import import_module
+
+
+def lazyImport(package: str, attributes: dict) -> tuple:
+    """
+    Build module-level `__getattr__` and `__dir__` functions that import the
+    submodule defining a public name only when the name is first accessed.
+
+    Parameters:
+        package (str): name of the package, i.e. `__name__`
+        attributes (dict): public name -> relative module defining it
+
+    Returns:
+        __getattr__ (callable): module attribute hook
+        __dir__ (callable): module listing hook
+
+    Examples:
+        >>> __getattr__, __dir__ = lazyImport(__name__, {"AStar": ".a_star"})
+    """
+    def __getattr__(name: str):
+        if name not in attributes:
+            raise AttributeError("module {!r} has no attribute {!r}".format(package, name))
+        value = getattr(import_module(attributes[name], package), name)
+        # cache on the package so later lookups bypass this hook
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> list:
+        return sorted(set(vars(sys.modules[package])) | set(attributes))
+
+    return __getattr__, __dir__
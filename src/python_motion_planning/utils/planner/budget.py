@@ -0,0 +1,90 @@
+"""
+@file: budget.py
+@breif: Search budgets and cancellation for planners
+@update: 2026.10.18
+"""
+import time
+import threading
+
+
+class PlanStatus(object):
+    """
+    Status codes of a planning call, see `Planner.status`.
+    """
+    SUCCESS = "success"
+    NO_PATH = "no_path"
+    MAX_EXPANSIONS = "max_expansions"
+    TIMEOUT = "timeout"
+    CANCELLED = "cancelled"
+
+
+class CancelToken(object):
+    """
+    Cooperative cancellation flag, safe to set from another thread.
+
+    Parameters:
+        event: event object to wrap, e.g. a `multiprocessing.Event` to cancel
+            searches in worker processes, None for a new `threading.Event`
+
+    Examples:
+        >>> token = CancelToken()
+        >>> planner.setBudget(cancel_token=token)
+        >>> threading.Timer(0.5, token.cancel).start()
+        >>> cost, path, expand = planner.plan()
+        >>> planner.status
+        'cancelled'
+    """
+    def __init__(self, event=None) -> None:
+        self._event = threading.Event() if event is None else event
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    def reset(self) -> None:
+        self._event.clear()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+class SearchBudget(object):
+    """
+    Limits of one planning call. Planners call `start` before searching and
+    `exhausted` once per expansion.
+
+    Parameters:
+        max_expansions (int): maximum number of expanded nodes, None for no limit
+        max_time (float): maximum wall-clock time in seconds, None for no limit
+        cancel_token (CancelToken): token checked for cancellation, None for none
+    """
+    def __init__(self, max_expansions: int = None, max_time: float = None, cancel_token: CancelToken = None) -> None:
+        self.max_expansions = max_expansions
+        self.max_time = max_time
+        self.cancel_token = cancel_token
+        self.expansions = 0
+        self.t_end = None
+
+    @property
+    def unlimited(self) -> bool:
+        return self.max_expansions is None and self.max_time is None and self.cancel_token is None
+
+    def start(self) -> None:
+        self.expansions = 0
+        self.t_end = None if self.max_time is None else time.perf_counter() + self.max_time
+
+    def exhausted(self) -> str:
+        """
+        Count one expansion and check the limits.
+
+        Returns:
+            status (str): the `PlanStatus` of the exceeded limit, None while within budget
+        """
+        self.expansions += 1
+        if self.max_expansions is not None and self.expansions > self.max_expansions:
+            return PlanStatus.MAX_EXPANSIONS
+        if self.t_end is not None and time.perf_counter() > self.t_end:
+            return PlanStatus.TIMEOUT
+        if self.cancel_token is not None and self.cancel_token.cancelled:
+            return PlanStatus.CANCELLED
+        return None
@@ -2,26 +2,18 @@
 @file: control_factory.py
 @breif: Facotry class for local planner.
 @author: Winter
-@update: 2023.10.24
+@update: 2026.10.18
 """
-from python_motion_planning.local_planner import *
+from .registry import CONTROL_PLANNERS
 
 class ControlFactory(object):
+    # planner classes by name, see `Registry`
+    registry = CONTROL_PLANNERS
+
     def __init__(self) -> None:
         pass
 
     def __call__(self, planner_name, **config):
-        if planner_name == "dwa":
-            return DWA(**config)
-        elif planner_name == "pid":
-            return PID(**config)
-        elif planner_name == "apf":
-            return APF(**config)
-        elif planner_name == "rpp":
-            return RPP(**config)
-        elif planner_name == "lqr":
-            return LQR(**config)
-        elif planner_name == "mpc":
-            return MPC(**config)
-        else:
-            raise ValueError("The `planner_name` must be set correctly.")
\ No newline at end of file
+        if planner_name not in self.registry:
+            raise ValueError("The `planner_name` must be set correctly.")
+        return self.registry.get(planner_name)(**config)
@@ -7,17 +7,66 @@
 import math
 from abc import abstractmethod, ABC
 from ..environment.env import Env, Node
-from ..plot.plot import Plot
+from .budget import SearchBudget, CancelToken
 
 class Planner(ABC):
     def __init__(self, start: tuple, goal: tuple, env: Env) -> None:
-        # plannig start and goal
+        # plannig start and goal, may be left None and given to `plan` instead
         self.start = Node(start, start, 0, 0)
         self.goal = Node(goal, goal, 0, 0)
         # environment
         self.env = env
-        # graph handler
-        self.plot = Plot(start, goal, env)
+        # graph handler, created on first use so headless planning never loads matplotlib
+        self._plot = None
+        # limits of each planning call and the `PlanStatus` of the last one
+        self.budget = SearchBudget()
+        self.status = None
+
+    @property
+    def plot(self):
+        '''
+        Plot handler of the planner, created on first access.
+        '''
+        if self._plot is None:
+            from ..plot.plot import Plot
+            start = self.start.current if isinstance(self.start, Node) else self.start
+            goal = self.goal.current if isinstance(self.goal, Node) else self.goal
+            self._plot = Plot(start, goal, self.env)
+        return self._plot
+
+    @plot.setter
+    def plot(self, plot) -> None:
+        self._plot = plot
+
+    def reset(self, start: tuple = None, goal: tuple = None) -> None:
+        '''
+        Start a new planning query on the same environment. Per-query search state
+        is cleared, while environment dependent data (motions, precomputed tables,
+        caches) is kept for reuse.
+
+        Parameters:
+            start (tuple): new start point coordinate, None to keep the current one
+            goal (tuple): new goal point coordinate, None to keep the current one
+        '''
+        if start is not None:
+            self.start = Node(start, start, 0, 0)
+        if goal is not None:
+            self.goal = Node(goal, goal, 0, 0)
+        if self._plot is not None:
+            self._plot.start = Node(self.start.current, self.start.current, 0, 0)
+            self._plot.goal = Node(self.goal.current, self.goal.current, 0, 0)
+
+    def setBudget(self, max_expansions: int = None, max_time: float = None, cancel_token: CancelToken = None) -> None:
+        '''
+        Limit every following planning call. When a limit is hit the planner
+        returns its best partial result and reports the reason in `status`.
+
+        Parameters:
+            max_expansions (int): maximum number of expanded nodes, None for no limit
+            max_time (float): maximum wall-clock time in seconds, None for no limit
+            cancel_token (CancelToken): token to cancel planning cooperatively, None for none
+        '''
+        self.budget = SearchBudget(max_expansions, max_time, cancel_token)
 
     def dist(self, node1: Node, node2: Node) -> float:
         return math.sqrt((node2.x - node1.x)**2 + (node2.y - node1.y)**2 + (node2.z - node1.z)**2)
@@ -0,0 +1,108 @@
+"""
+@file: registry.py
+@breif: Name registries of planners and curve generators
+@update: 2026.10.18
+"""
+from importlib import import_module
+
+
+class Registry(object):
+    """
+    Registry from names to classes, filled by the `register` decorator.
+
+    Built-in classes are listed in a module index and their modules are only
+    imported when the name is first looked up, so a factory call loads just the
+    requested planner. Classes defined elsewhere (e.g. plugins) are added by
+    decorating them, after which they are available to the factories as well.
+
+    Parameters:
+        package (str): package that the module index is relative to
+        modules (dict): name -> module defining the class registered under that name
+
+    Examples:
+        >>> from python_motion_planning.utils import SearchFactory
+        >>> @SearchFactory.registry.register("my_planner")
+        ... class MyPlanner(GraphSearcher):
+        ...     ...
+        >>> planner = SearchFactory()("my_planner", start=(5, 5, 5), goal=(45, 25, 5), env=env)
+    """
+    def __init__(self, package: str, modules: dict = None) -> None:
+        self.package = package
+        self.modules = dict(modules or {})
+        self.classes = dict()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.classes or name in self.modules
+
+    def __str__(self) -> str:
+        return "Registry({})".format(", ".join(self.names()))
+
+    def names(self) -> list:
+        return sorted(set(self.classes) | set(self.modules))
+
+    def register(self, name: str):
+        """
+        Class decorator registering the class under `name`.
+        """
+        def decorator(cls):
+            self.classes[name] = cls
+            return cls
+        return decorator
+
+    def get(self, name: str):
+        """
+        Class registered under `name`, importing its module if needed.
+
+        Raises:
+            ValueError: if nothing is registered under `name`
+        """
+        if name not in self.classes and name in self.modules:
+            import_module(self.modules[name], self.package)
+        if name not in self.classes:
+            raise ValueError("Unknown name `{}`, expected one of: {}.".format(name, ", ".join(self.names())))
+        return self.classes[name]
+
+
+SEARCH_PLANNERS = Registry("python_motion_planning.global_planner", {
+    "a_star": ".graph_search.a_star",
+    "adaptive_a_star": ".graph_search.adaptive_a_star",
+    "dijkstra": ".graph_search.dijkstra",
+    "gbfs": ".graph_search.gbfs",
+    "jps": ".graph_search.jps",
+    "d_star": ".graph_search.d_star",
+    "lpa_star": ".graph_search.lpa_star",
+    "d_star_lite": ".graph_search.d_star_lite",
+    "voronoi": ".graph_search.voronoi",
+    "theta_star": ".graph_search.theta_star",
+    "lazy_theta_star": ".graph_search.lazy_theta_star",
+    "s_theta_star": ".graph_search.s_theta_star",
+    "ara_star": ".graph_search.ara_star",
+    "hpa_star": ".graph_search.hpa_star",
+    "portfolio": ".graph_search.portfolio",
+    "rrt": ".sample_search.rrt",
+    "rrt_connect": ".sample_search.rrt_connect",
+    "rrt_star": ".sample_search.rrt_star",
+    "informed_rrt": ".sample_search.informed_rrt",
+    "prm": ".sample_search.prm",
+    "aco": ".evolutionary_search.aco",
+    "pso": ".evolutionary_search.pso",
+})
+
+CONTROL_PLANNERS = Registry("python_motion_planning.local_planner", {
+    "dwa": ".dwa",
+    "pid": ".pid",
+    "apf": ".apf",
+    "rpp": ".rpp",
+    "lqr": ".lqr",
+    "mpc": ".mpc",
+})
+
+CURVES = Registry("python_motion_planning.curve_generation", {
+    "dubins": ".dubins_curve",
+    "bezier": ".bezier_curve",
+    "polynomial": ".polynomial_curve",
+    "reeds_shepp": ".reeds_shepp",
+    "cubic_spline": ".cubic_spline",
+    "bspline": ".bspline_curve",
+    "fem_pos_smoother": ".fem_pos_smooth",
+})
@@ -0,0 +1,38 @@
+"""
+@file: test_d_star_lite.py
+@breif: regression checks of D* Lite replanning
+@update: 2026.10.19
+"""
+import random
+
+from python_motion_planning import DStarLite, Grid
+
+
+def randomGrid(seed: int) -> Grid:
+    env = Grid(30, 30, 10)
+    obstacles = set(env.obstacles)
+    rnd = random.Random(seed)
+    for _ in range(30 * 30 * 10 // 10):
+        obstacles.add((rnd.randint(1, 28), rnd.randint(1, 28), rnd.randint(1, 8)))
+    env.update(obstacles)
+    return env
+
+
+def test_replan_near_tie_keys():
+    # an underconsistent cell's key used to sit one ulp above the start key
+    # after this update, which stopped the repair early with no path
+    start, goal = (2, 27, 5), (27, 2, 6)
+    env = randomGrid(3)
+    env.update(env.obstacles - {start, goal})
+    planner = DStarLite(start, goal, env)
+    planner.plan()
+
+    wall = [(15, y, z) for z in (5, 6) for y in range(1, 29)]
+    planner.updateObstacles(added=wall)
+    cost, path, _ = planner.replan()
+
+    fresh = Grid(30, 30, 10)
+    fresh.update(set(env.obstacles))
+    expected, _, _ = DStarLite(start, goal, fresh).plan()
+    assert path
+    assert abs(cost - expected) < 1e-6